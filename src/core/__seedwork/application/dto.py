@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import Generic, List, TypeVar
+from dataclasses import dataclass, field
+from typing import Generic, List, Optional, TypeVar
 
 from core.__seedwork.domain.repositories import SearchResult
 
@@ -9,10 +9,14 @@ Item = TypeVar('Item')
 @dataclass(frozen=True, slots=True)
 class PaginationOutput(Generic[Item]):
     items: List[Item]
-    total: int
+    # Sem with_total a busca não conta os itens
+    total: Optional[int]
     page: int
     per_page: int
-    last_page: int
+    last_page: Optional[int]
+    # Como no SearchResult, os cursores não entram na comparação
+    next_cursor: Optional[str] = field(default=None, compare=False)
+    prev_cursor: Optional[str] = field(default=None, compare=False)
 
 
 Output = TypeVar('Output', bound=PaginationOutput)
@@ -32,5 +36,7 @@ class PaginationOutputMapper:
             total=result.total,
             page=result.search_params.page,
             per_page=result.search_params.per_page,
-            last_page=result.last_page
+            last_page=result.last_page,
+            next_cursor=result.next_cursor,
+            prev_cursor=result.prev_cursor,
         )
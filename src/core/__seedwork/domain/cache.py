@@ -0,0 +1,67 @@
+"""
+    The cache of the search results of the in-memory repositories
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, NamedTuple, Optional
+
+
+class SearchCacheInfo(NamedTuple):
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class SearchCache:
+    """
+        LRU of the search results by their params, or of anything computed from a key, like
+        functools.lru_cache, valid for one write_version of the repository: the first lookup
+        with a new version drops them all.
+        It has its own lock because the concurrent repositories search in many threads
+    """
+
+    __slots__ = ('maxsize', 'hits', 'misses', '_results', '_version', '_mutex')
+
+    def __init__(self, maxsize: int) -> None:
+        if maxsize < 1:
+            raise ValueError('The search cache maxsize must be positive')
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._results: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._version = 0
+        self._mutex = threading.Lock()
+
+    def get(self, params: Hashable, version: int) -> Optional[Any]:
+        with self._mutex:
+            if version != self._version:
+                self._results.clear()
+                self._version = version
+            result = self._results.get(params)
+            if result is None:
+                self.misses += 1
+                return None
+            self._results.move_to_end(params)
+            self.hits += 1
+            return result
+
+    def put(self, params: Hashable, version: int, result: Any) -> None:
+        with self._mutex:
+            if version != self._version:
+                return
+            self._results[params] = result
+            self._results.move_to_end(params)
+            if len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._mutex:
+            self._results.clear()
+            self.hits = self.misses = 0
+
+    def info(self) -> SearchCacheInfo:
+        with self._mutex:
+            return SearchCacheInfo(self.hits, self.misses, self.maxsize, len(self._results))
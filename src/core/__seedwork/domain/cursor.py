@@ -0,0 +1,114 @@
+"""
+    The keyset pagination cursor of the searches
+"""
+
+import base64
+import binascii
+import datetime as dt
+import json
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+
+from core.__seedwork.domain.exceptions import (InvalidCursorException,
+                                               InvalidUUidException)
+from core.__seedwork.domain.value_objects import UniqueEntityId
+
+from .entities import Entity
+
+
+@dataclass(frozen=True, slots=True)
+class Cursor:
+    """
+        Where a keyset page starts: right after, or before when backward, the item with the
+        sort value and id, in the order of the sort field and then of the id.
+        It goes to the clients as an opaque url-safe token
+    """
+
+    sort: Optional[str]
+    descending: bool
+    value: Any
+    id: str  # pylint: disable=invalid-name
+    backward: bool = False
+
+    @classmethod
+    def of(
+        cls,
+        entity: Entity,
+        sort: Optional[str],
+        descending: bool,
+        backward: bool = False,
+    ) -> 'Cursor':
+        value = getattr(entity, sort) if sort else None
+        return cls(sort, descending, value, entity.id, backward)
+
+    def encode(self) -> str:
+        value = {'datetime': self.value.isoformat()} \
+            if isinstance(self.value, dt.datetime) else self.value
+        data = json.dumps(
+            [self.sort, self.descending, value, self.id, self.backward], separators=(',', ':'))
+        return base64.urlsafe_b64encode(data.encode()).rstrip(b'=').decode()
+
+    @classmethod
+    def decode(cls, token: str) -> 'Cursor':
+        """
+            A token that was not made by encode, even if it decodes, raises
+            InvalidCursorException, so a tampered cursor never reaches the queries
+        """
+        try:
+            data = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+            sort, descending, value, entity_id, backward = json.loads(data)
+            if not (
+                (sort is None or isinstance(sort, str))
+                and isinstance(descending, bool)
+                and isinstance(backward, bool)
+                and isinstance(entity_id, str)
+            ):
+                raise InvalidCursorException()
+            value = cls._decode_value(sort, value)
+            UniqueEntityId(entity_id)
+        except (
+            binascii.Error,
+            UnicodeDecodeError,
+            ValueError,
+            TypeError,
+            KeyError,
+            InvalidUUidException,
+        ) as err:
+            raise InvalidCursorException() from err
+        return cls(sort, descending, value, entity_id, backward)
+
+    @staticmethod
+    def _decode_value(sort: Optional[str], value: Any) -> Any:
+        # Só os valores que o encode gera, nunca listas, null com ordenação ou bool
+        if sort is None:
+            if value is not None:
+                raise InvalidCursorException()
+            return None
+        if isinstance(value, dict):
+            if value.keys() != {'datetime'} or not isinstance(value['datetime'], str):
+                raise InvalidCursorException()
+            return dt.datetime.fromisoformat(value['datetime'])
+        if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+            raise InvalidCursorException()
+        return value
+
+    def page_cursors(
+        self,
+        items: List[Entity],
+        has_more: bool,
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+            The next and prev cursors of the keyset page read from this one. Ahead of the page
+            there are items only if the search found more, behind it at least the cursor item
+        """
+        def side(backward: bool) -> Optional[str]:
+            if not items or (backward == self.backward and not has_more):
+                return None
+            item = items[0] if backward else items[-1]
+            return Cursor.of(item, self.sort, self.descending, backward).encode()
+        return side(False), side(True)
+
+    def check_sort(self, sort: Optional[str], descending: bool) -> None:
+        """The cursor only continues a search sorted the same way"""
+        if (self.sort, self.descending) != (sort, descending):
+            raise InvalidCursorException("The cursor belongs to a search with another sort")
@@ -1,35 +1,192 @@
 from abc import ABC
-from dataclasses import Field, asdict, dataclass, field
+from dataclasses import MISSING, Field, dataclass, field, fields
+from operator import attrgetter
+from typing import (TYPE_CHECKING, Any, Callable, Dict, FrozenSet, Generic,
+                    Iterable, List, Optional, Type, TypeVar)
 
 from core.__seedwork.domain.value_objects import UniqueEntityId
 
+if TYPE_CHECKING:
+    from core.__seedwork.domain.validators import ErrorFields
+
+T = TypeVar('T', bound='Entity')
+
+ToDict = Callable[['Entity'], Dict[str, Any]]
+
+_to_dict_serializers: Dict[Type['Entity'], ToDict] = {}
+
+_values_getters: Dict[Type['Entity'], attrgetter] = {}
+
+_restorers: Dict[Type['Entity'], Callable[..., 'Entity']] = {}
+
+_state_fields: Dict[Type['Entity'], FrozenSet[str]] = {}
+
+
+def _fields_of_state(entity_class: Type['Entity']) -> List[Field]:
+    """The fields that hold the entity data, leaving out the bookkeeping ones"""
+    return [entity_field for entity_field in fields(entity_class) if entity_field.compare]
+
+
+def _build_to_dict(entity_class: Type['Entity']) -> ToDict:
+    """
+        Generate once per class, like dataclasses does with __init__, a function that
+        reads each field straight into a flat dict. Unlike dataclasses.asdict the values
+        are not deep copied.
+    """
+    items = [
+        f"{entity_field.name!r}: entity.{entity_field.name}"
+        for entity_field in _fields_of_state(entity_class)
+        if entity_field.name != 'unique_entity_id'
+    ]
+    items.append("'id': entity.id")
+    source = f"def to_dict(entity):\n    return {{{', '.join(items)}}}\n"
+    namespace: Dict[str, Any] = {}
+    exec(source, {}, namespace)  # pylint: disable=exec-used
+    return namespace['to_dict']
+
+
+def _build_restore(entity_class: Type['Entity']) -> Callable[..., 'Entity']:
+    """
+        Generate once per class a constructor with the same keyword arguments and defaults
+        of the dataclass __init__, that sets the fields without running __post_init__.
+        The restored entity has no dirty fields
+    """
+    global_namespace: Dict[str, Any] = {
+        '_new': object.__new__,
+        '_set': object.__setattr__,
+        '_cls': entity_class,
+        '_MISSING': MISSING,
+        '_CLEAN': frozenset(),
+    }
+    params = []
+    lines = []
+    for entity_field in _fields_of_state(entity_class):
+        name = entity_field.name
+        if entity_field.default_factory is not MISSING:
+            global_namespace[f'_factory_{name}'] = entity_field.default_factory
+            params.append(f'{name}=_MISSING')
+            lines.append(
+                f"    _set(entity, {name!r}, _factory_{name}() if {name} is _MISSING else {name})"
+            )
+        else:
+            if entity_field.default is not MISSING:
+                global_namespace[f'_default_{name}'] = entity_field.default
+                params.append(f'{name}=_default_{name}')
+            else:
+                params.append(name)
+            lines.append(f"    _set(entity, {name!r}, {name})")
+
+    source = '\n'.join([
+        f"def restore(*, {', '.join(params)}):",
+        "    entity = _new(_cls)",
+        *lines,
+        "    _set(entity, '_dirty_fields', _CLEAN)",
+        "    return entity",
+    ]) + '\n'
+    namespace: Dict[str, Any] = {}
+    exec(source, global_namespace, namespace)  # pylint: disable=exec-used
+    return namespace['restore']
+
 
 @dataclass(frozen=True, slots=True)
 class Entity(ABC):
+    """
+        Entities of the same class are equal when all their fields are equal, but they are
+        hashed only by the unique_entity_id, which never changes, so an entity stays at the
+        same place of a dict or set after update. Subclasses declared with eq=False keep it.
+        The fields changed since the entity was restored are tracked as dirty, an entity
+        created by the constructor has no persisted state, so all its fields are dirty
+    """
 
     unique_entity_id: UniqueEntityId = field(
         default_factory=lambda: UniqueEntityId()  # pylint: disable=unnecessary-lambda
     )
+    # None quer dizer todos os campos, o frozenset vazio é compartilhado pelas entidades limpas
+    _dirty_fields: Optional[FrozenSet[str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     @property
     def id(self):  # pylint: disable=invalid-name
         return str(self.unique_entity_id)
 
-    def to_dict(self):
-        entity_dict = asdict(self)
-        entity_dict.pop('unique_entity_id')
-        entity_dict['id'] = self.id
-        return entity_dict
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        values = _values_getters.get(self.__class__)
+        if values is None:
+            values = _values_getters[self.__class__] = attrgetter(
+                *(entity_field.name for entity_field in _fields_of_state(self.__class__)))
+        return values(self) == values(other)
+
+    def __hash__(self):
+        return hash(self.unique_entity_id)
+
+    def to_dict(self) -> Dict[str, Any]:
+        to_dict = _to_dict_serializers.get(self.__class__)
+        if to_dict is None:
+            to_dict = _to_dict_serializers[self.__class__] = _build_to_dict(self.__class__)
+        return to_dict(self)
+
+    @classmethod
+    def restore(cls: Type[T], **props) -> T:
+        """Create the entity from trusted data, like a persisted row, without validating it"""
+        restore = _restorers.get(cls)
+        if restore is None:
+            restore = _restorers[cls] = _build_restore(cls)
+        return restore(**props)
+
+    @property
+    def dirty_fields(self) -> FrozenSet[str]:
+        """The name of the fields changed since the entity was restored or cleaned"""
+        if self._dirty_fields is None:
+            state_fields = _state_fields.get(self.__class__)
+            if state_fields is None:
+                state_fields = _state_fields[self.__class__] = frozenset(
+                    entity_field.name
+                    for entity_field in _fields_of_state(self.__class__)
+                    if entity_field.name != 'unique_entity_id'
+                )
+            return state_fields
+        return self._dirty_fields
+
+    def clear_dirty_fields(self, field_names: Optional[Iterable[str]] = None) -> None:
+        """Mark the current state, or only the state of field_names, as persisted"""
+        dirty_fields = frozenset() if field_names is None \
+            else self.dirty_fields.difference(field_names)
+        object.__setattr__(self, '_dirty_fields', dirty_fields)
+
+    def _change(self, field_name: str, value: Any) -> None:
+        if getattr(self, field_name) == value:
+            return
+        object.__setattr__(self, field_name, value)
+        if self._dirty_fields is not None:
+            object.__setattr__(self, '_dirty_fields', self._dirty_fields | {field_name})
 
     @classmethod
     def get_field(cls, entity_field: str) -> Field:
         return cls.__dataclass_fields__[entity_field]  # pylint: disable=no-member
 
 
+@dataclass(frozen=True, slots=True)
+class EntityBatch(Generic[T]):
+    """The valid entities of a batch and the errors of the invalid ones by their index"""
+
+    entities: List[T]
+    errors: Dict[int, 'ErrorFields']
+
+
 class ToggleIsActive():
+    """Mixin of the entities with an is_active field"""
+
+    # Sem __slots__ vazio toda instância das entidades ganharia um __dict__
+    __slots__ = ()
+
+    # Vem da Entity, só anotado aqui, sem criar atributo na classe
+    _change: Callable[[str, Any], None]
 
     def activate(self) -> None:
-        object.__setattr__(self, 'is_active', True)
+        self._change('is_active', True)
 
     def inactivate(self) -> None:
-        object.__setattr__(self, 'is_active', False)
+        self._change('is_active', False)
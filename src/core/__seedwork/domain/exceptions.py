@@ -42,3 +42,14 @@ class MissingParameter(Exception):
 
     def __init__(self, parameter_name) -> None:
         super().__init__(f"Missing parameter {parameter_name}")
+
+
+class InvalidSnapshotException(Exception):
+    """The Exception for a file that is not a valid repository snapshot"""
+
+
+class InvalidCursorException(Exception):
+    """The Exception for a pagination cursor that can not be decoded or used by the search"""
+
+    def __init__(self, error: str = "Invalid pagination cursor") -> None:
+        super().__init__(error)
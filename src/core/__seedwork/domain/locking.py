@@ -0,0 +1,67 @@
+"""
+    The lock that lets the repositories be shared between threads
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class ReadWriteLock:
+    """
+        Many readers together or one writer alone. A waiting writer holds the new readers
+        back, so a steady flow of searches does not starve the writes. A thread that already
+        holds the lock can enter it again, but it can not upgrade a read to a write
+    """
+
+    __slots__ = ('_condition', '_readers', '_writer', '_writers_waiting', '_local')
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+        self._local = threading.local()
+
+    @contextmanager
+    def reading(self) -> Iterator[None]:
+        if getattr(self._local, 'depth', 0):
+            yield
+            return
+        with self._condition:
+            while self._writer or self._writers_waiting:
+                self._condition.wait()
+            self._readers += 1
+        self._local.depth = 1
+        try:
+            yield
+        finally:
+            self._local.depth = 0
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def writing(self) -> Iterator[None]:
+        if getattr(self._local, 'writing', False):
+            yield
+            return
+        if getattr(self._local, 'depth', 0):
+            raise RuntimeError('A read lock can not be upgraded to a write lock')
+        with self._condition:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        self._local.depth = 1
+        self._local.writing = True
+        try:
+            yield
+        finally:
+            self._local.depth = 0
+            self._local.writing = False
+            with self._condition:
+                self._writer = False
+                self._condition.notify_all()
@@ -2,16 +2,27 @@
     Interfaces that define how others apps layers talk save and recue info to the domain
 """
 
+import copy
+import heapq
 import math
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
-from typing import Any, Generic, List, Optional, TypeVar
+from dataclasses import dataclass, field, replace
+from operator import attrgetter
+from typing import (Any, Callable, Dict, Generic, Iterable, Iterator, List,
+                    Literal, Optional, Tuple, TypeVar, Union)
 
+from core.__seedwork.domain.exceptions import (InvalidCursorException,
+                                               InvalidUUidException)
 from core.__seedwork.domain.value_objects import UniqueEntityId
 
-from .entities import Entity
+from .cache import SearchCache, SearchCacheInfo
+from .cursor import Cursor
+from .locking import ReadWriteLock
+from .storage import ET, IndexedStorage
 
-ET = TypeVar("ET", bound=Entity)
+# True conta exato, False não conta e 'estimate' aceita uma estimativa sem filtros
+TotalMode = Union[bool, Literal['estimate']]
+_FALSE_STRINGS = frozenset({'0', 'false', 'no', 'off'})
 
 
 class RepositoryInterface(Generic[ET], ABC):
@@ -36,44 +47,298 @@ class RepositoryInterface(Generic[ET], ABC):
     def find_by_id(self, entity_id: str | UniqueEntityId) -> Optional[ET]:
         raise NotImplementedError()
 
+    @abstractmethod
+    def find_by_ids(
+        self,
+        entity_ids: Iterable[str | UniqueEntityId],
+        batch_size: int = 1000,
+    ) -> Dict[UniqueEntityId, ET]:
+        """
+            The entities found by id, batch_size ids at a time. The ids that are invalid or
+            not found are left out of the dict, like find_by_id returning None
+        """
+        raise NotImplementedError()
+
     @abstractmethod
     def find_all(self) -> List[ET]:
         raise NotImplementedError()
 
+    @abstractmethod
+    def iter_all(self, chunk_size: int = 2000) -> Iterator[ET]:
+        """
+            Yield all the entities reading chunk_size at a time, to go through the whole
+            repository in constant memory instead of materializing it like find_all
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def bulk_update(
+        self,
+        entities: List[ET],
+        fields: Optional[Iterable[str]] = None,
+        batch_size: int = 1000,
+    ) -> int:
+        """
+            Write the fields, by default the dirty ones, of the entities batch_size at a time.
+            The entities not found are skipped, returns how many were updated
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def bulk_delete(
+        self,
+        entity_ids: Iterable[str | UniqueEntityId],
+        batch_size: int = 1000,
+    ) -> int:
+        """Delete the entities by id batch_size at a time, returns how many were deleted"""
+        raise NotImplementedError()
+
+    @abstractmethod
+    def upsert_many(self, entities: List[ET], batch_size: int = 1000) -> None:
+        """Insert the new entities and overwrite the ones that exist, batch_size at a time"""
+        raise NotImplementedError()
+
+
+# A seleção pelo heap só compensa com a janela até essa fração dos itens
+_TOP_K_FRACTION = 64
+
+
+def check_batch_size(size: int, name: str = 'batch_size') -> None:
+    """The batch and chunk sizes of the repositories must be positive"""
+    if size < 1:
+        raise ValueError(f'{name} must be positive')
+
+
+def valid_unique_entity_ids(entity_ids: Iterable[str | UniqueEntityId]) -> List[UniqueEntityId]:
+    """The ids as UniqueEntityId, leaving out the invalid ones like find_by_id"""
+    unique_entity_ids = []
+    for entity_id in entity_ids:
+        if isinstance(entity_id, UniqueEntityId):
+            unique_entity_ids.append(entity_id)
+            continue
+        try:
+            unique_entity_ids.append(UniqueEntityId(entity_id))
+        except InvalidUUidException:
+            pass
+    return unique_entity_ids
 
-@dataclass
+
+@dataclass(init=False)
 class InMemoryRepository(RepositoryInterface[ET], ABC):
+    """
+        The items live in an IndexedStorage, so the point operations are dict lookups and
+        bulk_insert is O(k). items hands out a new list in the repository order, assigning
+        a list to it replaces all the items. Every write bumps write_version
+    """
+
+    _storage: IndexedStorage[ET] = field(repr=False)
+    write_version: int = field(default=0, repr=False, compare=False)
+
+    def __init__(self, items: Optional[Iterable[ET]] = None) -> None:
+        self.write_version = 0
+        self.items = items or []
 
-    items: List[ET] = field(default_factory=lambda: [])
+    @property
+    def items(self) -> List[ET]:
+        return list(self._storage)
+
+    @items.setter
+    def items(self, items: Iterable[ET]) -> None:
+        self._storage = self._new_storage(items)
+        self.write_version += 1
+
+    def _new_storage(self, items: Iterable[ET]) -> IndexedStorage[ET]:
+        return IndexedStorage(items)
 
     def insert(self, entity: ET) -> None:
-        self.items.append(entity)
+        self._storage.append(entity)
+        self.write_version += 1
 
     def bulk_insert(self, entities: List[ET]) -> None:
-        self.items = entities + self.items
+        # Materializa uma só vez, lotes colunares criam uma entidade nova a cada leitura
+        self._storage.prepend(list(entities))
+        self.write_version += 1
 
     def update(self, entity: ET) -> None:
-        """Returns True if updated the entity or False, if it have not been found"""
-        for index, repo_entity in enumerate(self.items):
-            if repo_entity.id == entity.id:
-                self.items[index] = entity
-                return None  # True
-        return None  # False
+        """The entity takes the place of the stored one with its id, an unknown id is ignored"""
+        if self._storage.replace(entity):
+            self.write_version += 1
 
     def delete(self, entity: ET) -> None:
-        for index, repo_entity in enumerate(self.items):
-            if repo_entity.id == entity.id:
-                self.items.pop(index)
-                break
+        if self._storage.remove(entity.unique_entity_id) is not None:
+            self.write_version += 1
+
+    def bulk_update(
+        self,
+        entities: List[ET],
+        fields: Optional[Iterable[str]] = None,
+        batch_size: int = 1000,
+    ) -> int:
+        """
+            Like update the entities take the place of the stored ones. With fields only
+            those are copied, to a copy of the stored entity. batch_size only has to be positive.
+            Like the database repositories, only the fields written are marked clean, and only
+            in the entities that are stored
+        """
+        check_batch_size(batch_size)
+        entities = list(entities)
+        field_names = None if fields is None else tuple(fields)
+        updated = self._storage.replace_many(
+            entities if field_names is None
+            else [self._with_fields(entity, field_names) for entity in entities]
+        )
+        self.write_version += 1
+        for entity in entities:
+            if entity.unique_entity_id in self._storage:
+                entity.clear_dirty_fields(field_names)
+        return updated
+
+    def bulk_delete(
+        self,
+        entity_ids: Iterable[str | UniqueEntityId],
+        batch_size: int = 1000,
+    ) -> int:
+        check_batch_size(batch_size)
+        deleted = self._storage.remove_many(valid_unique_entity_ids(entity_ids))
+        self.write_version += 1
+        return deleted
+
+    def upsert_many(self, entities: List[ET], batch_size: int = 1000) -> None:
+        """The entities that exist are replaced in place, the new ones go in like bulk_insert"""
+        check_batch_size(batch_size)
+        entities = list(entities)
+        self._storage.replace_many(entities)
+        # Um id repetido no lote fica só com a última entidade, como no banco
+        new = {
+            entity.unique_entity_id: entity
+            for entity in entities
+            if entity.unique_entity_id not in self._storage
+        }
+        self._storage.prepend(list(new.values()))
+        self.write_version += 1
+
+    def _with_fields(self, entity: ET, field_names: Tuple[str, ...]) -> ET:
+        stored = self._storage.get(entity.unique_entity_id)
+        if stored is None or stored is entity:
+            return entity
+        updated = copy.copy(stored)
+        for field_name in field_names:
+            object.__setattr__(updated, field_name, getattr(entity, field_name))
+        return updated
 
     def find_all(self) -> List[ET]:
-        return list(self.items)
+        return list(self._storage)
+
+    def iter_all(self, chunk_size: int = 2000) -> Iterator[ET]:
+        """
+            Iterate over a snapshot of the items, the list of references taken by find_all,
+            so writes made while iterating neither break nor show up in the iteration.
+            The entities are already in memory, chunk_size only has to be positive
+        """
+        check_batch_size(chunk_size, 'chunk_size')
+        yield from self.find_all()
 
     def find_by_id(self, entity_id: str | UniqueEntityId) -> Optional[ET]:
-        for repo_entity in self.items:
-            if repo_entity.id == str(entity_id):
-                return repo_entity
-        return None
+        try:
+            unique_entity_id = entity_id if isinstance(entity_id, UniqueEntityId) \
+                else UniqueEntityId(entity_id)
+        except InvalidUUidException:
+            return None
+        return self._storage.get(unique_entity_id)
+
+    def find_by_ids(
+        self,
+        entity_ids: Iterable[str | UniqueEntityId],
+        batch_size: int = 1000,
+    ) -> Dict[UniqueEntityId, ET]:
+        check_batch_size(batch_size)
+        return {
+            unique_entity_id: entity
+            for unique_entity_id in valid_unique_entity_ids(entity_ids)
+            if (entity := self._storage.get(unique_entity_id)) is not None
+        }
+
+
+class ConcurrentInMemoryRepositoryMixin(InMemoryRepository[ET]):
+    """
+        Put before an in-memory repository in the bases to share it between threads.
+        The reads, search included, run together under a ReadWriteLock and the writes
+        one at a time, so no read sees the storage in the middle of a write
+    """
+
+    _lock: ReadWriteLock
+
+    def __init__(self, items: Optional[Iterable[ET]] = None, **kwargs: Any) -> None:
+        self._lock = ReadWriteLock()
+        super().__init__(items, **kwargs)  # type: ignore
+
+    @property
+    def items(self) -> List[ET]:
+        with self._lock.reading():
+            return list(self._storage)
+
+    @items.setter
+    def items(self, items: Iterable[ET]) -> None:
+        with self._lock.writing():
+            self._storage = self._new_storage(items)
+            self.write_version += 1
+
+    def insert(self, entity: ET) -> None:
+        with self._lock.writing():
+            super().insert(entity)
+
+    def bulk_insert(self, entities: List[ET]) -> None:
+        with self._lock.writing():
+            super().bulk_insert(entities)
+
+    def update(self, entity: ET) -> None:
+        with self._lock.writing():
+            super().update(entity)
+
+    def delete(self, entity: ET) -> None:
+        with self._lock.writing():
+            super().delete(entity)
+
+    def bulk_update(
+        self,
+        entities: List[ET],
+        fields: Optional[Iterable[str]] = None,
+        batch_size: int = 1000,
+    ) -> int:
+        with self._lock.writing():
+            return super().bulk_update(entities, fields, batch_size)
+
+    def bulk_delete(
+        self,
+        entity_ids: Iterable[str | UniqueEntityId],
+        batch_size: int = 1000,
+    ) -> int:
+        with self._lock.writing():
+            return super().bulk_delete(entity_ids, batch_size)
+
+    def upsert_many(self, entities: List[ET], batch_size: int = 1000) -> None:
+        with self._lock.writing():
+            super().upsert_many(entities, batch_size)
+
+    def find_all(self) -> List[ET]:
+        with self._lock.reading():
+            return super().find_all()
+
+    def find_by_id(self, entity_id: str | UniqueEntityId) -> Optional[ET]:
+        with self._lock.reading():
+            return super().find_by_id(entity_id)
+
+    def find_by_ids(
+        self,
+        entity_ids: Iterable[str | UniqueEntityId],
+        batch_size: int = 1000,
+    ) -> Dict[UniqueEntityId, ET]:
+        with self._lock.reading():
+            return super().find_by_ids(entity_ids, batch_size)
+
+    def search(self, params: Any) -> Any:
+        with self._lock.reading():
+            return super().search(params)  # type: ignore
 
 
 Filters = TypeVar("Filters", str, Any)
@@ -87,6 +352,8 @@ class SearchParams(Generic[Filters], ABC):
     sort: Optional[str] = None
     sort_dir: Optional[str] = None
     filters: Optional[Filters] = None
+    cursor: Optional[str] = None
+    with_total: TotalMode = True
 
     def __post_init__(self):
         self._adjust_page()
@@ -94,6 +361,8 @@ class SearchParams(Generic[Filters], ABC):
         self._adjust_sort()
         self._adjust_sort_dir()
         self._normalize_filter()
+        self._normalize_cursor()
+        self._normalize_with_total()
 
     def _adjust_page(self):
         default = self._get_field_default("page")
@@ -132,6 +401,20 @@ class SearchParams(Generic[Filters], ABC):
             self.filters) if self.filters is not None and self.filters != "" else None
         object.__setattr__(self, "filters", filters)
 
+    def _normalize_cursor(self):
+        cursor = str(self.cursor) if self.cursor else None
+        object.__setattr__(self, "cursor", cursor)
+
+    def _normalize_with_total(self):
+        with_total = self.with_total
+        if isinstance(with_total, str):
+            with_total = with_total.strip().lower()
+            if with_total != 'estimate':
+                with_total = with_total not in _FALSE_STRINGS
+        else:
+            with_total = bool(with_total)
+        object.__setattr__(self, "with_total", with_total)
+
     def _get_field_default(self, field_name: str) -> Any:
         return self.__dataclass_fields__[field_name].default  # pylint: disable=no-member
 
@@ -151,12 +434,16 @@ class SearchResult(Generic[Filters, ET], ABC):
     """
 
     items: List[ET]
-    total: int
-    last_page: int = field(init=False)
+    # None quando a busca foi feita sem with_total
+    total: Optional[int]
+    last_page: Optional[int] = field(init=False)
     search_params: SearchParams[Filters]
+    # Derivados dos itens e dos params, não entram na comparação dos resultados
+    next_cursor: Optional[str] = field(default=None, compare=False)
+    prev_cursor: Optional[str] = field(default=None, compare=False)
 
     def __post_init__(self, ):
-        object.__setattr__(self, 'last_page', math.ceil(
+        object.__setattr__(self, 'last_page', None if self.total is None else math.ceil(
             self.total / self.search_params.per_page))
 
     def to_dict(self):
@@ -169,6 +456,8 @@ class SearchResult(Generic[Filters, ET], ABC):
             'sort': self.search_params.sort,
             'sort_dir': self.search_params.sort_dir,
             'filters': self.search_params.filters,
+            'next_cursor': self.next_cursor,
+            'prev_cursor': self.prev_cursor,
         }
 
 
@@ -206,14 +495,82 @@ class InMemorySearchableRepositoryInterface(
     Study Note: Here the SearchParams and SearchResult are defined because search is implemented
         using type like it. So it's good to pass it in generic of more flexible base class
         and method's typing.
+        The sortable_fields and the default_sort, used when the search has no sort, are kept
+        as sorted indexes, so a search sorted by them reads its page without sorting.
+        Without filters only the page is read, _apply_filter must return all the items then.
+        The text_indexed_fields get a trigram index, that _filter_candidates may use to
+        narrow the items given to _apply_filter.
+        With a search_cache_size the results are kept in a SearchCache until the next write.
+        A search with a cursor reads the keyset page after it, ordered by the sort and the id
+        like the indexes, so the offset pages sorted by an index hand out cursors too.
+        The total is always exact here, it is only left out for a search without with_total
     """
 
+    default_sort: Optional[str] = None
+    text_indexed_fields: List[str] = []
+    search_cache_size: int = 0
+
+    def __init__(
+        self,
+        items: Optional[Iterable[ET]] = None,
+        search_cache_size: Optional[int] = None,
+    ) -> None:
+        if search_cache_size is not None:
+            self.search_cache_size = search_cache_size
+        self._search_cache = SearchCache(self.search_cache_size) \
+            if self.search_cache_size else None
+        super().__init__(items)
+
     def search(self, params: SearchParams[Filters]) -> SearchResult[Filters, ET]:
-        items_filtered = self._apply_filter(self.items, params.filters)
-        items_sorted = self._apply_sort(
-            items_filtered, params.sort, params.sort_dir)
-        items_paginated = self._apply_paginate(
-            items_sorted, params.page, params.per_page)
+        cache = self._search_cache
+        if cache is None:
+            return self._search(params)
+        version = self.write_version
+        result = cache.get(params, version)
+        if result is None:
+            result = self._search(params)
+            cache.put(params, version, result)
+        # A lista da página é do chamador, o resultado guardado continua intacto
+        return replace(result, items=list(result.items))
+
+    def search_cache_info(self) -> Optional[SearchCacheInfo]:
+        return None if self._search_cache is None else self._search_cache.info()
+
+    def _search(self, params: SearchParams[Filters]) -> SearchResult[Filters, ET]:
+        result = self._search_page(params)
+        # Em memória a contagem sai de graça, mas sem with_total fica de fora como nos bancos
+        return result if params.with_total else replace(result, total=None)
+
+    def _search_page(self, params: SearchParams[Filters]) -> SearchResult[Filters, ET]:
+        sort, descending = self._keyset_sort(params)
+        if params.cursor is not None:
+            cursor = Cursor.decode(params.cursor)
+            cursor.check_sort(sort, descending)
+            return self._search_by_cursor(params, cursor)
+
+        result = self._search_by_offset(params)
+        # Só as páginas ordenadas por um índice seguem a ordem das páginas do cursor, a menos
+        # dos empates, que aqui ficam na ordem do repositório e no cursor na ordem do id
+        if not result.items or sort is None or sort != (params.sort or self.default_sort):
+            return result
+        return replace(
+            result,
+            next_cursor=Cursor.of(result.items[-1], sort, descending).encode()
+            if params.page < result.last_page else None,
+            prev_cursor=Cursor.of(result.items[0], sort, descending, backward=True).encode()
+            if params.page > 1 else None,
+        )
+
+    def _search_by_offset(self, params: SearchParams[Filters]) -> SearchResult[Filters, ET]:
+        sort = params.sort or self.default_sort
+        if sort in self._storage.sort_fields:
+            return self._search_by_index(params, sort)
+
+        candidates = None if params.filters is None else self._filter_candidates(params.filters)
+        items_filtered = self._apply_filter(
+            self.items if candidates is None else candidates, params.filters)
+        items_paginated = self._apply_sort_and_paginate(
+            items_filtered, params.sort, params.sort_dir, params.page, params.per_page)
 
         return SearchResult(
             items=items_paginated,
@@ -221,15 +578,139 @@ class InMemorySearchableRepositoryInterface(
             search_params=params,
         )
 
+    def _search_by_index(
+        self,
+        params: SearchParams[Filters],
+        sort: str,
+    ) -> SearchResult[Filters, ET]:
+        descending = params.sort_dir == 'desc'
+        if params.filters is None:
+            start = (params.page - 1) * params.per_page
+            return SearchResult(
+                items=self._storage.sorted_slice(sort, descending, start, start + params.per_page),
+                total=len(self._storage),
+                search_params=params,
+            )
+
+        if (candidates := self._filter_candidates(params.filters, sort, descending)) is None:
+            candidates = self._storage.sorted_slice(sort, descending)
+        items_filtered = self._apply_filter(candidates, params.filters)
+        return SearchResult(
+            items=self._apply_paginate(items_filtered, params.page, params.per_page),
+            total=len(items_filtered),
+            search_params=params,
+        )
+
+    def _search_by_cursor(
+        self,
+        params: SearchParams[Filters],
+        cursor: Cursor,
+    ) -> SearchResult[Filters, ET]:
+        candidates = None if params.filters is None else self._filter_candidates(params.filters)
+        items_filtered = self._apply_filter(
+            self.items if candidates is None else candidates, params.filters)
+
+        key = self._keyset_key(cursor.sort)
+        boundary = (cursor.value, UniqueEntityId(cursor.id).value) if cursor.sort \
+            else (UniqueEntityId(cursor.id).value,)
+        # Ir para frente na ordem crescente ou para trás na decrescente é ir para as chaves maiores
+        try:
+            if cursor.descending == cursor.backward:
+                window = heapq.nsmallest(
+                    params.per_page + 1,
+                    (item for item in items_filtered if key(item) > boundary),
+                    key=key,
+                )
+            else:
+                window = heapq.nlargest(
+                    params.per_page + 1,
+                    (item for item in items_filtered if key(item) < boundary),
+                    key=key,
+                )
+        except TypeError as err:
+            raise InvalidCursorException() from err
+
+        items = window[:params.per_page]
+        if cursor.backward:
+            items.reverse()
+        next_cursor, prev_cursor = cursor.page_cursors(items, len(window) > params.per_page)
+        return SearchResult(
+            items=items,
+            total=len(items_filtered),
+            search_params=params,
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
+        )
+
+    def _keyset_sort(self, params: SearchParams[Filters]) -> Tuple[Optional[str], bool]:
+        """The field and direction of the keyset pages, that only sort by the sortable_fields"""
+        if params.sort and params.sort in self.sortable_fields:
+            return params.sort, params.sort_dir == 'desc'
+        return self.default_sort, False
+
+    @staticmethod
+    def _keyset_key(sort: Optional[str]) -> Callable[[ET], Tuple[Any, ...]]:
+        if sort is None:
+            return lambda item: (item.unique_entity_id.value,)
+        return lambda item: (getattr(item, sort), item.unique_entity_id.value)
+
+    def _new_storage(self, items: Iterable[ET]) -> IndexedStorage[ET]:
+        sort_fields = list(self.sortable_fields)
+        if self.default_sort and self.default_sort not in sort_fields:
+            sort_fields.append(self.default_sort)
+        return IndexedStorage(items, sort_fields, self.text_indexed_fields)
+
+    def _filter_candidates(  # pylint: disable=unused-argument
+        self,
+        filter_param: Filters,
+        sort: Optional[str] = None,
+        descending: bool = False,
+    ) -> Optional[List[ET]]:
+        """
+            The items that may match the filter, in the repository order or sorted by an
+            indexed field. None to give all the items to _apply_filter
+        """
+        return None
+
     @abstractmethod
     def _apply_filter(self, items: List[ET], filter_param: Filters | None) -> List[ET]:
         raise NotImplementedError()
 
-    def _apply_sort(self, items: List[ET], sort: str | None, sort_dir: str | None) -> List[ET]:
+    def _sort_key(self, sort: str | None) -> Optional[Callable[[ET], Any]]:
+        """
+            The key of the offset pages, None keeps them in the repository order. Ties keep
+            the repository order like the sorted indexes, only the cursor pages order them
+            by the id
+        """
         if sort and sort in self.sortable_fields:
-            is_reverse = sort_dir == 'desc'
-            return sorted(items, key=lambda item: getattr(item, sort), reverse=is_reverse)
-        return items
+            return attrgetter(sort)
+        return None
+
+    def _apply_sort(self, items: List[ET], sort: str | None, sort_dir: str | None) -> List[ET]:
+        key = self._sort_key(sort)
+        if key is None:
+            return items
+        return sorted(items, key=key, reverse=sort_dir == 'desc')
+
+    def _apply_sort_and_paginate(
+        self,
+        items: List[ET],
+        sort: str | None,
+        sort_dir: str | None,
+        page: int,
+        per_page: int,
+    ) -> List[ET]:
+        """
+            When the pages up to the requested one are a small part of the items, select them
+            with a heap instead of sorting all. heapq.nsmallest and nlargest give the same
+            items of the stable sorted(...)[:k], ties included
+        """
+        key = self._sort_key(sort)
+        window = page * per_page
+        if key is None or window * _TOP_K_FRACTION > len(items):
+            return self._apply_paginate(self._apply_sort(items, sort, sort_dir), page, per_page)
+        select = heapq.nlargest if sort_dir == 'desc' else heapq.nsmallest
+        return self._apply_paginate(select(window, items, key=key), page, per_page)
 
     def _apply_paginate(self, items: List[ET], page: int, per_page: int) -> List[ET]:
         start = (page - 1) * per_page
@@ -0,0 +1,456 @@
+"""
+    The in-memory storage of the repositories: the entities in order, indexed by id and by
+    the sort and text fields
+"""
+
+import threading
+from bisect import bisect_left, bisect_right, insort
+from itertools import groupby
+from operator import itemgetter
+from typing import (Any, Dict, FrozenSet, Generic, Iterable, Iterator, List,
+                    Optional, Protocol, Set, Tuple, TypeVar, runtime_checkable)
+
+from core.__seedwork.domain.value_objects import UniqueEntityId
+
+from .entities import Entity
+
+ET = TypeVar("ET", bound=Entity)
+
+_HOLE: Any = object()
+
+# O lugar de uma entidade de uma EntitySource que ainda não foi lida
+_UNLOADED: Any = object()
+
+_NO_POSITIONS: FrozenSet[int] = frozenset()
+
+_BULK_INDEX_SIZE = 64
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[index:index + 3] for index in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """
+        Inverted index from the trigrams of lower-cased texts to their storage positions.
+        The lower-cased texts are kept too, to remove them and to check the candidates
+    """
+
+    __slots__ = ('_texts', '_postings')
+
+    _texts: Dict[int, str]
+    _postings: Dict[str, Set[int]]
+
+    def __init__(self) -> None:
+        self._texts = {}
+        self._postings = {}
+
+    def add(self, position: int, text: str) -> None:
+        lowered = self._texts[position] = text.lower()
+        postings = self._postings
+        for trigram in _trigrams(lowered):
+            positions = postings.get(trigram)
+            if positions is None:
+                postings[trigram] = {position}
+            else:
+                positions.add(position)
+
+    def discard(self, position: int) -> None:
+        lowered = self._texts.pop(position, None)
+        if lowered is None:
+            return
+        postings = self._postings
+        for trigram in _trigrams(lowered):
+            positions = postings[trigram]
+            positions.discard(position)
+            if not positions:
+                del postings[trigram]
+
+    def is_indexed_as(self, position: int, text: str) -> bool:
+        return self._texts.get(position) == text.lower()
+
+    def matches(self, text: str) -> Optional[Set[int]]:
+        """
+            The positions whose lower-cased text contains text, like text in value.lower().
+            None when text is shorter than a trigram and can not be narrowed by the index
+        """
+        trigrams = _trigrams(text)
+        if not trigrams:
+            return None
+        postings = sorted(
+            (self._postings.get(trigram, _NO_POSITIONS) for trigram in trigrams), key=len)
+        candidates = postings[0].intersection(*postings[1:])
+        texts = self._texts
+        return {position for position in candidates if text in texts[position]}
+
+
+@runtime_checkable
+class EntitySource(Protocol[ET]):
+    """
+        A columnar collection of entities, like a batch read from a snapshot, that an
+        IndexedStorage loads without creating its entities, from the ids and field columns.
+        The storage reads the entities from it later, so it must not change once loaded
+    """
+
+    def __len__(self) -> int: ...
+
+    def __getitem__(self, index: int) -> ET: ...
+
+    def id_values(self) -> Iterable[int]:
+        """The int values of the unique_entity_ids, in order"""
+
+    def field_values(self, field_name: str) -> Iterable[Any]:
+        """The values of a field of all the entities, in order"""
+
+
+class IndexedStorage(Generic[ET]):  # pylint: disable=too-many-instance-attributes
+    """
+        Keep the entities indexed by unique_entity_id, in the order of the repository.
+        The appended entities go to the back list and the prepended ones to the front list,
+        stored reversed, so adding k entities on either side is O(k). A removed entity leaves
+        a hole in its slot, the holes are compacted once they are half of the slots.
+        Each of the sort_fields has a sorted index of (value, position), ties keep the
+        repository order like a stable sort, and each of the text_fields a TrigramIndex.
+        The indexes follow the storage methods, an entity changed in place is reindexed
+        when it is replaced.
+        Loaded from an EntitySource, nothing is read up front: an entity is created when it
+        is first read, and the positions of the ids and the indexes are built from the
+        columns by the first lookup or search that needs them, or by the first write
+    """
+
+    __slots__ = (
+        '_front',
+        '_back',
+        '_positions',
+        '_holes',
+        '_sort_fields',
+        '_sorted',
+        '_keys',
+        '_text_fields',
+        '_text_indexes',
+        '_source',
+        '_building',
+    )
+
+    # As posições negativas são do front: -1 é _front[0], -2 é _front[1]...
+    _front: List[ET]
+    _back: List[ET]
+    # Pelo valor int do id, que tem o hash do próprio int. None até o primeiro uso, como os índices
+    _positions: Optional[Dict[int, int]]
+    _holes: int
+    _sort_fields: Tuple[str, ...]
+    # None até o primeiro uso depois de carregar de uma EntitySource
+    _sorted: Optional[Dict[str, List[Tuple[Any, int]]]]
+    # Os valores indexados de cada posição, a entidade pode ter mudado desde então
+    _keys: Dict[int, Tuple[Any, ...]]
+    _text_fields: Tuple[str, ...]
+    _text_indexes: Optional[Dict[str, TrigramIndex]]
+    _source: Optional[EntitySource[ET]]
+    _building: threading.Lock
+
+    def __init__(
+        self,
+        entities: Iterable[ET] | EntitySource[ET] = (),
+        sort_fields: Iterable[str] = (),
+        text_fields: Iterable[str] = (),
+    ) -> None:
+        self._sort_fields = tuple(sort_fields)
+        self._text_fields = tuple(text_fields)
+        # Os leitores compartilham o lock do repositório, só um deles monta um índice
+        self._building = threading.Lock()
+        if isinstance(entities, EntitySource):
+            self._load_source(entities)
+        else:
+            self._load(list(entities))
+
+    @property
+    def sort_fields(self) -> Tuple[str, ...]:
+        return self._sort_fields
+
+    def append(self, entity: ET) -> None:
+        self._build_indexes()
+        position = len(self._back)
+        self._id_positions()[entity.unique_entity_id.value] = position
+        self._back.append(entity)
+        self._index(entity, position)
+
+    def prepend(self, entities: List[ET]) -> None:
+        """Put the entities, in their order, before all the others"""
+        self._build_indexes()
+        front = self._front
+        first_position = -len(front) - len(entities)
+        for position, entity in enumerate(entities, first_position):
+            self._id_positions()[entity.unique_entity_id.value] = position
+        front.extend(reversed(entities))
+        for field_name, text_index in self._texts().items():
+            for position, entity in enumerate(entities, first_position):
+                text_index.add(position, getattr(entity, field_name))
+        if not self._sort_fields:
+            return
+        sorted_entries = self._sorted_entries()
+        if len(entities) > _BULK_INDEX_SIZE:
+            # Ordenar a lista já ordenada com o lote no fim é mais barato que k inserções
+            keys = [
+                (position, self._key_of(entity))
+                for position, entity in enumerate(entities, first_position)
+            ]
+            self._keys.update(keys)
+            for field_index, field_name in enumerate(self._sort_fields):
+                entries = sorted_entries[field_name]
+                entries.extend((key[field_index], position) for position, key in keys)
+                entries.sort()
+        else:
+            for position, entity in enumerate(entities, first_position):
+                self._index_sorted(entity, position)
+
+    def get(self, unique_entity_id: UniqueEntityId) -> Optional[ET]:
+        position = self._id_positions().get(unique_entity_id.value)
+        if position is None:
+            return None
+        return self._at(position)
+
+    def replace(self, entity: ET) -> bool:
+        """Put the entity at the place of the one with its id, returns False if there is none"""
+        position = self._id_positions().get(entity.unique_entity_id.value)
+        if position is None:
+            return False
+        self._build_indexes()
+        if position >= 0:
+            self._back[position] = entity
+        else:
+            self._front[-position - 1] = entity
+        if self._sort_fields and self._keys[position] != self._key_of(entity):
+            self._unindex_sorted(position)
+            self._index_sorted(entity, position)
+        for field_name, text_index in self._texts().items():
+            text = getattr(entity, field_name)
+            if not text_index.is_indexed_as(position, text):
+                text_index.discard(position)
+                text_index.add(position, text)
+        return True
+
+    def replace_many(self, entities: Iterable[ET]) -> int:
+        """
+            Replace each entity that has a place, returns how many did. A big batch rebuilds
+            the indexes once instead of moving the sorted entries of each entity
+        """
+        found = {
+            entity.unique_entity_id.value: entity
+            for entity in entities
+            if entity.unique_entity_id.value in self._id_positions()
+        }
+        if len(found) <= _BULK_INDEX_SIZE:
+            for entity in found.values():
+                self.replace(entity)
+        else:
+            self._load([found.get(entity.unique_entity_id.value, entity) for entity in self])
+        return len(found)
+
+    def remove_many(self, unique_entity_ids: Iterable[UniqueEntityId]) -> int:
+        """Remove the entities of the ids, like replace_many for a big batch"""
+        removing = {
+            unique_entity_id.value
+            for unique_entity_id in unique_entity_ids
+            if unique_entity_id.value in self._id_positions()
+        }
+        if len(removing) <= _BULK_INDEX_SIZE:
+            for id_value in removing:
+                self.remove(UniqueEntityId.from_int(id_value))
+        else:
+            self._load(
+                [entity for entity in self if entity.unique_entity_id.value not in removing])
+        return len(removing)
+
+    def remove(self, unique_entity_id: UniqueEntityId) -> Optional[ET]:
+        if unique_entity_id.value not in self._id_positions():
+            return None
+        self._build_indexes()
+        position = self._id_positions().pop(unique_entity_id.value)
+        entity = self._at(position)
+        if position >= 0:
+            self._back[position] = _HOLE
+        else:
+            self._front[-position - 1] = _HOLE
+        self._holes += 1
+        if self._sort_fields:
+            self._unindex_sorted(position)
+        for text_index in self._texts().values():
+            text_index.discard(position)
+        if self._holes * 2 > len(self._front) + len(self._back):
+            self._load(list(self))
+        return entity
+
+    def sorted_slice(
+        self,
+        field_name: str,
+        descending: bool = False,
+        start: int = 0,
+        stop: Optional[int] = None,
+    ) -> List[ET]:
+        """The [start:stop] slice of the entities sorted by an indexed field, without sorting"""
+        entries = self._sorted_entries()[field_name]
+        size = len(entries)
+        stop = size if stop is None else min(stop, size)
+        if start >= stop:
+            return []
+        if not descending:
+            return [self._at(position) for _, position in entries[start:stop]]
+
+        # Na ordem decrescente os empates continuam na ordem do repositório, então
+        # a janela é estendida até as bordas dos grupos de valores iguais
+        lowest = bisect_left(entries, entries[size - stop][0], key=itemgetter(0))
+        highest = bisect_right(entries, entries[size - 1 - start][0], key=itemgetter(0))
+        window: List[Tuple[Any, int]] = []
+        for _, group in groupby(reversed(entries[lowest:highest]), key=itemgetter(0)):
+            window.extend(reversed(list(group)))
+        offset = start - (size - highest)
+        return [self._at(position) for _, position in window[offset:offset + stop - start]]
+
+    def text_search(
+        self,
+        text_field: str,
+        text: str,
+        sort_field: Optional[str] = None,
+        descending: bool = False,
+    ) -> Optional[List[ET]]:
+        """
+            The entities whose text_field lower-cased contains text, in the repository order
+            or sorted by an indexed field. None when the text is too short for the index
+        """
+        positions = self._texts()[text_field].matches(text)
+        if positions is None:
+            return None
+        ordered = sorted(positions)
+        if sort_field is not None:
+            self._sorted_entries()
+            field_index = self._sort_fields.index(sort_field)
+            keys = self._keys
+            ordered.sort(key=lambda position: keys[position][field_index], reverse=descending)
+        return [self._at(position) for position in ordered]
+
+    def __contains__(self, unique_entity_id: UniqueEntityId) -> bool:
+        return unique_entity_id.value in self._id_positions()
+
+    def __len__(self) -> int:
+        return len(self._front) + len(self._back) - self._holes
+
+    def __iter__(self) -> Iterator[ET]:
+        if self._holes or self._source is not None:
+            for entity in reversed(self._front):
+                if entity is not _HOLE:
+                    yield entity
+            for position, entity in enumerate(self._back):
+                if entity is _UNLOADED:
+                    entity = self._at(position)
+                if entity is not _HOLE:
+                    yield entity
+        else:
+            yield from reversed(self._front)
+            yield from self._back
+
+    def _at(self, position: int) -> ET:
+        if position < 0:
+            return self._front[-position - 1]
+        entity = self._back[position]
+        if entity is _UNLOADED:
+            # Dois leitores podem criar a mesma entidade, as duas cópias são iguais
+            entity = self._back[position] = self._source[position]
+        return entity
+
+    def _key_of(self, entity: ET) -> Tuple[Any, ...]:
+        return tuple(getattr(entity, field_name) for field_name in self._sort_fields)
+
+    def _index(self, entity: ET, position: int) -> None:
+        if self._sort_fields:
+            self._index_sorted(entity, position)
+        for field_name, text_index in self._texts().items():
+            text_index.add(position, getattr(entity, field_name))
+
+    def _index_sorted(self, entity: ET, position: int) -> None:
+        key = self._keys[position] = self._key_of(entity)
+        sorted_entries = self._sorted_entries()
+        for field_name, value in zip(self._sort_fields, key):
+            insort(sorted_entries[field_name], (value, position))
+
+    def _unindex_sorted(self, position: int) -> None:
+        key = self._keys.pop(position)
+        sorted_entries = self._sorted_entries()
+        for field_name, value in zip(self._sort_fields, key):
+            entries = sorted_entries[field_name]
+            del entries[bisect_left(entries, (value, position))]
+
+    def _id_positions(self) -> Dict[int, int]:
+        if self._positions is None:
+            with self._building:
+                if self._positions is None:
+                    # Ainda sem escritas, a posição i é o item i da fonte
+                    self._positions = {
+                        id_value: index for index, id_value in enumerate(self._source.id_values())
+                    }
+        return self._positions
+
+    def _sorted_entries(self) -> Dict[str, List[Tuple[Any, int]]]:
+        if self._sorted is None:
+            with self._building:
+                if self._sorted is None:
+                    self._build_sorted()
+        return self._sorted
+
+    def _texts(self) -> Dict[str, TrigramIndex]:
+        if self._text_indexes is None:
+            with self._building:
+                if self._text_indexes is None:
+                    self._build_texts()
+        return self._text_indexes
+
+    def _build_indexes(self) -> None:
+        """The writes keep the indexes up to date, so they are built before the first one"""
+        self._sorted_entries()
+        self._texts()
+
+    def _build_sorted(self) -> None:
+        # Ainda sem escritas, a posição i é o item i da fonte
+        columns = [list(self._source.field_values(field_name)) for field_name in self._sort_fields]
+        self._keys = dict(enumerate(zip(*columns)))
+        self._sorted = {
+            field_name: sorted(zip(column, range(len(column))))
+            for field_name, column in zip(self._sort_fields, columns)
+        }
+
+    def _build_texts(self) -> None:
+        text_indexes = {field_name: TrigramIndex() for field_name in self._text_fields}
+        for field_name, text_index in text_indexes.items():
+            for position, text in enumerate(self._source.field_values(field_name)):
+                text_index.add(position, text)
+        self._text_indexes = text_indexes
+
+    def _load_source(self, source: EntitySource[ET]) -> None:
+        self._front = []
+        self._back = [_UNLOADED] * len(source)
+        self._positions = None
+        self._holes = 0
+        self._keys = {}
+        self._sorted = None
+        self._text_indexes = None
+        self._source = source
+
+    def _load(self, entities: List[ET]) -> None:
+        self._front = []
+        self._back = entities
+        self._positions = {
+            entity.unique_entity_id.value: index for index, entity in enumerate(entities)
+        }
+        self._holes = 0
+        self._source = None
+        self._keys = {}
+        self._sorted = {field_name: [] for field_name in self._sort_fields}
+        if self._sort_fields:
+            self._keys = {index: self._key_of(entity) for index, entity in enumerate(entities)}
+            for field_index, field_name in enumerate(self._sort_fields):
+                self._sorted[field_name] = sorted(
+                    (key[field_index], position) for position, key in self._keys.items()
+                )
+        self._text_indexes = {field_name: TrigramIndex() for field_name in self._text_fields}
+        for field_name, text_index in self._text_indexes.items():
+            for position, entity in enumerate(entities):
+                text_index.add(position, getattr(entity, field_name))
@@ -3,11 +3,19 @@
     It is an internal library
 """
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
 from dataclasses import dataclass
-from typing import Any, Dict, Generic, List, Optional, TypeVar
+from functools import lru_cache
+from typing import (Any, Callable, ClassVar, Dict, Generic, List, Optional,
+                    Sequence, Tuple, Type, TypeVar)
 
-from rest_framework.fields import BooleanField, CharField
-from rest_framework.serializers import Serializer
+from django.core.validators import (MaxLengthValidator, MinLengthValidator,
+                                    ProhibitNullCharactersValidator)
+from rest_framework.exceptions import ValidationError as DRFValidationError
+from rest_framework.fields import (BooleanField, CharField, Field, SkipField,
+                                   empty)
+from rest_framework.serializers import ListSerializer, Serializer
+from rest_framework.validators import ProhibitSurrogateCharactersValidator
 
 from .exceptions import ValidationRulesException
 
@@ -65,6 +73,16 @@ class ValidatorFieldsInterface(ABC, Generic[PropsValidated]):
     def validate(self, data: Any) -> bool:
         raise NotImplementedError()
 
+    def validate_many(self, data_list: Sequence[Any]) -> Dict[int, ErrorFields]:
+        """Validate a batch with this same validator, returning the errors by index of the
+            invalid data. An empty dict means the whole batch is valid"""
+        errors = {}
+        for index, data in enumerate(data_list):
+            self.errors = None
+            if not self.validate(data):
+                errors[index] = self.errors
+        return errors
+
 
 @dataclass(slots=True)
 class ValidatorRulesValidator(ABC, Generic[PropsValidated]):
@@ -89,6 +107,19 @@ class DRFValidator(ValidatorFieldsInterface[PropsValidated], ABC):
         }
         return False
 
+    def validate_list(self, data: ListSerializer) -> Dict[int, ErrorFields]:
+        """Validate a batch with one many=True serializer, so a single child serializer
+            validates every item"""
+        if data.is_valid():
+            self.validated_data = data.validated_data  # type: ignore
+            return {}
+
+        return {
+            index: {key: [str(err) for err in errors] for key, errors in item_errors.items()}
+            for index, item_errors in enumerate(data.errors)
+            if item_errors
+        }
+
 
 class StrictBooleanField(BooleanField):
     """Accept only True, False and None.
@@ -113,3 +144,138 @@ class StrictCharField(CharField):
             self.fail('invalid')
 
         return super().to_internal_value(data)
+
+
+_FALLBACK = object()
+
+FieldCheck = Callable[[Any], Any]
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledField:
+    """A serializer field with its plain check, built once per rules class.
+        The check returns the internal value or _FALLBACK when the DRF field must decide
+    """
+    name: str
+    field: Field
+    check: Optional[FieldCheck]
+
+
+def _compile_char_field(field: CharField) -> Optional[FieldCheck]:
+    known_validators = (
+        MaxLengthValidator,
+        MinLengthValidator,
+        ProhibitNullCharactersValidator,
+        ProhibitSurrogateCharactersValidator,
+    )
+    if any(not isinstance(validator, known_validators) for validator in field.validators):
+        return None
+
+    allow_null = field.allow_null
+    allow_blank = field.allow_blank
+    trim_whitespace = field.trim_whitespace
+    max_length = field.max_length
+    min_length = field.min_length
+
+    def check(value: Any) -> Any:  # pylint: disable=too-many-return-statements
+        if value is None:
+            return None if allow_null else _FALLBACK
+        if value.__class__ is not str:
+            return _FALLBACK
+        if trim_whitespace:
+            value = value.strip()
+        if value == '':
+            return '' if allow_blank else _FALLBACK
+        if max_length is not None and len(value) > max_length:
+            return _FALLBACK
+        if min_length is not None and len(value) < min_length:
+            return _FALLBACK
+        if '\x00' in value:
+            return _FALLBACK
+        if not value.isascii():
+            try:
+                value.encode('utf-8')
+            except UnicodeEncodeError:
+                return _FALLBACK
+        return value
+
+    return check
+
+
+def _compile_boolean_field(field: BooleanField) -> Optional[FieldCheck]:
+    if field.validators:
+        return None
+
+    allow_null = field.allow_null
+
+    def check(value: Any) -> Any:
+        if value is True or value is False:
+            return value
+        if value is None and allow_null:
+            return None
+        return _FALLBACK
+
+    return check
+
+
+@lru_cache(maxsize=None)
+def compile_rules(rules: Type[Serializer]) -> Tuple[CompiledField, ...]:
+    """Build the plain checks of a DRF Serializer's fields once per class.
+        Only field level rules can be compiled, so serializer level hooks are refused
+    """
+    if rules.validate is not Serializer.validate:
+        raise ValidationRulesException(f"{rules.__name__}.validate cannot be compiled")
+
+    compiled = []
+    for name, field in rules().fields.items():
+        if field.read_only:
+            continue
+        if hasattr(rules, f'validate_{name}'):
+            raise ValidationRulesException(
+                f"{rules.__name__}.validate_{name} cannot be compiled")
+
+        check = None
+        if isinstance(field, CharField):
+            check = _compile_char_field(field)
+        elif isinstance(field, BooleanField):
+            check = _compile_boolean_field(field)
+        compiled.append(CompiledField(name, field, check))
+    return tuple(compiled)
+
+
+class DRFCompiledValidator(DRFValidator[PropsValidated], ABC):
+    """Define a domain validator with the same rules and errors of a DRFValidator,
+        but without creating a Serializer for each validation.
+        The valid values are accepted by plain checks and the DRF field only runs
+        to build the exact error messages or for the field types that are not compiled
+    """
+
+    rules: ClassVar[Type[Serializer]]
+
+    def validate(self, data: Any) -> bool:
+        data = data or {}
+        if not isinstance(data, Mapping):
+            return super().validate(self.rules(data=data))
+
+        validated_data = {}
+        errors = {}
+        for compiled_field in compile_rules(self.rules):
+            value = data.get(compiled_field.name, empty)
+            internal_value = compiled_field.check(value) \
+                if compiled_field.check and value is not empty else _FALLBACK
+            if internal_value is _FALLBACK:
+                try:
+                    internal_value = compiled_field.field.run_validation(value)
+                except DRFValidationError as err:
+                    errors[compiled_field.name] = [str(detail) for detail in err.detail]
+                    continue
+                except SkipField:
+                    continue
+            validated_data[compiled_field.name] = internal_value
+
+        if errors:
+            self.errors = errors
+            return False
+
+        self.validated_data = validated_data  # type: ignore
+        return True
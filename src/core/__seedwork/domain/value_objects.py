@@ -1,17 +1,43 @@
 import json
+import secrets
+import threading
+import time
 import uuid
 from abc import ABC
-from dataclasses import dataclass, field, fields
+from dataclasses import dataclass, fields
+from typing import TYPE_CHECKING, Callable, ClassVar, Dict, Literal, Optional
 
 from core.__seedwork.domain.exceptions import InvalidUUidException
 
 
 @dataclass(frozen=True)
 class ValueObject(ABC):
+    """
+        Value objects of the same class are equal when their values are equal.
+        The subclasses declared with eq=False keep this __eq__ and __hash__,
+        the hash is computed once and cached in the frozen instance
+    """
+    __slots__ = ('_hash',)
+
+    if TYPE_CHECKING:
+        # Só nos slots, fora dos campos do dataclass
+        _hash: int
+
     def __eq__(self, other):
-        if not isinstance(other, ValueObject):
-            raise NotImplementedError(
-                f"ValueObject cannot be compared equally with {type(other)}")
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._values() == other._values()
+
+    def __hash__(self):
+        try:
+            return self._hash
+        except AttributeError:
+            value_hash = hash(self._values())
+            object.__setattr__(self, '_hash', value_hash)
+            return value_hash
+
+    def _values(self) -> tuple:
+        return tuple(getattr(self, field.name) for field in fields(self))
 
     def __str__(self) -> str:
         fields_name = [field.name for field in fields(self)]
@@ -20,25 +46,123 @@ class ValueObject(ABC):
         return json.dumps({field_name: getattr(self, field_name) for field_name in fields_name})
 
 
-@dataclass(frozen=True)
+_uuid7_lock = threading.Lock()
+_uuid7_last_sequence = 0
+
+
+def uuid7() -> uuid.UUID:
+    """
+        Generate a time-ordered UUID version 7 (RFC 9562): 48 bits of unix epoch milliseconds,
+        a 12 bits counter that keeps the ids of the same millisecond ordered and 62 random bits.
+        New ids are always greater than the previous ones, so they are appended at the right
+        of a B-tree primary key index instead of spread all over it
+    """
+    global _uuid7_last_sequence  # pylint: disable=global-statement
+    with _uuid7_lock:
+        sequence = (time.time_ns() // 1_000_000) << 12
+        if sequence <= _uuid7_last_sequence:
+            sequence = _uuid7_last_sequence + 1
+        _uuid7_last_sequence = sequence
+
+    return uuid.UUID(int=(
+        (sequence >> 12) << 80
+        | 0x7 << 76
+        | (sequence & 0xFFF) << 64
+        | 0b10 << 62
+        | secrets.randbits(62)
+    ))
+
+
+IdGeneratorMode = Literal['uuid4', 'uuid7']
+
+ID_GENERATORS: Dict[str, Callable[[], uuid.UUID]] = {
+    'uuid4': uuid.uuid4,
+    'uuid7': uuid7,
+}
+
+
+@dataclass(frozen=True, init=False, repr=False, eq=False)
 class UniqueEntityId(ValueObject):
+    """
+        The id is kept as its 128-bit int, so comparing and hashing are integer operations.
+        The canonical string is only built, and then cached, when it is asked for
+    """
+
+    __slots__ = ('value', '_id')
 
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))  # pylint: disable=invalid-name
+    value: int
 
-    def __post_init__(self):
-        # garante que sempre seja uma string
-        id_value = str(self.id) if isinstance(self.id, uuid.UUID) else self.id
-        object.__setattr__(self, 'id', id_value)
+    if TYPE_CHECKING:
+        _id: Optional[str]
+
+    generator_mode: ClassVar[IdGeneratorMode] = 'uuid4'
+
+    def __init__(self, id: str | uuid.UUID | None = None):  # pylint: disable=redefined-builtin
+        if id is None:
+            id = ID_GENERATORS[self.generator_mode]()
+        object.__setattr__(self, 'value', self.__parse(id))
+        object.__setattr__(self, '_id', None)
         self.__validate()
 
-    def __validate(self):
+    @classmethod
+    def from_uuid(cls, value: uuid.UUID) -> 'UniqueEntityId':
+        """Create the id from an uuid.UUID, which is already valid, without parsing it"""
+        return cls.from_int(value.int)
+
+    @classmethod
+    def from_int(cls, value: int) -> 'UniqueEntityId':
+        """Create the id from the 128-bit int of a trusted UUID"""
+        unique_entity_id = object.__new__(cls)
+        object.__setattr__(unique_entity_id, 'value', value)
+        object.__setattr__(unique_entity_id, '_id', None)
+        return unique_entity_id
+
+    @classmethod
+    def restore(cls, value: str | uuid.UUID) -> 'UniqueEntityId':
+        """Create the id from a trusted value, like a persisted primary key, without validation"""
+        if isinstance(value, uuid.UUID):
+            return cls.from_uuid(value)
+        unique_entity_id = object.__new__(cls)
+        object.__setattr__(unique_entity_id, 'value', int(value.replace('-', ''), 16))
+        object.__setattr__(unique_entity_id, '_id', value if len(value) == 36 else None)
+        return unique_entity_id
+
+    @property
+    def id(self) -> str:  # pylint: disable=invalid-name
+        id_value = self._id
+        if id_value is None:
+            id_value = str(uuid.UUID(int=self.value))
+            object.__setattr__(self, '_id', id_value)
+        return id_value
+
+    @staticmethod
+    def __parse(value: str | uuid.UUID) -> int | None:
+        if isinstance(value, uuid.UUID):
+            return value.int
         try:
-            uuid.UUID(self.id)
-        except Exception as ex:
-            raise InvalidUUidException() from ex
+            return uuid.UUID(value).int
+        except Exception:  # pylint: disable=broad-exception-caught
+            return None
+
+    def __validate(self):
+        if self.value is None:
+            raise InvalidUUidException()
+
+    def _values(self) -> tuple:
+        return (self.value,)
+
+    def __eq__(self, other):
+        if isinstance(other, UniqueEntityId):
+            return self.value == other.value
+        return NotImplemented
+
+    __hash__ = ValueObject.__hash__
+
+    def __reduce__(self):
+        return (self.__class__.from_int, (self.value,))
 
     def __str__(self):
-        return f"{self.id}"
+        return self.id
 
     def __repr__(self):
-        return f"{self.id}"
+        return self.id
@@ -9,11 +9,17 @@ class UUIDSerializer(serializers.Serializer):  # pylint: disable=abstract-method
     id = serializers.UUIDField()
 
 
+class UUIDListSerializer(serializers.Serializer):  # pylint: disable=abstract-method
+    ids = serializers.ListField(child=serializers.UUIDField(), allow_empty=False)
+
+
 class PaginationSerializer(serializers.Serializer):  # pylint: disable=abstract-method
-    total = serializers.IntegerField()
+    total = serializers.IntegerField(allow_null=True)
     page = serializers.IntegerField()
     per_page = serializers.IntegerField()
-    last_page = serializers.IntegerField()
+    last_page = serializers.IntegerField(allow_null=True)
+    next_cursor = serializers.CharField(allow_null=True)
+    prev_cursor = serializers.CharField(allow_null=True)
 
 
 class ResourceSerializer(serializers.Serializer):  # pylint: disable=abstract-method
@@ -1,9 +1,14 @@
-from typing import Any, Dict, Literal
+import timeit
+from typing import Any, Callable, Dict, List, Literal, Tuple
 
 from django.http.request import HttpRequest
 from rest_framework.request import Request as DrfRequest
 from rest_framework.test import APIRequestFactory
 
+from core.__seedwork.domain.entities import Entity
+from core.__seedwork.domain.repositories import (RepositoryInterface,
+                                                 SearchResult)
+
 HTTP_VERB = Literal['get', 'post', 'put', 'delete']
 
 
@@ -19,3 +24,72 @@ def make_request(http_method: HTTP_VERB, url: str = '/', send_data: Any = None)
 def assert_response_data(response_data: Dict, expected_data: Dict):
     for key, value in expected_data.items():
         assert response_data[key] == value
+
+
+def assert_bulk_update_cleans_the_written_fields(
+    repo: RepositoryInterface,
+    entities: List[Entity],
+    change: Callable[[Entity], None],
+    unknown: Entity,
+    field_name: str,
+):
+    """
+        The behavior all the repositories share: bulk_update marks clean only the fields it
+        wrote, and only in the stored entities. change has to dirty field_name and another field
+    """
+    repo.bulk_insert(entities)
+    for entity in entities:
+        change(entity)
+    dirty_fields = [entity.dirty_fields for entity in entities]
+    unknown_dirty_fields = unknown.dirty_fields
+
+    assert repo.bulk_update([*entities, unknown], fields=[field_name]) == len(entities)
+    for entity, entity_dirty_fields in zip(entities, dirty_fields):
+        assert entity.dirty_fields == entity_dirty_fields - {field_name}
+        assert entity.dirty_fields
+    assert unknown.dirty_fields == unknown_dirty_fields
+
+    assert repo.bulk_update([*entities, unknown]) == len(entities)
+    for entity in entities:
+        assert entity.dirty_fields == frozenset()
+        assert repo.find_by_id(entity.id) == entity
+    assert unknown.dirty_fields == unknown_dirty_fields
+
+
+def walk_pages_forward(
+    search: Callable[..., SearchResult],
+    **props,
+) -> Tuple[List[Entity], SearchResult]:
+    """The items of the first page and of all the next_cursor pages after it, and the last page"""
+    result = search(**props)
+    items = list(result.items)
+    while result.next_cursor:
+        result = search(**props, cursor=result.next_cursor)
+        items.extend(result.items)
+    return items, result
+
+
+def walk_pages_backward(
+    search: Callable[..., SearchResult],
+    last_page: SearchResult,
+    **props,
+) -> List[Entity]:
+    """The items of last_page and of all the prev_cursor pages before it, in order"""
+    result = last_page
+    items = list(result.items)
+    while result.prev_cursor:
+        result = search(**props, cursor=result.prev_cursor)
+        items[:0] = result.items
+    return items
+
+
+def measure(func: Callable[[], Any], number: int = 1000, repeat: int = 5) -> float:
+    """Returns the best time, in seconds, of a single call of func"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def print_benchmark(title: str, results: Dict[str, float]):
+    baseline = next(iter(results.values()))
+    print(f"\n{title}")
+    for name, seconds in results.items():
+        print(f"    {name:<24} {seconds * 1e6:>12.2f} us/call {baseline / seconds:>8.2f}x")
@@ -0,0 +1,109 @@
+# pylint: disable=protected-access
+import random
+
+import pytest
+
+from core.__seedwork.domain.repositories import SearchParams
+from core.__seedwork.domain.storage import IndexedStorage
+from core.__seedwork.infra.testing_helpers import measure, print_benchmark
+
+from .test_repositories import StubEntity, StubInMemorySearchableRepository
+
+
+class ListStorage:
+    """The list scan the in-memory repository used before IndexedStorage"""
+
+    def __init__(self, entities):
+        self.items = list(entities)
+
+    def prepend(self, entities):
+        self.items = entities + self.items
+
+    def get(self, unique_entity_id):
+        for item in self.items:
+            if item.unique_entity_id == unique_entity_id:
+                return item
+        return None
+
+    def replace(self, entity):
+        for index, item in enumerate(self.items):
+            if item.unique_entity_id == entity.unique_entity_id:
+                self.items[index] = entity
+                return True
+        return False
+
+
+@pytest.mark.group('benchmark')
+class TestIndexedStorageBenchmark:
+
+    size = 100000
+
+    def test_against_the_list_scan(self):
+        entities = [StubEntity(name=str(index)) for index in range(self.size)]
+        batch = [StubEntity(name='new') for _ in range(100)]
+        middle = entities[self.size // 2]
+        storages = {
+            'list': ListStorage(entities),
+            'IndexedStorage': IndexedStorage(entities),
+        }
+
+        for operation, run in {
+            'find_by_id': lambda storage: storage.get(middle.unique_entity_id),
+            'update': lambda storage: storage.replace(middle),
+            'bulk_insert 100': lambda storage: storage.prepend(batch),
+        }.items():
+            results = {
+                name: measure(lambda storage=storage, run=run: run(storage), number=20, repeat=3)
+                for name, storage in storages.items()
+            }
+            print_benchmark(f'{operation} over {self.size} entities', results)
+            assert results['IndexedStorage'] < results['list']
+
+
+@pytest.mark.group('benchmark')
+class TestSortedIndexBenchmark:
+
+    size = 100000
+
+    def test_search_page_against_the_full_sort(self):
+        repo = StubInMemorySearchableRepository()
+        repo.bulk_insert([StubEntity(name=f'Name {index % 5000}') for index in range(self.size)])
+        params = SearchParams(page=3, per_page=15, sort='name', sort_dir='desc')
+
+        def full_sort():
+            items = repo._apply_sort(repo.items, params.sort, params.sort_dir)
+            return repo._apply_paginate(items, params.page, params.per_page)
+
+        assert repo.search(params).items == full_sort()
+        results = {
+            'full sort': measure(full_sort, number=3, repeat=3),
+            'sorted index': measure(lambda: repo.search(params), number=3, repeat=3),
+        }
+        print_benchmark(f'search page over {self.size} entities', results)
+        assert results['sorted index'] < results['full sort']
+
+
+@pytest.mark.group('benchmark')
+class TestTopKBenchmark:
+
+    @pytest.mark.parametrize('size', [10000, 100000, 1000000])
+    def test_heap_selection_against_the_full_sort(self, size):
+        repo = StubInMemorySearchableRepository()
+        rand = random.Random(size)
+        items = [StubEntity(name=f'Name {rand.randrange(size)}') for _ in range(size)]
+        page, per_page = 3, 15
+
+        def full_sort():
+            return repo._apply_paginate(repo._apply_sort(items, 'name', 'desc'), page, per_page)
+
+        def top_k():
+            return repo._apply_sort_and_paginate(items, 'name', 'desc', page, per_page)
+
+        assert top_k() == full_sort()
+        number = max(1, 100000 // size)
+        results = {
+            'full sort': measure(full_sort, number=number, repeat=3),
+            'heap top-k': measure(top_k, number=number, repeat=3),
+        }
+        print_benchmark(f'page {page} of {per_page} over {size} entities', results)
+        assert results['heap top-k'] < results['full sort']
@@ -0,0 +1,46 @@
+import tracemalloc
+import uuid
+
+import pytest
+
+from core.__seedwork.domain.value_objects import UniqueEntityId
+from core.__seedwork.infra.testing_helpers import measure, print_benchmark
+
+
+def allocated_bytes(factory, count: int) -> float:
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objs = [factory() for _ in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert len(objs) == count
+    return (after - before) / count
+
+
+@pytest.mark.group('benchmark')
+class TestUniqueEntityIdBenchmark:
+
+    def test_memory_against_the_string_id(self):
+        uuids = iter([uuid.uuid4() for _ in range(20000)])
+        string_bytes = allocated_bytes(lambda: str(next(uuids)), 10000)
+        int_bytes = allocated_bytes(lambda: UniqueEntityId.from_uuid(next(uuids)), 10000)
+        print(f"\nUniqueEntityId memory\n    str id {string_bytes:.0f} bytes"
+              f"\n    int id {int_bytes:.0f} bytes")
+        assert int_bytes < string_bytes
+
+    def test_comparison_against_the_string_id(self):
+        uuid_value = uuid.uuid4()
+        value_object1 = UniqueEntityId(uuid_value)
+        value_object2 = UniqueEntityId(str(uuid_value))
+        value_object1_str, value_object2_str = str(uuid_value), str(uuid_value)
+
+        results = {
+            'str(id) == str(id)': measure(
+                lambda: str(value_object1) == str(value_object2), number=100000),
+            'str == str': measure(lambda: value_object1_str == value_object2_str, number=100000),
+            'id == id': measure(lambda: value_object1 == value_object2, number=100000),
+        }
+        print_benchmark('UniqueEntityId comparison', results)
+        assert results['id == id'] < results['str(id) == str(id)']
@@ -1,15 +1,20 @@
 # pylint: disable=protected-access
 # pylint: disable=abstract-class-instantiated
+import random
 import unittest
 from dataclasses import dataclass, is_dataclass
 from typing import List, Optional
 
 from core.__seedwork.domain.entities import Entity
+from core.__seedwork.domain.exceptions import InvalidCursorException
 from core.__seedwork.domain.repositories import (
-    ET, Filters, InMemoryRepository, InMemorySearchableRepositoryInterface,
-    RepositoryInterface, SearchableRepositoryInterface, SearchParams,
-    SearchResult)
+    ET, Cursor, Filters, InMemoryRepository,
+    InMemorySearchableRepositoryInterface, RepositoryInterface,
+    SearchableRepositoryInterface, SearchCacheInfo, SearchParams, SearchResult,
+    TotalMode)
 from core.__seedwork.domain.value_objects import UniqueEntityId
+from core.__seedwork.infra.testing_helpers import (walk_pages_backward,
+                                                   walk_pages_forward)
 
 
 class TestRepositoryInterface(unittest.TestCase):
@@ -19,8 +24,9 @@ class TestRepositoryInterface(unittest.TestCase):
             RepositoryInterface()  # type: ignore
         self.assertEqual(
             err.exception.args[0],
-            "Can't instantiate abstract class RepositoryInterface with abstract "
-            "methods bulk_insert, delete, find_all, find_by_id, insert, update"
+            "Can't instantiate abstract class RepositoryInterface with abstract methods "
+            "bulk_delete, bulk_insert, bulk_update, delete, find_all, find_by_id, find_by_ids, "
+            "insert, iter_all, update, upsert_many"
         )
 
 
@@ -72,6 +78,20 @@ class TestInMemoryRepository(unittest.TestCase):
 
         self.assertListEqual(self.repo.find_all(), entities)
 
+    def test_it_iterates_over_a_snapshot_of_the_items(self):
+        entities = [StubEntity(name=name) for name in ["Teste1", "Teste2", "Teste3"]]
+        for entity in entities:
+            self.repo.insert(entity)
+
+        iterator = self.repo.iter_all(chunk_size=2)
+        self.assertIs(next(iterator), entities[0])
+        self.repo.delete(entities[1])
+        self.repo.insert(StubEntity(name="Teste4"))
+        self.assertListEqual(list(iterator), entities[1:])
+
+        with self.assertRaises(ValueError):
+            next(self.repo.iter_all(chunk_size=0))
+
     def test_it_can_remove_an_item(self):
         entities = list(map(lambda name: StubEntity(
             name=name), ["Teste1", "Teste2", "Teste3"]))
@@ -94,6 +114,130 @@ class TestInMemoryRepository(unittest.TestCase):
         self.assertTrue(entity1)
         self.assertEqual(entity1.name, "UpdatedName")  # type: ignore
 
+    def test_it_can_retrieve_an_item_by_unique_entity_id(self):
+        entities = [StubEntity(name=name) for name in ["Teste1", "Teste2", "Teste3"]]
+        self.repo.bulk_insert(entities)
+
+        self.assertIs(self.repo.find_by_id(entities[1].unique_entity_id), entities[1])
+        self.assertIs(self.repo.find_by_id(UniqueEntityId(entities[1].id)), entities[1])
+        self.assertIsNone(self.repo.find_by_id(UniqueEntityId()))
+        self.assertIsNone(self.repo.find_by_id("not a valid id"))
+
+    def test_it_indexes_the_items_when_they_are_reassigned(self):
+        entities = [StubEntity(name=name) for name in ["Teste1", "Teste2", "Teste3"]]
+        self.repo.insert(StubEntity(name="Teste0"))
+        self.repo.items = entities
+
+        self.assertIs(self.repo.find_by_id(entities[2].id), entities[2])
+        self.assertListEqual(self.repo.find_all(), entities)
+
+    def test_it_ignores_update_and_delete_of_unknown_items(self):
+        entities = [StubEntity(name=name) for name in ["Teste1", "Teste2"]]
+        self.repo.bulk_insert(entities)
+        version = self.repo.write_version
+
+        self.repo.update(StubEntity(name="Teste3"))
+        self.repo.delete(StubEntity(name="Teste3"))
+        self.assertListEqual(self.repo.items, entities)
+        self.assertEqual(self.repo.write_version, version)
+
+    def test_bulk_insert_keeps_the_items_before_the_existing_ones(self):
+        entity = StubEntity(name="Teste0")
+        self.repo.insert(entity)
+        entities = [StubEntity(name=name) for name in ["Teste1", "Teste2"]]
+        self.repo.bulk_insert(entities)
+
+        self.assertListEqual(self.repo.items, [*entities, entity])
+        self.assertIs(self.repo.find_by_id(entities[0].id), entities[0])
+
+    def test_bulk_update(self):
+        entities = [StubEntity(name=f"Teste{index}") for index in range(3)]
+        self.repo.bulk_insert(entities)
+        version = self.repo.write_version
+
+        changed = [
+            StubEntity(unique_entity_id=entities[0].unique_entity_id, name="Changed0"),
+            StubEntity(unique_entity_id=entities[2].unique_entity_id, name="Changed2"),
+            StubEntity(name="Unknown"),
+        ]
+        self.assertEqual(self.repo.bulk_update(changed), 2)
+        self.assertListEqual(self.repo.items, [changed[0], entities[1], changed[1]])
+        self.assertEqual(self.repo.write_version, version + 1)
+
+        self.assertEqual(self.repo.bulk_update(changed, fields=[]), 2)
+        self.assertListEqual(self.repo.items, [changed[0], entities[1], changed[1]])
+        with self.assertRaises(ValueError):
+            self.repo.bulk_update(changed, batch_size=0)
+
+    def test_bulk_update_with_fields_copies_them_to_a_copy(self):
+        stored = StubEntity(name="Teste")
+        self.repo.insert(stored)
+
+        changed = StubEntity(unique_entity_id=stored.unique_entity_id, name="Changed")
+        self.assertEqual(self.repo.bulk_update([changed], fields=["name"]), 1)
+        updated = self.repo.find_by_id(stored.id)
+        self.assertEqual(updated.name, "Changed")
+        self.assertIsNot(updated, changed)
+        self.assertEqual(stored.name, "Teste")
+
+    def test_bulk_delete(self):
+        entities = [StubEntity(name=f"Teste{index}") for index in range(4)]
+        self.repo.bulk_insert(entities)
+
+        deleted = self.repo.bulk_delete(
+            [entities[0].id, entities[2].unique_entity_id, "invalid", StubEntity(name="x").id])
+        self.assertEqual(deleted, 2)
+        self.assertListEqual(self.repo.items, [entities[1], entities[3]])
+        self.assertEqual(self.repo.bulk_delete([]), 0)
+
+    def test_find_by_ids(self):
+        entities = [StubEntity(name=f"Teste{index}") for index in range(3)]
+        self.repo.bulk_insert(entities)
+
+        found = self.repo.find_by_ids(
+            [entities[2].id, entities[0].unique_entity_id, "invalid", StubEntity(name="x").id,
+             entities[2].id])
+        self.assertDictEqual(found, {
+            entities[2].unique_entity_id: entities[2],
+            entities[0].unique_entity_id: entities[0],
+        })
+        self.assertDictEqual(self.repo.find_by_ids([]), {})
+
+        with self.assertRaises(ValueError):
+            self.repo.find_by_ids([entities[0].id], batch_size=0)
+
+    def test_upsert_many(self):
+        entities = [StubEntity(name=f"Teste{index}") for index in range(2)]
+        self.repo.bulk_insert(entities)
+
+        changed = StubEntity(unique_entity_id=entities[1].unique_entity_id, name="Changed")
+        new = [StubEntity(name="New0"), StubEntity(name="New1")]
+        self.repo.upsert_many([new[0], changed, new[1], new[0]])
+        self.assertListEqual(self.repo.items, [*new, entities[0], changed])
+        for entity in [*new, changed]:
+            self.assertIs(self.repo.find_by_id(entity.id), entity)
+
+    def test_bulk_writes_of_a_big_batch_rebuild_the_indexes_once(self):
+        entities = [StubEntity(name=f"Teste{index}") for index in range(300)]
+        self.repo.bulk_insert(entities)
+
+        changed = [
+            StubEntity(unique_entity_id=entity.unique_entity_id, name=f"Changed {entity.name}")
+            for entity in entities[::2]
+        ]
+        self.assertEqual(self.repo.bulk_update(changed), 150)
+        expected = [
+            changed[index // 2] if index % 2 == 0 else entity
+            for index, entity in enumerate(entities)
+        ]
+        self.assertListEqual(self.repo.items, expected)
+
+        self.assertEqual(self.repo.bulk_delete(entity.id for entity in changed[:100]), 100)
+        self.assertListEqual(
+            self.repo.items, [entity for entity in expected if entity not in changed[:100]])
+        for entity in changed[:100]:
+            self.assertIsNone(self.repo.find_by_id(entity.id))
+
 
 class TestSearchParams(unittest.TestCase):
 
@@ -103,7 +247,9 @@ class TestSearchParams(unittest.TestCase):
             'per_page': int,
             'sort': Optional[str],
             'sort_dir': Optional[str],
-            'filters': Optional[Filters]
+            'filters': Optional[Filters],
+            'cursor': Optional[str],
+            'with_total': TotalMode,
         })
 
     def test_page_prop(self):
@@ -224,15 +370,41 @@ class TestSearchParams(unittest.TestCase):
             params = SearchParams(filters=i['filters'])
             self.assertEqual(params.filters, i['expected'], i)
 
+    def test_with_total_prop(self):
+        params = SearchParams()
+        self.assertIs(params.with_total, True)
+
+        arrange = [
+            {'with_total': None, 'expected': False},
+            {'with_total': "", 'expected': True},
+            {'with_total': "true", 'expected': True},
+            {'with_total': "1", 'expected': True},
+            {'with_total': "false", 'expected': False},
+            {'with_total': " False ", 'expected': False},
+            {'with_total': "0", 'expected': False},
+            {'with_total': "off", 'expected': False},
+            {'with_total': "estimate", 'expected': 'estimate'},
+            {'with_total': "ESTIMATE", 'expected': 'estimate'},
+            {'with_total': 0, 'expected': False},
+            {'with_total': 1, 'expected': True},
+            {'with_total': False, 'expected': False},
+        ]
+
+        for i in arrange:
+            params = SearchParams(with_total=i['with_total'])
+            self.assertEqual(params.with_total, i['expected'], i)
+
 
 class TestSearchResult(unittest.TestCase):
 
     def test_props_annotations(self):
         self.assertEqual(SearchResult.__annotations__, {
             "items": List[ET],
-            "total": int,
-            "last_page": int,
+            "total": Optional[int],
+            "last_page": Optional[int],
             "search_params": SearchParams[Filters],
+            "next_cursor": Optional[str],
+            "prev_cursor": Optional[str],
         })
 
     def test_last_page(self):
@@ -258,6 +430,9 @@ class TestSearchResult(unittest.TestCase):
 
             self.assertEqual(search_result.last_page, data["last_page"])
 
+        search_result = SearchResult(items=items, total=None, search_params=SearchParams())
+        self.assertIsNone(search_result.last_page)
+
     def test_to_dict(self):
         items = [StubEntity(name='Teste1')]
 
@@ -278,6 +453,8 @@ class TestSearchResult(unittest.TestCase):
             "sort": None,
             "sort_dir": None,
             "filters": None,
+            "next_cursor": None,
+            "prev_cursor": None,
         })
 
 
@@ -289,7 +466,8 @@ class TestSearchblaeRepositoryInterface(unittest.TestCase):
         self.assertEqual(
             err.exception.args[0],
             "Can't instantiate abstract class SearchableRepositoryInterface with abstract "
-            "methods bulk_insert, delete, find_all, find_by_id, insert, search, update"
+            "methods bulk_delete, bulk_insert, bulk_update, delete, find_all, find_by_id, "
+            "find_by_ids, insert, iter_all, search, update, upsert_many"
         )
 
 
@@ -348,6 +526,20 @@ class TestInMemorySearchableRepository(unittest.TestCase):
         result = self.repo._apply_sort(items, 'name', 'desc')
         self.assertEqual([items[2], items[0], items[1]], result)
 
+    def test__apply_sort_keeps_the_ties_in_the_repository_order_like_the_sorted_index(self):
+        items = [StubEntity(name=f'Name {index % 3}') for index in range(30)]
+        self.repo.bulk_insert(items)
+
+        for sort_dir in ['asc', 'desc']:
+            expected = sorted(items, key=lambda item: item.name, reverse=sort_dir == 'desc')
+            self.assertListEqual(self.repo._apply_sort(items, 'name', sort_dir), expected)
+            params = SearchParams(per_page=30, sort='name', sort_dir=sort_dir)
+            self.assertListEqual(self.repo.search(params).items, expected)
+            for page in [1, 2, 3]:
+                params = SearchParams(page=page, per_page=7, sort='name', sort_dir=sort_dir)
+                self.assertListEqual(
+                    self.repo.search(params).items, expected[(page - 1) * 7:page * 7])
+
     def test_apply_invalid_sort_field_should_ignore_it(self):
         items = [
             StubEntity(name='b'),
@@ -357,6 +549,21 @@ class TestInMemorySearchableRepository(unittest.TestCase):
         result = self.repo._apply_sort(items, 'no_price', 'asc')
         self.assertEqual(items, result)
 
+    def test__apply_sort_and_paginate_selects_like_the_full_sort(self):
+        rand = random.Random(13)
+        items = [StubEntity(name=rand.choice('abcdef')) for _ in range(2000)]
+
+        for page, per_page in [(1, 1), (1, 15), (2, 15), (3, 10), (30, 1), (200, 10), (1, 500)]:
+            for sort_dir in ['asc', 'desc']:
+                expected = self.repo._apply_paginate(
+                    self.repo._apply_sort(items, 'name', sort_dir), page, per_page)
+                result = self.repo._apply_sort_and_paginate(
+                    items, 'name', sort_dir, page, per_page)
+                self.assertListEqual(result, expected, f'{page=} {per_page=} {sort_dir=}')
+
+        self.assertListEqual(
+            self.repo._apply_sort_and_paginate(items, 'no_price', 'asc', 2, 10), items[10:20])
+
     def test__apply_paginate(self):
         items = [
             StubEntity(name='a'),
@@ -523,3 +730,194 @@ class TestInMemorySearchableRepository(unittest.TestCase):
                 SearchResult(**item['output'], search_params=item["input"]),
                 f"The output using sort and filter on index {index} is different"
             )
+
+    def test_search_by_the_sorted_index_matches_a_full_sort(self):
+        rand = random.Random(12)
+        names = ['a', 'b', 'TEST', 'test b', 'c', 'Test c']
+        reference: List[StubEntity] = []
+        for _ in range(300):
+            operation = rand.random()
+            if operation < 0.4 or not reference:
+                entity = StubEntity(name=rand.choice(names))
+                self.repo.insert(entity)
+                reference.append(entity)
+            elif operation < 0.6:
+                entities = [StubEntity(name=rand.choice(names)) for _ in range(rand.randint(1, 80))]
+                self.repo.bulk_insert(entities)
+                reference[:0] = entities
+            elif operation < 0.8:
+                index = rand.randrange(len(reference))
+                entity = StubEntity(
+                    unique_entity_id=reference[index].unique_entity_id, name=rand.choice(names))
+                self.repo.update(entity)
+                reference[index] = entity
+            else:
+                self.repo.delete(reference.pop(rand.randrange(len(reference))))
+
+            params = SearchParams(
+                page=rand.randint(1, 5),
+                per_page=rand.randint(1, 30),
+                sort='name',
+                sort_dir=rand.choice(['asc', 'desc']),
+                filters=rand.choice([None, 'test']),
+            )
+            result = self.repo.search(params)
+            expected_filtered = self.repo._apply_filter(reference, params.filters)
+            expected = self.repo._apply_paginate(
+                self.repo._apply_sort(expected_filtered, params.sort, params.sort_dir),
+                params.page,
+                params.per_page,
+            )
+            self.assertListEqual(result.items, expected)
+            self.assertEqual(result.total, len(expected_filtered))
+
+
+class TestInMemorySearchableRepositoryCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.entities = [StubEntity(name=name) for name in ['c', 'a', 'b']]
+        self.repo = StubInMemorySearchableRepository(self.entities, search_cache_size=2)
+
+    def test_it_has_no_cache_by_default(self):
+        repo = StubInMemorySearchableRepository(self.entities)
+        repo.search(SearchParams())
+        self.assertIsNone(repo.search_cache_info())
+
+    def test_it_reuses_the_result_of_equal_params(self):
+        first = self.repo.search(SearchParams(sort='name'))
+        first.items.clear()
+        second = self.repo.search(SearchParams(sort='name'))
+
+        self.assertListEqual(second.items, [self.entities[1], self.entities[2], self.entities[0]])
+        self.assertEqual(second.total, 3)
+        self.assertEqual(self.repo.search_cache_info(), SearchCacheInfo(1, 1, 2, 1))
+
+    def test_every_write_invalidates_the_results(self):
+        params = SearchParams(sort='name', filters='a')
+        writes = [
+            lambda: self.repo.insert(StubEntity(name='aa')),
+            lambda: self.repo.bulk_insert([StubEntity(name='ab')]),
+            lambda: self.repo.update(StubEntity(
+                unique_entity_id=self.entities[0].unique_entity_id, name='ac')),
+            lambda: self.repo.delete(self.entities[1]),
+        ]
+        totals = [2, 3, 4, 3]
+        self.repo.search(params)
+        for write, total in zip(writes, totals):
+            version = self.repo.write_version
+            write()
+            self.assertEqual(self.repo.write_version, version + 1)
+            self.assertEqual(self.repo.search(params).total, total)
+
+        self.assertEqual(self.repo.search_cache_info().hits, 0)
+        self.assertEqual(self.repo.search_cache_info().misses, 5)
+
+
+class TestInMemorySearchableRepositoryCursor(unittest.TestCase):
+
+    def setUp(self) -> None:
+        rand = random.Random(21)
+        # Nomes repetidos para os empates serem desfeitos pelo id. Guardadas na ordem dos ids,
+        # as páginas offset, que mantêm os empates na ordem do repositório, seguem a do cursor
+        self.entities = sorted(
+            (StubEntity(name=rand.choice('abcde')) for _ in range(23)),
+            key=lambda entity: entity.unique_entity_id.value,
+        )
+        self.repo = StubInMemorySearchableRepository(self.entities)
+
+    def expected(self, descending: bool, filters: Optional[str] = None) -> List[StubEntity]:
+        items = [
+            entity for entity in self.entities if filters is None or filters in entity.name
+        ]
+        return sorted(
+            items,
+            key=lambda entity: (entity.name, entity.unique_entity_id.value),
+            reverse=descending,
+        )
+
+    def search(self, **props) -> SearchResult:
+        result = self.repo.search(SearchParams(per_page=5, sort='name', **props))
+        self.assertLessEqual(len(result.items), 5)
+        return result
+
+    def test_it_walks_the_pages_forward_and_backward(self):
+        for props in [{}, {'sort_dir': 'desc'}, {'filters': 'a'}, {'filters': 'zz'}]:
+            descending = props.get('sort_dir') == 'desc'
+            expected = self.expected(descending, props.get('filters'))
+            # Na ordem decrescente o cursor desfaz os empates pelo maior id
+            self.repo.items = self.entities[::-1] if descending else self.entities
+            with self.subTest(**props):
+                items, last_page = walk_pages_forward(self.search, **props)
+                self.assertListEqual(items, expected)
+                self.assertEqual(last_page.total, len(expected))
+                self.assertListEqual(walk_pages_backward(self.search, last_page, **props), expected)
+
+    def test_a_cursor_page_ends_where_the_next_begins(self):
+        expected = self.expected(False)
+        cursor = Cursor.of(expected[7], 'name', False).encode()
+
+        result = self.repo.search(SearchParams(per_page=5, sort='name', cursor=cursor))
+        self.assertListEqual(result.items, expected[8:13])
+        self.assertEqual(result.total, 23)
+        self.assertEqual(result.next_cursor, Cursor.of(expected[12], 'name', False).encode())
+        self.assertEqual(
+            result.prev_cursor, Cursor.of(expected[8], 'name', False, backward=True).encode())
+
+        result = self.repo.search(SearchParams(per_page=5, sort='name', cursor=result.prev_cursor))
+        self.assertListEqual(result.items, expected[3:8])
+
+    def test_offset_pages_hand_out_cursors(self):
+        result = self.repo.search(SearchParams(page=2, per_page=5, sort='name'))
+
+        self.assertEqual(
+            result.next_cursor, Cursor.of(result.items[-1], 'name', False).encode())
+        self.assertEqual(
+            result.prev_cursor,
+            Cursor.of(result.items[0], 'name', False, backward=True).encode(),
+        )
+        last_page = self.repo.search(SearchParams(page=5, per_page=5, sort='name'))
+        self.assertIsNone(last_page.next_cursor)
+        self.assertIsNone(self.repo.search(SearchParams(per_page=5, sort='name')).prev_cursor)
+
+        # Sem ordenação a página segue o repositório, que não é a ordem de um cursor
+        unsorted = self.repo.search(SearchParams(page=2, per_page=5))
+        self.assertIsNone(unsorted.next_cursor)
+        self.assertIsNone(unsorted.prev_cursor)
+
+    def test_only_the_cursor_pages_break_the_ties_by_the_id(self):
+        entities = [StubEntity(name=name) for name in ['a', 'b', 'a', 'b', 'a']]
+        repo = StubInMemorySearchableRepository(entities)
+        by_id = sorted(entities, key=lambda entity: entity.unique_entity_id.value)
+
+        for sort_dir in ['asc', 'desc']:
+            expected = sorted(entities, key=lambda entity: entity.name, reverse=sort_dir == 'desc')
+            self.assertListEqual(
+                repo.search(SearchParams(sort='name', sort_dir=sort_dir)).items, expected)
+
+        expected = sorted(by_id, key=lambda entity: entity.name)
+        cursor = Cursor.of(expected[0], 'name', False).encode()
+        result = repo.search(SearchParams(sort='name', cursor=cursor))
+        self.assertListEqual(result.items, expected[1:])
+
+    def test_without_total_the_pages_still_link(self):
+        result = self.search(page=2, with_total=False)
+        self.assertIsNone(result.total)
+        self.assertIsNone(result.last_page)
+        self.assertListEqual(result.items, self.expected(False)[5:10])
+        self.assertIsNotNone(result.next_cursor)
+
+        result = self.search(cursor=result.next_cursor, with_total=False)
+        self.assertIsNone(result.total)
+        self.assertListEqual(result.items, self.expected(False)[10:15])
+
+    def test_it_rejects_a_cursor_of_another_sort(self):
+        cursor = Cursor.of(self.entities[0], 'name', False).encode()
+        for params in [
+            SearchParams(sort='name', sort_dir='desc', cursor=cursor),
+            SearchParams(cursor=cursor),
+            SearchParams(sort='name', cursor='not a cursor'),
+            SearchParams(
+                sort='name', cursor=Cursor('name', False, 1, self.entities[0].id).encode()),
+        ]:
+            with self.assertRaises(InvalidCursorException, msg=params):
+                self.repo.search(params)
@@ -0,0 +1,34 @@
+import unittest
+
+from core.__seedwork.domain.cache import SearchCache, SearchCacheInfo
+
+
+class TestSearchCache(unittest.TestCase):
+
+    def test_it_needs_a_positive_size(self):
+        with self.assertRaises(ValueError):
+            SearchCache(0)
+
+    def test_it_evicts_the_least_recently_used(self):
+        cache = SearchCache(2)
+        cache.put('a', 0, 1)
+        cache.put('b', 0, 2)
+        self.assertEqual(cache.get('a', 0), 1)
+        cache.put('c', 0, 3)
+
+        self.assertIsNone(cache.get('b', 0))
+        self.assertEqual(cache.get('a', 0), 1)
+        self.assertEqual(cache.get('c', 0), 3)
+        self.assertEqual(cache.info(), SearchCacheInfo(hits=3, misses=1, maxsize=2, currsize=2))
+
+    def test_a_new_version_drops_the_results(self):
+        cache = SearchCache(2)
+        cache.put('a', 0, 1)
+
+        self.assertIsNone(cache.get('a', 1))
+        cache.put('b', 0, 2)
+        self.assertIsNone(cache.get('b', 1))
+        self.assertEqual(cache.info().currsize, 0)
+
+        cache.clear()
+        self.assertEqual(cache.info(), SearchCacheInfo(hits=0, misses=0, maxsize=2, currsize=0))
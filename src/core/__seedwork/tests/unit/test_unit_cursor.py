@@ -0,0 +1,78 @@
+import base64
+import datetime
+import json
+import unittest
+from dataclasses import dataclass
+
+from core.__seedwork.domain.cursor import Cursor
+from core.__seedwork.domain.entities import Entity
+from core.__seedwork.domain.exceptions import InvalidCursorException
+from core.__seedwork.domain.value_objects import UniqueEntityId
+
+
+@dataclass(slots=True, kw_only=True, frozen=True)
+class StubEntity(Entity):
+    name: str
+
+
+class TestCursor(unittest.TestCase):
+
+    def test_it_encodes_to_an_url_safe_token(self):
+        cursors = [
+            Cursor('name', False, 'Açaí & co?', UniqueEntityId().id),
+            Cursor('created_at', True, datetime.datetime(
+                2023, 5, 1, 10, 0, 0, 123, tzinfo=datetime.timezone.utc), UniqueEntityId().id),
+            Cursor('created_at', False, datetime.datetime(2023, 5, 1), UniqueEntityId().id, True),
+            Cursor(None, False, None, UniqueEntityId().id),
+        ]
+        for cursor in cursors:
+            token = cursor.encode()
+            self.assertRegex(token, r'^[A-Za-z0-9_-]+$')
+            self.assertEqual(Cursor.decode(token), cursor)
+
+    def test_it_rejects_invalid_tokens(self):
+        valid = Cursor('name', False, 'a', UniqueEntityId().id).encode()
+        for token in ['', '!!!', 'bnVsbA', valid[:-4], Cursor('name', False, 'a', 'x').encode()]:
+            with self.assertRaises(InvalidCursorException, msg=token):
+                Cursor.decode(token)
+
+    def test_it_rejects_tampered_tokens(self):
+        entity_id = UniqueEntityId().id
+        for data in [
+            ['name', False, 1, entity_id],
+            ['name', False, ['a'], entity_id, False],
+            ['name', False, None, entity_id, False],
+            ['name', False, True, entity_id, False],
+            ['name', False, {'date': '2023-05-01'}, entity_id, False],
+            ['created_at', False, {'datetime': 20230501}, entity_id, False],
+            [None, False, 'a', entity_id, False],
+            [1, False, 'a', entity_id, False],
+            ['name', 'yes', 'a', entity_id, False],
+            ['name', False, 'a', entity_id, 1],
+            ['name', False, 'a', 1, False],
+            ['name', False, 'a', 'z' * 32, False],
+            {'sort': 'name'},
+        ]:
+            token = base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+            with self.assertRaises(InvalidCursorException, msg=data):
+                Cursor.decode(token)
+
+    def test_it_only_continues_the_same_sort(self):
+        cursor = Cursor('name', False, 'a', UniqueEntityId().id)
+        cursor.check_sort('name', False)
+        for sort, descending in [('name', True), ('created_at', False), (None, False)]:
+            with self.assertRaises(InvalidCursorException):
+                cursor.check_sort(sort, descending)
+
+    def test_page_cursors(self):
+        items = [StubEntity(name='a'), StubEntity(name='b')]
+        forward = Cursor('name', False, 'a', UniqueEntityId().id)
+        backward = Cursor('name', False, 'a', UniqueEntityId().id, backward=True)
+        next_of_last = Cursor.of(items[-1], 'name', False).encode()
+        prev_of_first = Cursor.of(items[0], 'name', False, backward=True).encode()
+
+        self.assertEqual(forward.page_cursors(items, True), (next_of_last, prev_of_first))
+        self.assertEqual(forward.page_cursors(items, False), (None, prev_of_first))
+        self.assertEqual(backward.page_cursors(items, True), (next_of_last, prev_of_first))
+        self.assertEqual(backward.page_cursors(items, False), (next_of_last, None))
+        self.assertEqual(forward.page_cursors([], False), (None, None))
@@ -0,0 +1,117 @@
+import datetime as dt
+import unittest
+from dataclasses import dataclass, field
+from typing import List
+
+from core.__seedwork.domain.entities import Entity, ToggleIsActive
+from core.__seedwork.domain.value_objects import UniqueEntityId
+
+
+@dataclass(slots=True, kw_only=True, frozen=True, eq=False)
+class StubEntity(Entity):
+    name: str
+    price: float = 0
+    tags: List[str] = field(default_factory=list)
+    created_at: dt.datetime = field(default_factory=lambda: dt.datetime.now(dt.timezone.utc))
+
+
+@dataclass(slots=True, kw_only=True, frozen=True, eq=False)
+class StubToggleEntity(Entity, ToggleIsActive):
+    is_active: bool = True
+
+
+class TestEntityUnit(unittest.TestCase):
+
+    def test_id_prop(self):
+        unique_entity_id = UniqueEntityId()
+        entity = StubEntity(unique_entity_id=unique_entity_id, name="Test")
+        self.assertEqual(entity.id, str(unique_entity_id))
+
+    def test_to_dict(self):
+        unique_entity_id = UniqueEntityId()
+        entity = StubEntity(unique_entity_id=unique_entity_id, name="Test", tags=["a"])
+        self.assertEqual(entity.to_dict(), {
+            'name': "Test",
+            'price': 0,
+            'tags': ["a"],
+            'created_at': entity.created_at,
+            'id': str(unique_entity_id),
+        })
+        self.assertEqual(
+            list(entity.to_dict()),
+            ['name', 'price', 'tags', 'created_at', 'id'],
+        )
+
+    def test_to_dict_is_flat_and_does_not_copy_values(self):
+        entity = StubEntity(name="Test", tags=["a"])
+        entity_dict = entity.to_dict()
+        self.assertIs(entity_dict['tags'], entity.tags)
+        self.assertIs(entity_dict['created_at'], entity.created_at)
+
+        entity_dict['name'] = "Changed"
+        self.assertEqual(entity.name, "Test")
+
+    def test_to_dict_reflects_the_current_state(self):
+        entity = StubEntity(name="Test")
+        object.__setattr__(entity, 'name', "Changed")
+        self.assertEqual(entity.to_dict()['name'], "Changed")
+
+    def test_equality(self):
+        unique_entity_id = UniqueEntityId()
+        created_at = dt.datetime.now(dt.timezone.utc)
+        entity1 = StubEntity(unique_entity_id=unique_entity_id, name="Test", created_at=created_at)
+        entity2 = StubEntity(unique_entity_id=unique_entity_id, name="Test", created_at=created_at)
+        self.assertEqual(entity1, entity2)
+        self.assertNotEqual(entity1, StubEntity(name="Test", created_at=created_at))
+
+        object.__setattr__(entity2, 'name', "Changed")
+        self.assertNotEqual(entity1, entity2)
+
+    def test_hash_is_the_hash_of_the_id_and_survives_changes(self):
+        entity = StubEntity(name="Test")
+        self.assertEqual(hash(entity), hash(entity.unique_entity_id))
+
+        entities = {entity}
+        object.__setattr__(entity, 'name', "Changed")
+        self.assertIn(entity, entities)
+
+    def test_dirty_fields(self):
+        entity = StubEntity(name="Test")
+        self.assertEqual(entity.dirty_fields, {'name', 'price', 'tags', 'created_at'})
+
+        entity.clear_dirty_fields()
+        self.assertEqual(entity.dirty_fields, set())
+
+        entity._change('name', "Test")  # pylint: disable=protected-access
+        self.assertEqual(entity.dirty_fields, set())
+
+        entity._change('name', "Changed")  # pylint: disable=protected-access
+        self.assertEqual(entity.name, "Changed")
+        self.assertEqual(entity.dirty_fields, {'name'})
+
+    def test_clear_only_some_dirty_fields(self):
+        entity = StubEntity(name="Test")
+        entity.clear_dirty_fields(['name', 'tags'])
+        self.assertEqual(entity.dirty_fields, {'price', 'created_at'})
+
+        entity._change('name', "Changed")  # pylint: disable=protected-access
+        entity.clear_dirty_fields(['price'])
+        self.assertEqual(entity.dirty_fields, {'name', 'created_at'})
+
+    def test_restored_entity_has_no_dirty_fields(self):
+        entity = StubEntity.restore(name="Test")
+        self.assertEqual(entity.dirty_fields, set())
+        self.assertNotIn('_dirty_fields', entity.to_dict())
+        self.assertEqual(entity, StubEntity(
+            unique_entity_id=entity.unique_entity_id,
+            name="Test",
+            created_at=entity.created_at,
+        ))
+
+    def test_has_no_instance_dict(self):
+        for entity in (
+            StubEntity(name="Test"),
+            StubEntity.restore(name="Test"),
+            StubToggleEntity(),
+        ):
+            self.assertFalse(hasattr(entity, '__dict__'), entity.__class__.__name__)
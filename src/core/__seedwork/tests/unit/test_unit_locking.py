@@ -0,0 +1,66 @@
+# pylint: disable=protected-access
+import threading
+import unittest
+
+from core.__seedwork.domain.locking import ReadWriteLock
+
+
+class TestReadWriteLock(unittest.TestCase):
+
+    def test_readers_share_the_lock(self):
+        lock = ReadWriteLock()
+        inside = threading.Barrier(3, timeout=5)
+
+        def read():
+            with lock.reading():
+                inside.wait()
+
+        threads = [threading.Thread(target=read) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        inside.wait()
+        for thread in threads:
+            thread.join()
+
+    def test_writer_waits_for_the_readers_and_holds_new_ones(self):
+        lock = ReadWriteLock()
+        events = []
+        writer_waiting = threading.Event()
+
+        def write():
+            writer_waiting.set()
+            with lock.writing():
+                events.append('write')
+
+        def read_later():
+            with lock.reading():
+                events.append('late read')
+
+        with lock.reading():
+            writer = threading.Thread(target=write)
+            writer.start()
+            writer_waiting.wait()
+            while not lock._writers_waiting:
+                threading.Event().wait(0.001)
+            reader = threading.Thread(target=read_later)
+            reader.start()
+            reader.join(0.05)
+            events.append('first read')
+        writer.join()
+        reader.join()
+        self.assertEqual(events, ['first read', 'write', 'late read'])
+
+    def test_reentrance(self):
+        lock = ReadWriteLock()
+        with lock.writing():
+            with lock.reading():
+                with lock.writing():
+                    pass
+        with lock.reading():
+            with lock.reading():
+                pass
+            with self.assertRaises(RuntimeError):
+                with lock.writing():
+                    pass
+        with lock.writing():
+            pass
@@ -0,0 +1,203 @@
+# pylint: disable=protected-access
+import unittest
+from dataclasses import dataclass
+from typing import List
+
+from core.__seedwork.domain.entities import Entity
+from core.__seedwork.domain.storage import IndexedStorage, TrigramIndex
+
+
+@dataclass(slots=True, kw_only=True, frozen=True)
+class StubEntity(Entity):
+    name: str
+
+
+class TestTrigramIndex(unittest.TestCase):
+
+    def test_matches_like_a_substring_of_the_lower_cased_text(self):
+        index = TrigramIndex()
+        texts = ['Movie', 'Documentary', 'movies and series', 'MOV', 'İstanbul']
+        for position, text in enumerate(texts):
+            index.add(position, text)
+
+        for query in ['mov', 'movie', 'ovi', 'ies', 'MOV', 'tary', 'i̇st', 'zzz', 'es and s']:
+            expected = {position for position, text in enumerate(texts) if query in text.lower()}
+            self.assertEqual(index.matches(query), expected, query)
+        self.assertIsNone(index.matches('mo'))
+
+    def test_discard(self):
+        index = TrigramIndex()
+        index.add(1, 'Movie')
+        index.add(2, 'Movies')
+        index.discard(1)
+        index.discard(3)
+
+        self.assertEqual(index.matches('movie'), {2})
+        self.assertTrue(index.is_indexed_as(2, 'MOVIES'))
+        self.assertFalse(index.is_indexed_as(1, 'movie'))
+        index.discard(2)
+        self.assertEqual(index._postings, {})
+
+
+class TestIndexedStorage(unittest.TestCase):
+
+    def test_keeps_the_order_of_prepends_and_appends(self):
+        entities = [StubEntity(name=str(index)) for index in range(6)]
+        storage = IndexedStorage([entities[2]])
+        storage.append(entities[3])
+        storage.prepend(entities[0:2])
+        storage.append(entities[4])
+        storage.prepend([])
+        storage.append(entities[5])
+
+        self.assertListEqual(list(storage), entities)
+        self.assertEqual(len(storage), 6)
+        for entity in entities:
+            self.assertIs(storage.get(entity.unique_entity_id), entity)
+            self.assertIn(entity.unique_entity_id, storage)
+
+    def test_replace_keeps_the_position(self):
+        entities = [StubEntity(name=str(index)) for index in range(3)]
+        storage = IndexedStorage([entities[2]])
+        storage.prepend(entities[:2])
+
+        updated = StubEntity(unique_entity_id=entities[0].unique_entity_id, name="updated")
+        self.assertTrue(storage.replace(updated))
+        self.assertListEqual(list(storage), [updated, *entities[1:]])
+        self.assertFalse(storage.replace(StubEntity(name="unknown")))
+
+    def test_remove_from_both_sides(self):
+        entities = [StubEntity(name=str(index)) for index in range(10)]
+        storage = IndexedStorage(entities[5:])
+        storage.prepend(entities[:5])
+
+        self.assertIs(storage.remove(entities[1].unique_entity_id), entities[1])
+        self.assertIs(storage.remove(entities[7].unique_entity_id), entities[7])
+        self.assertIsNone(storage.remove(entities[7].unique_entity_id))
+        self.assertIsNone(storage.get(entities[1].unique_entity_id))
+
+        expected = [entity for index, entity in enumerate(entities) if index not in (1, 7)]
+        self.assertListEqual(list(storage), expected)
+        self.assertEqual(len(storage), 8)
+
+    def test_compacts_the_holes(self):
+        entities = [StubEntity(name=str(index)) for index in range(10)]
+        storage = IndexedStorage(entities[5:])
+        storage.prepend(entities[:5])
+
+        for entity in entities[:6]:
+            storage.remove(entity.unique_entity_id)
+        self.assertEqual(storage._holes, 0)
+        self.assertListEqual(list(storage), entities[6:])
+
+        storage.prepend(entities[:2])
+        storage.append(entities[2])
+        self.assertListEqual(list(storage), [*entities[:2], *entities[6:], entities[2]])
+        for entity in storage:
+            self.assertIs(storage.get(entity.unique_entity_id), entity)
+
+    def test_sorted_slice_is_stable_in_both_directions(self):
+        entities = [StubEntity(name=name) for name in ['b', 'a', 'b', 'c', 'a', 'b']]
+        storage = IndexedStorage(entities[2:], sort_fields=['name'])
+        storage.prepend(entities[:2])
+
+        ascending = sorted(entities, key=lambda entity: entity.name)
+        descending = sorted(entities, key=lambda entity: entity.name, reverse=True)
+        for start in range(7):
+            for stop in range(start, 8):
+                self.assertListEqual(
+                    storage.sorted_slice('name', False, start, stop), ascending[start:stop])
+                self.assertListEqual(
+                    storage.sorted_slice('name', True, start, stop), descending[start:stop])
+
+    def test_sorted_index_follows_the_changes(self):
+        entities = [StubEntity(name=name) for name in ['d', 'b', 'c']]
+        storage = IndexedStorage(entities, sort_fields=['name'])
+        storage.append(StubEntity(name='a'))
+        storage.prepend([StubEntity(name='e')])
+        storage.remove(entities[1].unique_entity_id)
+
+        # Alterada no lugar, como faz o caso de uso, e então substituída
+        object.__setattr__(entities[0], 'name', 'z')
+        storage.replace(entities[0])
+
+        self.assertListEqual(
+            [entity.name for entity in storage.sorted_slice('name')], ['a', 'c', 'e', 'z'])
+        self.assertListEqual(
+            [entity.name for entity in storage.sorted_slice('name', True, 1, 3)], ['e', 'c'])
+
+
+class StubEntitySource:
+    """A columnar source that counts the entities it creates"""
+
+    def __init__(self, entities: List[StubEntity]) -> None:
+        self.entities = entities
+        self.created = 0
+
+    def __len__(self) -> int:
+        return len(self.entities)
+
+    def __getitem__(self, index: int) -> StubEntity:
+        self.created += 1
+        entity = self.entities[index]
+        return StubEntity(unique_entity_id=entity.unique_entity_id, name=entity.name)
+
+    def id_values(self):
+        return (entity.unique_entity_id.value for entity in self.entities)
+
+    def field_values(self, field_name: str):
+        return (getattr(entity, field_name) for entity in self.entities)
+
+
+class TestIndexedStorageFromSource(unittest.TestCase):
+
+    def setUp(self) -> None:
+        names = ['movie', 'serie', 'documentary', 'movie', 'anime']
+        self.entities = [StubEntity(name=name) for name in names]
+        self.source = StubEntitySource(self.entities)
+        self.storage = IndexedStorage(self.source, sort_fields=['name'], text_fields=['name'])
+
+    def test_it_creates_the_entities_only_when_read(self):
+        self.assertEqual(len(self.storage), 5)
+        self.assertIn(self.entities[2].unique_entity_id, self.storage)
+        self.assertEqual(self.source.created, 0)
+
+        entity = self.storage.get(self.entities[2].unique_entity_id)
+        self.assertEqual(entity, self.entities[2])
+        self.assertIs(self.storage.get(self.entities[2].unique_entity_id), entity)
+        self.assertEqual(self.source.created, 1)
+
+        self.assertListEqual(list(self.storage), self.entities)
+        self.assertEqual(self.source.created, 5)
+
+    def test_it_builds_the_indexes_on_the_first_search(self):
+        self.assertIsNone(self.storage._sorted)
+        self.assertIsNone(self.storage._text_indexes)
+
+        self.assertListEqual(self.storage.text_search('name', 'mov'), [
+            self.entities[0], self.entities[3]])
+        self.assertIsNone(self.storage._sorted)
+        self.assertEqual(self.source.created, 2)
+
+        eager = IndexedStorage(self.entities, sort_fields=['name'])
+        self.assertListEqual(
+            self.storage.sorted_slice('name', True), eager.sorted_slice('name', True))
+        self.assertListEqual(
+            self.storage.text_search('name', 'rie', 'name'), [self.entities[1]])
+
+    def test_writes_keep_the_indexes_of_the_source(self):
+        first = StubEntity(name='cartoon')
+        self.storage.prepend([first])
+        self.storage.append(StubEntity(name='biography'))
+        self.storage.remove(self.entities[1].unique_entity_id)
+        self.storage.replace(
+            StubEntity(unique_entity_id=self.entities[0].unique_entity_id, name='zoo'))
+
+        self.assertListEqual(
+            [entity.name for entity in self.storage],
+            ['cartoon', 'zoo', 'documentary', 'movie', 'anime', 'biography'])
+        self.assertListEqual(
+            [entity.name for entity in self.storage.sorted_slice('name')],
+            ['anime', 'biography', 'cartoon', 'documentary', 'movie', 'zoo'])
+        self.assertListEqual(self.storage.text_search('name', 'oon'), [first])
+        self.assertListEqual(self.storage.text_search('name', 'ser'), [])
@@ -1,4 +1,6 @@
 # pylint: disable=protected-access
+import pickle
+import time
 import uuid
 from abc import ABC
 from dataclasses import FrozenInstanceError, dataclass, is_dataclass
@@ -6,7 +8,8 @@ from unittest import TestCase
 from unittest.mock import patch
 
 from core.__seedwork.domain.value_objects import (InvalidUUidException,
-                                                  UniqueEntityId, ValueObject)
+                                                  UniqueEntityId, ValueObject,
+                                                  uuid7)
 
 
 @dataclass(frozen=True)
@@ -20,6 +23,12 @@ class StubTwoProps(ValueObject):
     prop2: str
 
 
+@dataclass(frozen=True, eq=False)
+class StubHashableProps(ValueObject):
+    prop1: str
+    prop2: int
+
+
 class TestValueObjectUnit(TestCase):
     def test_if_value_object_is_a_dataclass(self):
         self.assertTrue(is_dataclass(ValueObject))
@@ -46,11 +55,31 @@ class TestValueObjectUnit(TestCase):
             vo1.prop = "new value"  # type: ignore
         self.assertEqual(assert_error.exception.args[0], "cannot assign to field 'prop'")
 
+    def test_equality(self):
+        self.assertEqual(StubHashableProps("a", 1), StubHashableProps("a", 1))
+        self.assertNotEqual(StubHashableProps("a", 1), StubHashableProps("a", 2))
+        self.assertNotEqual(StubHashableProps("a", 1), ("a", 1))
+        self.assertNotEqual(StubProp(prop="a"), StubTwoProps(prop1="a", prop2="a"))
+
+    def test_hash_is_cached(self):
+        value_object = StubHashableProps("a", 1)
+        self.assertEqual(hash(value_object), hash(StubHashableProps("a", 1)))
+        self.assertEqual(value_object._hash, hash(("a", 1)))
+        self.assertEqual({value_object: 'value'}[StubHashableProps("a", 1)], 'value')
+
+        with patch.object(StubHashableProps, '_values') as values:
+            hash(value_object)
+            values.assert_not_called()
+
 
 class TestUniqueEntityIdUnit(TestCase):
     def test_if_is_a_dataclass(self):
         self.assertTrue(is_dataclass(UniqueEntityId))
 
+    def test_has_no_instance_dict(self):
+        self.assertFalse(hasattr(UniqueEntityId(), '__dict__'))
+        self.assertFalse(hasattr(UniqueEntityId.restore(str(uuid.uuid4())), '__dict__'))
+
     def test_throw_exception_when_uuid_is_invalid(self):
         with patch.object(
             UniqueEntityId,
@@ -102,3 +131,85 @@ class TestUniqueEntityIdUnit(TestCase):
         value_object = UniqueEntityId()
         self.assertEqual(value_object.id, str(value_object))
         self.assertEqual(value_object.id, repr(value_object))
+
+    def test_keeps_the_id_as_int_and_builds_the_string_lazily(self):
+        value_object = UniqueEntityId("0a189b24-f2fe-46d9-905a-9f0878cef77a")
+        self.assertEqual(value_object.value, 0x0a189b24f2fe46d9905a9f0878cef77a)
+        self.assertIsNone(value_object._id)
+        self.assertEqual(value_object.id, "0a189b24-f2fe-46d9-905a-9f0878cef77a")
+        self.assertIs(value_object.id, value_object._id)
+        self.assertFalse(hasattr(value_object, '__dict__'))
+
+    def test_id_is_canonical(self):
+        value_object = UniqueEntityId("0A189B24F2FE46D9905A9F0878CEF77A")
+        self.assertEqual(value_object.id, "0a189b24-f2fe-46d9-905a-9f0878cef77a")
+
+    def test_from_uuid(self):
+        uuid_value = uuid.uuid4()
+        with patch.object(
+            UniqueEntityId,
+            '_UniqueEntityId__validate',
+            autospec=True,
+        ) as mock_validate:
+            value_object = UniqueEntityId.from_uuid(uuid_value)
+            mock_validate.assert_not_called()
+        self.assertEqual(value_object.id, str(uuid_value))
+        self.assertEqual(value_object, UniqueEntityId(uuid_value))
+
+    def test_restore(self):
+        uuid_value = uuid.uuid4()
+        self.assertEqual(UniqueEntityId.restore(uuid_value), UniqueEntityId(uuid_value))
+        self.assertEqual(UniqueEntityId.restore(str(uuid_value)), UniqueEntityId(uuid_value))
+        self.assertEqual(UniqueEntityId.restore(uuid_value.hex).id, str(uuid_value))
+
+    def test_equality_and_hash(self):
+        uuid_value = uuid.uuid4()
+        value_object1 = UniqueEntityId(uuid_value)
+        value_object2 = UniqueEntityId(str(uuid_value))
+        self.assertEqual(value_object1, value_object2)
+        self.assertEqual(hash(value_object1), hash(value_object2))
+        self.assertNotEqual(value_object1, UniqueEntityId())
+        self.assertNotEqual(value_object1, str(uuid_value))
+        self.assertEqual({value_object1: 'value'}[value_object2], 'value')
+
+    def test_can_be_pickled(self):
+        value_object = UniqueEntityId()
+        self.assertEqual(pickle.loads(pickle.dumps(value_object)), value_object)
+
+    def test_generator_mode(self):
+        self.assertEqual(UniqueEntityId.generator_mode, 'uuid4')
+        self.assertEqual(uuid.UUID(UniqueEntityId().id).version, 4)
+
+        UniqueEntityId.generator_mode = 'uuid7'
+        try:
+            ids = [UniqueEntityId() for _ in range(100)]
+        finally:
+            UniqueEntityId.generator_mode = 'uuid4'
+        self.assertTrue(all(uuid.UUID(value_object.id).version == 7 for value_object in ids))
+        self.assertEqual(ids, sorted(ids, key=lambda value_object: value_object.id))
+
+
+class TestUuid7Unit(TestCase):
+
+    def test_is_a_valid_uuid_version_7(self):
+        uuid_value = uuid7()
+        self.assertEqual(uuid_value.version, 7)
+        self.assertEqual(uuid_value.variant, uuid.RFC_4122)
+        self.assertEqual(uuid.UUID(str(uuid_value)), uuid_value)
+
+    def test_starts_with_the_unix_epoch_milliseconds(self):
+        before = time.time_ns() // 1_000_000
+        uuid_value = uuid7()
+        after = time.time_ns() // 1_000_000
+        self.assertTrue(before <= uuid_value.int >> 80 <= after)
+
+    def test_is_monotonic(self):
+        uuids = [uuid7() for _ in range(10000)]
+        self.assertEqual(uuids, sorted(uuids))
+        self.assertEqual(len(set(uuids)), len(uuids))
+
+    def test_is_monotonic_in_the_same_millisecond(self):
+        with patch('core.__seedwork.domain.value_objects.time.time_ns', return_value=10 ** 15):
+            uuids = [uuid7() for _ in range(5000)]
+        self.assertEqual(uuids, sorted(uuids))
+        self.assertEqual(len(set(uuids)), len(uuids))
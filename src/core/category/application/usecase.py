@@ -5,6 +5,8 @@ from core.__seedwork.application.dto import (PaginationOutput,
                                              PaginationOutputMapper)
 from core.__seedwork.application.usecases import UseCase
 from core.__seedwork.domain.exceptions import EntityNotFound, MissingParameter
+from core.__seedwork.domain.repositories import (TotalMode,
+                                                 valid_unique_entity_ids)
 from core.category.application.dto import CategoryOutput, CategoryOutputMapper
 from core.category.domain.entities import Category
 from core.category.domain.repositories import CategoryRepository
@@ -87,6 +89,31 @@ class GetCategoryUseCase(UseCase):
         pass
 
 
+@dataclass(slots=True, frozen=True)
+class GetCategoriesUseCase(UseCase):
+
+    repo: CategoryRepository
+
+    def __call__(self, input_param: 'Input') -> 'Output':
+        unique_entity_ids = valid_unique_entity_ids(input_param.ids)
+        found = self.repo.find_by_ids(unique_entity_ids)
+        mapper = CategoryOutputMapper.without_child()
+        # Na ordem pedida, sem repetir, e os ids não encontrados ficam de fora
+        return self.Output(items=[
+            mapper.to_output(found[unique_entity_id])
+            for unique_entity_id in dict.fromkeys(unique_entity_ids)
+            if unique_entity_id in found
+        ])
+
+    @dataclass(slots=True, frozen=True)
+    class Input:
+        ids: List[str]
+
+    @dataclass(slots=True, frozen=True)
+    class Output:
+        items: List[CategoryOutput]
+
+
 @dataclass(slots=True, frozen=True)
 class ListCategoriesUseCase(UseCase):
 
@@ -107,12 +134,16 @@ class ListCategoriesUseCase(UseCase):
         sort: str = CategoryRepository.SearchParams.get_field_default('sort')
         sort_dir: str = CategoryRepository.SearchParams.get_field_default('sort_dir')
         filters: str = CategoryRepository.SearchParams.get_field_default('filters')
+        # Opaco, vem do next_cursor ou do prev_cursor de uma página anterior
+        cursor: Optional[str] = CategoryRepository.SearchParams.get_field_default('cursor')
+        # False pula a contagem, 'estimate' aceita uma estimativa quando não há filtro
+        with_total: TotalMode = CategoryRepository.SearchParams.get_field_default('with_total')
 
     @dataclass(slots=True, frozen=True)
     class Output(PaginationOutput):
         items: List[CategoryOutput]
-        total: int
-        last_page: int
+        total: Optional[int]
+        last_page: Optional[int]
         page: int
         per_page: int
 
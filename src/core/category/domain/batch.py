@@ -0,0 +1,202 @@
+"""Define a columnar container to hold many categories in memory"""
+import datetime as dt
+import typing as t
+from array import array
+
+from core.__seedwork.domain.value_objects import UniqueEntityId
+
+from .entities import Category
+
+_EPOCH = dt.datetime(1970, 1, 1)
+_EPOCH_UTC = _EPOCH.replace(tzinfo=dt.timezone.utc)
+_MICROSECOND = dt.timedelta(microseconds=1)
+_LOW_64_BITS = (1 << 64) - 1
+
+
+class CategoryColumns(t.NamedTuple):
+    """The columns of a CategoryBatch, created_at in microseconds since the epoch"""
+
+    id_high: 'array[int]'
+    id_low: 'array[int]'
+    names: t.List[str]
+    descriptions: t.List[t.Optional[str]]
+    is_active: bytearray
+    created_at: 'array[int]'
+    created_at_aware: bytearray
+
+
+class CategoryBatch:
+    """
+        Keep the categories as parallel columns instead of one dataclass instance for each:
+        the ids as two 64-bit halves, created_at as epoch microseconds, is_active as bytes.
+        Names and descriptions stay as lists of the strings themselves.
+        Reading an item hands out a new Category restored from the columns, so changing it
+        does not change the batch, use replace to write it back.
+        It is an EntitySource, an IndexedStorage loads it without creating the entities
+    """
+
+    __slots__ = (
+        '_id_high',
+        '_id_low',
+        '_names',
+        '_descriptions',
+        '_is_active',
+        '_created_at',
+        '_created_at_aware',
+    )
+
+    def __init__(self, categories: t.Iterable[Category] = ()) -> None:
+        self._id_high = array('Q')
+        self._id_low = array('Q')
+        self._names: t.List[str] = []
+        self._descriptions: t.List[t.Optional[str]] = []
+        self._is_active = bytearray()
+        self._created_at = array('q')
+        self._created_at_aware = bytearray()
+        self.extend(categories)
+
+    def append(self, category: Category) -> None:
+        id_value = category.unique_entity_id.value
+        self._id_high.append(id_value >> 64)
+        self._id_low.append(id_value & _LOW_64_BITS)
+        self._names.append(category.name)
+        self._descriptions.append(category.description)
+        self._is_active.append(category.is_active)
+        created_at, is_aware = epoch_microseconds(category.created_at)
+        self._created_at.append(created_at)
+        self._created_at_aware.append(is_aware)
+
+    def extend(self, categories: t.Iterable[Category]) -> None:
+        for category in categories:
+            self.append(category)
+
+    def replace(self, index: int, category: Category) -> None:
+        id_value = category.unique_entity_id.value
+        self._id_high[index] = id_value >> 64
+        self._id_low[index] = id_value & _LOW_64_BITS
+        self._names[index] = category.name
+        self._descriptions[index] = category.description
+        self._is_active[index] = category.is_active
+        self._created_at[index], self._created_at_aware[index] = \
+            epoch_microseconds(category.created_at)
+
+    def pop(self, index: int = -1) -> Category:
+        category = self[index]
+        for column in self._columns():
+            del column[index]
+        return category
+
+    def unique_entity_id(self, index: int) -> UniqueEntityId:
+        return UniqueEntityId.from_int(self._id_high[index] << 64 | self._id_low[index])
+
+    def index(self, unique_entity_id: UniqueEntityId) -> int:
+        """Returns the position of the id, raising ValueError if it is not in the batch"""
+        high = unique_entity_id.value >> 64
+        low = unique_entity_id.value & _LOW_64_BITS
+        id_low = self._id_low
+        start = 0
+        while True:
+            index = self._id_high.index(high, start)
+            if id_low[index] == low:
+                return index
+            start = index + 1
+
+    def id_values(self) -> t.Iterator[int]:
+        """The int values of the ids, without creating the UniqueEntityIds"""
+        return (high << 64 | low for high, low in zip(self._id_high, self._id_low))
+
+    def field_values(self, field_name: str) -> t.Iterator[t.Any]:
+        """The values of a Category field for all the items, without creating entities"""
+        if field_name == 'created_at':
+            return map(from_epoch_microseconds, self._created_at, self._created_at_aware)
+        if field_name == 'is_active':
+            return map(bool, self._is_active)
+        return iter({'name': self._names, 'description': self._descriptions}[field_name])
+
+    def rows(self) -> t.Iterator[t.Dict[str, t.Any]]:
+        """Iterate over the items in the Category.to_dict format, without creating entities"""
+        columns = zip(
+            self._id_high,
+            self._id_low,
+            self._names,
+            self._descriptions,
+            self._is_active,
+            self._created_at,
+            self._created_at_aware,
+        )
+        for id_high, id_low, name, description, is_active, created_at, is_aware in columns:
+            yield {
+                'name': name,
+                'description': description,
+                'is_active': bool(is_active),
+                'created_at': from_epoch_microseconds(created_at, is_aware),
+                'id': UniqueEntityId.from_int(id_high << 64 | id_low).id,
+            }
+
+    def columns(self) -> CategoryColumns:
+        """The columns themselves, not copies, to export the batch without creating entities"""
+        return CategoryColumns(*self._columns())
+
+    @classmethod
+    def from_columns(cls, columns: CategoryColumns) -> 'CategoryBatch':
+        """Create the batch over the columns, which must have the same length"""
+        batch = cls()
+        (
+            batch._id_high,
+            batch._id_low,
+            batch._names,
+            batch._descriptions,
+            batch._is_active,
+            batch._created_at,
+            batch._created_at_aware,
+        ) = columns
+        return batch
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @t.overload
+    def __getitem__(self, index: int) -> Category: ...
+
+    @t.overload
+    def __getitem__(self, index: slice) -> t.List[Category]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        return Category.restore(
+            unique_entity_id=self.unique_entity_id(index),
+            name=self._names[index],
+            description=self._descriptions[index],
+            is_active=bool(self._is_active[index]),
+            created_at=from_epoch_microseconds(
+                self._created_at[index], self._created_at_aware[index]
+            ),
+        )
+
+    def __iter__(self) -> t.Iterator[Category]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def _columns(self) -> t.Tuple[t.MutableSequence, ...]:
+        return (
+            self._id_high,
+            self._id_low,
+            self._names,
+            self._descriptions,
+            self._is_active,
+            self._created_at,
+            self._created_at_aware,
+        )
+
+
+def epoch_microseconds(value: dt.datetime) -> t.Tuple[int, bool]:
+    """The microseconds since the epoch and if the datetime is aware, taken as UTC"""
+    if value.tzinfo is None:
+        return (value - _EPOCH) // _MICROSECOND, False
+    return (value - _EPOCH_UTC) // _MICROSECOND, True
+
+
+def from_epoch_microseconds(value: int, is_aware: int) -> dt.datetime:
+    # Posicional, sem a palavra-chave, o timedelta é criado bem mais rápido
+    return (_EPOCH_UTC if is_aware else _EPOCH) + dt.timedelta(0, 0, value)
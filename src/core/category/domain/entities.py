@@ -1,18 +1,20 @@
 """Define the entities of domain"""
 import datetime as dt
 import typing as t
-from dataclasses import dataclass, field
+from dataclasses import MISSING, dataclass, field, fields
 
-from core.__seedwork.domain.entities import Entity, ToggleIsActive
+from core.__seedwork.domain.entities import Entity, EntityBatch, ToggleIsActive
 from core.__seedwork.domain.exceptions import ValidationException
 from core.category.domain.validators import CategoryValidatorFactory
 
 if t.TYPE_CHECKING:
+    from core.__seedwork.domain.validators import ErrorFields
+
     from .entities_faker_builder import CategoryFakerBuilder
 
 
 # O frozen evita o comportamento anêmico com as entidades
-@dataclass(kw_only=True, frozen=True, slots=True)
+@dataclass(kw_only=True, frozen=True, slots=True, eq=False)
 class Category(Entity, ToggleIsActive):
     """Define the category entity at the domain"""
 
@@ -24,13 +26,58 @@ class Category(Entity, ToggleIsActive):
     )
 
     def __post_init__(self):
+        self._fill_created_at()
+        self.validate()
+
+    @classmethod
+    def create_many(cls, props_list: t.Iterable[t.Dict[str, t.Any]]) -> EntityBatch['Category']:
+        """
+            Create the categories of a batch validating all of them in one pass, with a single
+            validator. The invalid ones are left out and their errors returned by index,
+            a missing or unexpected prop too, as an error of that field
+        """
+        init_fields = [entity_field for entity_field in fields(cls) if entity_field.init]
+        names = {entity_field.name for entity_field in init_fields}
+        required = [
+            entity_field.name for entity_field in init_fields
+            if entity_field.default is MISSING and entity_field.default_factory is MISSING
+        ]
+        errors: t.Dict[int, 'ErrorFields'] = {}
+        categories: t.Dict[int, Category] = {}
+        for index, props in enumerate(props_list):
+            # Uma linha sem um campo obrigatório ou com um desconhecido não derruba o lote
+            props_errors = {name: ['This field is required.'] for name in required
+                            if name not in props}
+            props_errors.update({name: ['Unexpected field.'] for name in props
+                                 if name not in names})
+            if props_errors:
+                errors[index] = props_errors
+                continue
+            category = categories[index] = cls.restore(**props)
+            category._fill_created_at()  # pylint: disable=protected-access
+            # Ainda não persistidas, como as criadas pelo construtor
+            object.__setattr__(category, '_dirty_fields', None)
+
+        validator = CategoryValidatorFactory().create()
+        indexes = list(categories)
+        validation_errors = validator.validate_many(
+            [category.to_dict() for category in categories.values()])
+        errors.update(
+            (indexes[position], error) for position, error in validation_errors.items())
+        return EntityBatch(
+            entities=[
+                category for index, category in categories.items() if index not in errors
+            ],
+            errors=dict(sorted(errors.items())),
+        )
+
+    def _fill_created_at(self):
         created_at = self.created_at if self.created_at else dt.datetime.now(dt.timezone.utc)
         object.__setattr__(self, 'created_at', created_at)
-        self.validate()
 
     def update(self, *, name: str, description: t.Optional[str]) -> None:
-        object.__setattr__(self, 'name', name)
-        object.__setattr__(self, 'description', description)
+        self._change('name', name)
+        self._change('description', description)
         self.validate()
 
     def validate(self):
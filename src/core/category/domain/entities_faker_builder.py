@@ -5,6 +5,7 @@ from typing import Any, Callable, Generic, List, TypeVar
 
 from faker import Faker
 
+from core.__seedwork.domain.exceptions import ValidationException
 from core.__seedwork.domain.value_objects import UniqueEntityId
 
 from .entities import Category
@@ -103,9 +104,9 @@ class CategoryFakerBuilder(Generic[T]):
         return self
 
     def build(self) -> T:
-        categories = list(
+        batch = Category.create_many(
             map(
-                lambda index: Category(**{
+                lambda index: {
                     **({
                         'unique_entity_id': self.__call_factory(self.__unique_entity_id, index),
                     } if self.__unique_entity_id is not None else {}),
@@ -115,10 +116,13 @@ class CategoryFakerBuilder(Generic[T]):
                     **({
                         'created_at': self.__call_factory(self.__created_at, index),
                     } if self.__created_at is not None else {}),
-                }),
+                },
                 list(range(self.count_objs))
             )
         )
+        if batch.errors:
+            raise ValidationException(next(iter(batch.errors.values())))
+        categories = batch.entities
         return categories if self.count_objs > 1 else categories[0]
 
     @property
@@ -2,11 +2,12 @@
 Define the rules to validate category's module's entities
 """
 # pylint: disable=too-few-public-methods
-from typing import Dict
+from typing import Dict, Literal, Optional, Sequence
 
 from rest_framework.serializers import DateTimeField, Serializer
 
-from core.__seedwork.domain.validators import (DRFValidator,
+from core.__seedwork.domain.validators import (DRFCompiledValidator,
+                                               DRFValidator, ErrorFields,
                                                StrictBooleanField,
                                                StrictCharField, ValidatorRules,
                                                ValidatorRulesValidator)
@@ -34,6 +35,16 @@ class DRFCategoryValidator(DRFValidator[Dict]):
             CategoryRules(data=data or {})  # type: ignore
         )
 
+    def validate_many(self, data_list: Sequence[Dict]) -> Dict[int, ErrorFields]:
+        return self.validate_list(
+            CategoryRules(data=[data or {} for data in data_list], many=True)  # type: ignore
+        )
+
+
+class CompiledCategoryValidator(DRFCompiledValidator[Dict]):
+
+    rules = CategoryRules
+
 
 class ValidatorRulesCategoryValidator(ValidatorRulesValidator):
 
@@ -46,8 +57,15 @@ class ValidatorRulesCategoryValidator(ValidatorRulesValidator):
         return True
 
 
+ValidatorMode = Literal['drf', 'compiled']
+
+
 class CategoryValidatorFactory:
 
-    @staticmethod
-    def create():
+    mode: ValidatorMode = 'drf'
+
+    @classmethod
+    def create(cls, mode: Optional[ValidatorMode] = None):
+        if (mode or cls.mode) == 'compiled':
+            return CompiledCategoryValidator()
         return DRFCategoryValidator()
@@ -1,11 +1,13 @@
 # Evita de mexer no repositório se tiver um dado novo e ou mais simples
 # Dado novo
 # pylint: disable=import-outside-toplevel
-from typing import TYPE_CHECKING
+import random
+from typing import TYPE_CHECKING, List
 
 from core.__seedwork.domain.exceptions import (LoadValidationException,
                                                ValidationException)
 from core.__seedwork.domain.value_objects import UniqueEntityId
+from core.category.domain.batch import CategoryBatch
 from core.category.domain.entities import Category
 
 if TYPE_CHECKING:
@@ -15,9 +17,26 @@ if TYPE_CHECKING:
 class CategoryDjangoModelMapper:
 
     @staticmethod
-    def to_entity(model: 'CategoryModel') -> Category:
+    def to_entity(
+        model: 'CategoryModel',
+        trusted: bool = False,
+        validation_sample_rate: float = 0.0,
+    ) -> Category:
+        """
+            A trusted model, read from our own database, is restored without validation.
+            The validation_sample_rate fraction of them is still validated to catch corrupt rows
+        """
+        # Sem amostragem, o caso comum, nem sorteia
+        if trusted and (validation_sample_rate <= 0 or random.random() >= validation_sample_rate):
+            return Category.restore(
+                unique_entity_id=UniqueEntityId.restore(model.id),
+                name=model.name,
+                description=model.description,
+                is_active=model.is_active,
+                created_at=model.created_at,
+            )
         try:
-            return Category(
+            category = Category(
                 unique_entity_id=UniqueEntityId(model.id),
                 name=model.name,
                 description=model.description,
@@ -25,9 +44,17 @@ class CategoryDjangoModelMapper:
                 created_at=model.created_at,
             )
         except ValidationException as err:
-            raise LoadValidationException(err.args[0]) from err
+            raise LoadValidationException(err.error) from err
+        category.clear_dirty_fields()
+        return category
 
     @staticmethod
     def to_model(entity: Category) -> 'CategoryModel':
         from django_app.category.models import CategoryModel
         return CategoryModel(**entity.to_dict())
+
+    @staticmethod
+    def batch_to_models(batch: CategoryBatch) -> List['CategoryModel']:
+        """Build the models straight from the batch columns, skipping the entities"""
+        from django_app.category.models import CategoryModel
+        return [CategoryModel(**row) for row in batch.rows()]
@@ -1,7 +1,9 @@
-from typing import List, Optional
+from operator import attrgetter
+from pathlib import Path
+from typing import Any, Callable, List, Optional
 
-from core.__seedwork.domain.repositories import \
-    InMemorySearchableRepositoryInterface
+from core.__seedwork.domain.repositories import (
+    ConcurrentInMemoryRepositoryMixin, InMemorySearchableRepositoryInterface)
 from core.category.domain.entities import Category
 from core.category.domain.repositories import (CategoryRepository,
                                                CategoryTypeFilters)
@@ -12,6 +14,9 @@ class InMemoryCategoryRepository(
     InMemorySearchableRepositoryInterface[CategoryTypeFilters, Category]
 ):
 
+    default_sort = 'created_at'
+    text_indexed_fields = ['name']
+
     def _apply_filter(
         self,
         items: List[Category],
@@ -25,14 +30,38 @@ class InMemoryCategoryRepository(
             return list(filtering)
         return items
 
-    def _apply_sort(
+    def _filter_candidates(
         self,
-        items: List[Category],
-        sort: str | None,
-        sort_dir: str | None
-    ) -> List[Category]:
-        return sorted(
-            items,
-            key=lambda item: getattr(item, sort or "created_at"),
-            reverse=sort_dir == 'desc'
-        )
+        filter_param: CategoryTypeFilters,
+        sort: Optional[str] = None,
+        descending: bool = False,
+    ) -> Optional[List[Category]]:
+        return self._storage.text_search('name', filter_param, sort, descending)
+
+    def save_snapshot(self, path: str | Path) -> int:
+        """Save the items to a snapshot file, returns how many were saved"""
+        from core.category.infra.snapshot import \
+            save_snapshot  # pylint: disable=import-outside-toplevel
+        return save_snapshot(path, self.find_all())
+
+    def load_snapshot(self, path: str | Path) -> int:
+        """
+            Replace the items by the ones of a snapshot file, returns how many were loaded.
+            The file stays mapped as the source of the storage, the entities are decoded when
+            read. A new snapshot saved to the same path replaces the file, not the mapped one
+        """
+        from core.category.infra.snapshot import \
+            CategorySnapshot  # pylint: disable=import-outside-toplevel
+        snapshot = CategorySnapshot(path)
+        self.items = snapshot
+        return len(snapshot)
+
+    def _sort_key(self, sort: str | None) -> Callable[[Category], Any]:
+        return attrgetter(sort or self.default_sort)
+
+
+class ConcurrentInMemoryCategoryRepository(  # pylint: disable=too-many-ancestors
+    ConcurrentInMemoryRepositoryMixin[Category],
+    InMemoryCategoryRepository,
+):
+    """The InMemoryCategoryRepository to share between the threads of the server"""
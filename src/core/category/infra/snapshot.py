@@ -0,0 +1,336 @@
+"""
+    Save the categories of the in-memory repository to a compact binary file and read it back.
+    The file keeps the CategoryBatch columns, little-endian:
+        header: magic, count
+        id_high, id_low: uint64 each
+        created_at: int64 microseconds since the epoch
+        name_ends, description_ends: uint64 byte offsets into the UTF-8 blobs
+        flags: one byte each (is_active, created_at aware, description None), padded to 8 bytes
+        names, descriptions: the UTF-8 blobs
+"""
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from itertools import accumulate
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, List, Optional
+
+from core.__seedwork.domain.exceptions import InvalidSnapshotException
+from core.__seedwork.domain.value_objects import UniqueEntityId
+from core.category.domain.batch import (CategoryBatch, CategoryColumns,
+                                        from_epoch_microseconds)
+from core.category.domain.entities import Category
+
+if TYPE_CHECKING:
+    from core.category.infra.repositories import InMemoryCategoryRepository
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'CATSNAP1'
+_HEADER = struct.Struct('<8sQ')
+_IS_ACTIVE = 1
+_IS_AWARE = 2
+_NO_DESCRIPTION = 4
+_LITTLE_ENDIAN = sys.byteorder == 'little'
+
+
+def save_snapshot(path: str | Path, categories: Iterable[Category] | CategoryBatch) -> int:
+    """
+        Write the snapshot to a temporary file and move it over path, so a reader never
+        sees half of it. Returns the number of categories saved
+    """
+    batch = categories if isinstance(categories, CategoryBatch) else CategoryBatch(categories)
+    columns = batch.columns()
+    size = len(batch)
+    names = [name.encode() for name in columns.names]
+    descriptions = [
+        b'' if description is None else description.encode()
+        for description in columns.descriptions
+    ]
+    flags = bytearray(
+        (_IS_ACTIVE if is_active else 0)
+        | (_IS_AWARE if is_aware else 0)
+        | (_NO_DESCRIPTION if description is None else 0)
+        for is_active, is_aware, description in zip(
+            columns.is_active, columns.created_at_aware, columns.descriptions)
+    )
+    flags.extend(bytes(-size % 8))
+
+    path = Path(path)
+    temporary_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    with open(temporary_path, 'wb') as file:
+        file.write(_HEADER.pack(MAGIC, size))
+        for numbers in (
+            columns.id_high,
+            columns.id_low,
+            columns.created_at,
+            array('Q', accumulate(map(len, names))),
+            array('Q', accumulate(map(len, descriptions))),
+        ):
+            file.write(_little_endian(numbers))
+        file.write(flags)
+        file.write(b''.join(names))
+        file.write(b''.join(descriptions))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary_path, path)
+    return size
+
+
+class CategorySnapshot:  # pylint: disable=too-many-instance-attributes
+    """
+        Read only view of a snapshot file mapped in memory. Opening it only reads the header
+        and checks the sizes and the UTF-8 of the texts, a category is decoded from the mapped
+        pages when it is accessed.
+        It is an EntitySource: an IndexedStorage keeps it open and reads the ids and the
+        field columns straight from the mapped buffers
+    """
+
+    __slots__ = (
+        '_mmap',
+        '_size',
+        '_id_high',
+        '_id_low',
+        '_created_at',
+        '_name_ends',
+        '_description_ends',
+        '_flags',
+        '_names_offset',
+        '_descriptions_offset',
+    )
+
+    def __init__(self, path: str | Path) -> None:
+        # O mmap tem a sua própria cópia do descritor, o arquivo pode ser fechado
+        with open(path, 'rb') as file:
+            try:
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                magic, size = _HEADER.unpack_from(self._mmap, 0)
+            except (ValueError, struct.error) as err:
+                raise InvalidSnapshotException(f"{path} is not a category snapshot") from err
+        # cinco colunas de 8 bytes e um byte de flags por linha, antes dos textos
+        if magic != MAGIC or len(self._mmap) < _HEADER.size + size * 41 + (-size % 8):
+            self._mmap.close()
+            raise InvalidSnapshotException(f"{path} is not a category snapshot")
+
+        self._size = size
+        view = memoryview(self._mmap)
+        column_size = size * 8
+        starts = [_HEADER.size + index * column_size for index in range(6)]
+        columns = [
+            view[start:start + column_size].cast(typecode)
+            for start, typecode in zip(starts, 'QQqQQ')
+        ]
+        offset = starts[-1]
+        self._flags = view[offset:offset + size]
+        view.release()
+        if not _LITTLE_ENDIAN:
+            swapped = [_native(column) for column in columns]
+            for column in columns:
+                column.release()
+            columns = swapped
+        (
+            self._id_high,
+            self._id_low,
+            self._created_at,
+            self._name_ends,
+            self._description_ends,
+        ) = columns
+        self._names_offset = offset + size + (-size % 8)
+        names_size = self._name_ends[-1] if size else 0
+        self._descriptions_offset = self._names_offset + names_size
+        # Os textos vão até o fim do arquivo, um arquivo truncado ou com sobra é inválido
+        descriptions_size = self._description_ends[-1] if size else 0
+        if self._descriptions_offset + descriptions_size != len(self._mmap):
+            self.close()
+            raise InvalidSnapshotException(f"{path} is not a complete category snapshot")
+        try:
+            # Decodificar os blobs inteiros em C é barato, os itens são decodificados no acesso
+            str(self._mmap[self._names_offset:], 'utf-8')
+        except UnicodeDecodeError as err:
+            self.close()
+            raise InvalidSnapshotException(f"The texts of {path} are not valid UTF-8") from err
+
+    def close(self) -> None:
+        for column in (
+            self._id_high,
+            self._id_low,
+            self._created_at,
+            self._name_ends,
+            self._description_ends,
+            self._flags,
+        ):
+            if isinstance(column, memoryview):
+                column.release()
+        self._mmap.close()
+
+    def __enter__(self) -> 'CategorySnapshot':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> Category:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError('snapshot index out of range')
+        flags = self._flags[index]
+        return Category.restore(
+            unique_entity_id=UniqueEntityId.from_int(
+                self._id_high[index] << 64 | self._id_low[index]),
+            name=self._text(self._names_offset, self._name_ends, index),
+            description=None if flags & _NO_DESCRIPTION else self._text(
+                self._descriptions_offset, self._description_ends, index),
+            is_active=bool(flags & _IS_ACTIVE),
+            created_at=from_epoch_microseconds(self._created_at[index], flags & _IS_AWARE),
+        )
+
+    def __iter__(self) -> Iterator[Category]:
+        for index in range(self._size):
+            yield self[index]
+
+    def id_values(self) -> Iterator[int]:
+        """The int values of the ids, read from the mapped columns"""
+        return (high << 64 | low for high, low in zip(self._id_high, self._id_low))
+
+    def field_values(self, field_name: str) -> Iterator[Any]:
+        """The values of a Category field for all the items, without creating entities"""
+        flags = self._flags
+        if field_name == 'created_at':
+            return map(
+                from_epoch_microseconds, self._created_at, (flag & _IS_AWARE for flag in flags))
+        if field_name == 'is_active':
+            return (bool(flag & _IS_ACTIVE) for flag in flags)
+        if field_name == 'name':
+            return iter(self._texts(self._names_offset, self._name_ends))
+        if field_name == 'description':
+            descriptions = self._texts(self._descriptions_offset, self._description_ends)
+            return (
+                None if flag & _NO_DESCRIPTION else description
+                for description, flag in zip(descriptions, flags)
+            )
+        raise KeyError(field_name)
+
+    def to_batch(self) -> CategoryBatch:
+        """Copy all the columns out of the file at once, without creating entities"""
+        names = self._texts(self._names_offset, self._name_ends)
+        descriptions: List[Optional[str]] = self._texts(
+            self._descriptions_offset, self._description_ends)
+        flags = bytes(self._flags)
+        for index, flag in enumerate(flags):
+            if flag & _NO_DESCRIPTION:
+                descriptions[index] = None
+        return CategoryBatch.from_columns(CategoryColumns(
+            id_high=array('Q', self._id_high),
+            id_low=array('Q', self._id_low),
+            names=names,
+            descriptions=descriptions,
+            is_active=bytearray(flag & _IS_ACTIVE for flag in flags),
+            created_at=array('q', self._created_at),
+            created_at_aware=bytearray(flag & _IS_AWARE for flag in flags),
+        ))
+
+    def _text(self, blob_offset: int, ends, index: int) -> str:
+        start = blob_offset + (ends[index - 1] if index else 0)
+        try:
+            return str(self._mmap[start:blob_offset + ends[index]], 'utf-8')
+        except UnicodeDecodeError as err:
+            # Só com fins que cortam um caractere, o blob inteiro já foi validado
+            raise InvalidSnapshotException("The snapshot text ends are not valid") from err
+
+    def _texts(self, blob_offset: int, ends) -> List[str]:
+        size = self._size
+        blob = self._mmap[blob_offset:blob_offset + (ends[-1] if size else 0)]
+        starts = [0, *ends[:-1]] if size else []
+        try:
+            return [str(blob[start:end], 'utf-8') for start, end in zip(starts, ends)]
+        except UnicodeDecodeError as err:
+            raise InvalidSnapshotException("The snapshot text ends are not valid") from err
+
+
+class SnapshotScheduler:
+    """
+        Save snapshots of an in-memory repository on demand, with snapshot_now, or every
+        interval seconds from a daemon thread, between start and stop. A failed save is
+        logged and the next one is tried after the interval
+    """
+
+    def __init__(
+        self,
+        repo: 'InMemoryCategoryRepository',
+        path: str | Path,
+        interval: float = 0,
+    ) -> None:
+        self.repo = repo
+        self.path = Path(path)
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._saving = threading.Lock()
+
+    def snapshot_now(self) -> int:
+        with self._saving:
+            return self.repo.save_snapshot(self.path)
+
+    def resume(self) -> int:
+        """
+            Load the last snapshot into the repository, when there is one, and start saving
+            every interval. A snapshot that fails to load is logged and left alone: the
+            repository starts empty and no save is scheduled, so the file is never replaced
+            by an empty one. Returns the number of categories loaded
+        """
+        loaded = 0
+        if self.path.exists():
+            try:
+                loaded = self.repo.load_snapshot(self.path)
+            except InvalidSnapshotException:
+                logger.exception(
+                    "Could not load the category snapshot %s, not saving new ones", self.path)
+                return 0
+        self.start()
+        return loaded
+
+    def start(self) -> None:
+        if self.interval <= 0:
+            raise ValueError("The snapshot interval must be positive to start the scheduler")
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name='category-snapshot', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stopped.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                self.snapshot_now()
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("Could not save the category snapshot %s", self.path)
+
+
+def _little_endian(numbers: 'array[int]') -> 'array[int]':
+    if _LITTLE_ENDIAN:
+        return numbers
+    numbers = array(numbers.typecode, numbers)
+    numbers.byteswap()
+    return numbers
+
+
+def _native(column: memoryview) -> 'array[int]':
+    numbers = array(column.format, column)
+    numbers.byteswap()
+    return numbers
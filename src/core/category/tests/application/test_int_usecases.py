@@ -7,6 +7,7 @@ from core.__seedwork.domain.exceptions import EntityNotFound
 from core.category.application.dto import CategoryOutput, CategoryOutputMapper
 from core.category.application.usecase import (CreateCategoryUseCase,
                                                DeleteCategoryUseCase,
+                                               GetCategoriesUseCase,
                                                GetCategoryUseCase,
                                                ListCategoriesUseCase,
                                                UpdateCategoryUseCase)
@@ -128,6 +129,33 @@ class TestGetCategoryUseCaseInt(unittest.TestCase):
         ))
 
 
+@pytest.mark.django_db
+class TestGetCategoriesUseCaseInt(unittest.TestCase):
+
+    use_case: GetCategoriesUseCase
+    repo: CategoryDjangoRepository
+
+    def setUp(self) -> None:
+        self.repo = CategoryDjangoRepository()
+        self.use_case = GetCategoriesUseCase(self.repo)
+
+    def test_execute(self):
+        entities = Category.fake().the_categories(3).build()
+        self.repo.bulk_insert(entities)
+        input_param = GetCategoriesUseCase.Input(ids=[
+            entities[2].id, 'fake id', entities[0].id, Category.fake().a_category().build().id,
+            entities[2].id,
+        ])
+        output = self.use_case.execute(input_param)
+        self.assertEqual(output, GetCategoriesUseCase.Output(items=[
+            CategoryOutputMapper.without_child().to_output(entity)
+            for entity in [entities[2], entities[0]]
+        ]))
+
+        output = self.use_case.execute(GetCategoriesUseCase.Input(ids=[]))
+        self.assertEqual(output, GetCategoriesUseCase.Output(items=[]))
+
+
 @pytest.mark.django_db
 class TestListCategoriesUseCaseInt(unittest.TestCase):
 
@@ -244,6 +272,37 @@ class TestListCategoriesUseCaseInt(unittest.TestCase):
             last_page=2
         ))
 
+    def test_execute_following_the_cursors(self):
+        categories = Category.fake()\
+            .the_categories(5)\
+            .with_created_at(
+            lambda index: datetime.datetime.now(
+                datetime.timezone.utc) + datetime.timedelta(days=index)
+        ).build()
+        self.repo.bulk_insert(categories)
+
+        output = self.use_case.execute(ListCategoriesUseCase.Input(per_page=2))
+        self.assertIsNone(output.prev_cursor)
+        output = self.use_case.execute(
+            ListCategoriesUseCase.Input(per_page=2, cursor=output.next_cursor))
+        self.assertEqual(output.items, [
+            self.from_entity_to_output(categories[2]),
+            self.from_entity_to_output(categories[1]),
+        ])
+        self.assertEqual(output.total, 5)
+
+        output = self.use_case.execute(
+            ListCategoriesUseCase.Input(per_page=2, cursor=output.next_cursor))
+        self.assertEqual(output.items, [self.from_entity_to_output(categories[0])])
+        self.assertIsNone(output.next_cursor)
+
+        output = self.use_case.execute(
+            ListCategoriesUseCase.Input(per_page=2, cursor=output.prev_cursor))
+        self.assertEqual(output.items, [
+            self.from_entity_to_output(categories[2]),
+            self.from_entity_to_output(categories[1]),
+        ])
+
     def from_entity_to_output(self, entity: Category) -> CategoryOutput:
         return CategoryOutputMapper.without_child().to_output(entity)
 
@@ -9,6 +9,7 @@ from core.__seedwork.domain.exceptions import (EntityNotFound,
 from core.category.application.dto import CategoryOutputMapper
 from core.category.application.usecase import (CreateCategoryUseCase,
                                                DeleteCategoryUseCase,
+                                               GetCategoriesUseCase,
                                                GetCategoryUseCase,
                                                UpdateCategoryUseCase)
 from core.category.domain.entities import Category
@@ -92,6 +93,28 @@ class TestGetCategoryUseCase(unittest.TestCase):
             find_by_id.assert_called_once_with("not_an_valid_id")
 
 
+class TestGetCategoriesUseCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.repo = InMemoryCategoryRepository()
+
+    def test_can_get_the_categories_in_one_call(self):
+        categories = [Category(name=name) for name in ("Cat1", "Cat2", "Cat3")]
+        self.repo.bulk_insert(categories)
+
+        with patch.object(self.repo, 'find_by_ids', wraps=self.repo.find_by_ids) as find_by_ids:
+            usecase = GetCategoriesUseCase(self.repo)
+            input_param = GetCategoriesUseCase.Input(
+                ids=[categories[2].id, "not_an_valid_id", categories[1].id])
+            output = usecase(input_param)
+            self.assertEqual(output, GetCategoriesUseCase.Output(items=[
+                CategoryOutputMapper.without_child().to_output(category)
+                for category in [categories[2], categories[1]]
+            ]))
+            find_by_ids.assert_called_once_with(
+                [categories[2].unique_entity_id, categories[1].unique_entity_id])
+
+
 class TestUpdateCategoryUseCase(unittest.TestCase):
 
     def setUp(self) -> None:
@@ -0,0 +1,102 @@
+import tracemalloc
+from dataclasses import asdict
+
+import pytest
+
+from core.__seedwork.infra.testing_helpers import measure, print_benchmark
+from core.category.domain.batch import CategoryBatch
+from core.category.domain.entities import Category
+from core.category.domain.validators import CategoryValidatorFactory
+
+
+def asdict_to_dict(entity: Category):
+    entity_dict = asdict(entity)
+    entity_dict.pop('unique_entity_id')
+    # O controle dos campos sujos não é um dado da entidade
+    entity_dict.pop('_dirty_fields')
+    entity_dict['id'] = entity.id
+    return entity_dict
+
+
+@pytest.mark.group('benchmark')
+class TestCategoryToDictBenchmark:
+
+    def test_generated_to_dict_against_asdict(self):
+        category = Category(name='Movie', description='Movie description')
+        assert category.to_dict() == asdict_to_dict(category)
+
+        results = {
+            'dataclasses.asdict': measure(lambda: asdict_to_dict(category), number=10000),
+            'generated to_dict': measure(category.to_dict, number=10000),
+        }
+        print_benchmark('Category.to_dict', results)
+        assert results['generated to_dict'] < results['dataclasses.asdict']
+
+
+@pytest.mark.group('benchmark')
+class TestCategoryCreateManyBenchmark:
+
+    props_list = [
+        {'name': f'Movie {index}', 'description': 'Movie description', 'is_active': True}
+        for index in range(10000)
+    ]
+
+    def test_create_many_against_the_constructor(self):
+        results = {}
+        for mode in ('drf', 'compiled'):
+            CategoryValidatorFactory.mode = mode
+            try:
+                results[f'{mode} constructor'] = measure(
+                    lambda: [Category(**props) for props in self.props_list], number=1, repeat=3)
+                results[f'{mode} create_many'] = measure(
+                    lambda: Category.create_many(self.props_list), number=1, repeat=3)
+            finally:
+                CategoryValidatorFactory.mode = 'drf'
+        print_benchmark(f'{len(self.props_list)} categories', results)
+        assert results['drf create_many'] < results['drf constructor']
+        assert results['compiled create_many'] < results['compiled constructor']
+
+
+@pytest.mark.group('benchmark')
+class TestCategoryBatchMemoryBenchmark:
+
+    size = 100000
+
+    def test_batch_against_a_list_of_categories(self):
+        # Os nomes ficam fora da medição, as duas formas guardam as mesmas strings
+        names = [f'Movie {index}' for index in range(self.size)]
+        tracemalloc.start()
+        try:
+            categories = [Category.restore(name=name) for name in names]
+            list_size, _ = tracemalloc.get_traced_memory()
+            batch = CategoryBatch(categories)
+            del categories
+            batch_size, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        print(f'\n{self.size} categories')
+        print(f'    list of Category {list_size / self.size:>12.1f} bytes/item')
+        print(f'    CategoryBatch    {batch_size / self.size:>12.1f} bytes/item')
+        assert len(batch) == self.size
+        assert batch_size * 3 < list_size
+
+
+@pytest.mark.group('benchmark')
+class TestCategoryMemoryBenchmark:
+
+    size = 100000
+    # Medido com id, created_at e as entidades sem __dict__, em torno de 236 bytes
+    max_bytes_per_category = 256
+
+    def test_bytes_per_category(self):
+        names = [f'Movie {index}' for index in range(self.size)]
+        tracemalloc.start()
+        try:
+            categories = [Category.restore(name=name) for name in names]
+            size, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        bytes_per_category = size / len(categories)
+        print(f'\n{self.size} categories')
+        print(f'    Category         {bytes_per_category:>12.1f} bytes/item')
+        assert bytes_per_category < self.max_bytes_per_category
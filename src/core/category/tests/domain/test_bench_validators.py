@@ -0,0 +1,41 @@
+import datetime as dt
+
+import pytest
+
+from core.__seedwork.infra.testing_helpers import measure, print_benchmark
+from core.category.domain.entities import Category
+from core.category.domain.validators import CategoryValidatorFactory
+
+
+@pytest.mark.group('benchmark')
+class TestCategoryValidatorBenchmark:
+
+    data = {
+        'name': 'Movie',
+        'description': 'Movie description',
+        'is_active': True,
+        'created_at': dt.datetime.now(dt.timezone.utc),
+    }
+
+    def test_compiled_validator_against_drf_validator(self):
+        results = {
+            mode: measure(
+                lambda mode=mode: CategoryValidatorFactory.create(mode).validate(self.data)
+            )
+            for mode in ('drf', 'compiled')
+        }
+        print_benchmark('Category validator', results)
+        assert results['compiled'] < results['drf']
+
+    def test_category_constructor_with_compiled_validator(self):
+        def create_category():
+            return Category(**self.data)
+
+        results = {'drf': measure(create_category)}
+        CategoryValidatorFactory.mode = 'compiled'
+        try:
+            results['compiled'] = measure(create_category)
+        finally:
+            CategoryValidatorFactory.mode = 'drf'
+        print_benchmark('Category constructor', results)
+        assert results['compiled'] < results['drf']
@@ -1,8 +1,10 @@
 import datetime as dt
+import sys
 import unittest
 from dataclasses import is_dataclass
 from unittest.mock import patch
 
+from core.__seedwork.domain.value_objects import UniqueEntityId
 from core.category.domain.entities import Category
 
 
@@ -12,6 +14,18 @@ class TestCategory(unittest.TestCase):
     def test_if_category_is_a_dataclass(self, _validator):
         self.assertTrue(is_dataclass(Category))
 
+    def test_category_has_no_instance_dict(self, _validator):
+        self.assertFalse(hasattr(Category(name="Cat1"), '__dict__'))
+        self.assertFalse(hasattr(Category.restore(name="Cat1"), '__dict__'))
+
+    def test_category_stays_small(self, _validator):
+        movie, serie = Category.restore(name="Movie"), Category.restore(name="Serie")
+        # Do tamanho de um objeto só com 6 slots: o id, os dirty fields e os 4 campos
+        six_slots = type('SixSlots', (), {'__slots__': ('a', 'b', 'c', 'd', 'e', 'f')})()
+        self.assertLessEqual(sys.getsizeof(movie), sys.getsizeof(six_slots))
+        # As entidades limpas compartilham o mesmo frozenset vazio
+        self.assertIs(movie.dirty_fields, serie.dirty_fields)
+
     def test_category_constructor(self, _validator):
         category = Category(name="Cat1")
         self.assertIsNotNone(category)
@@ -57,3 +71,57 @@ class TestCategory(unittest.TestCase):
         assert category.is_active is False
         category.inactivate()
         assert category.is_active is False
+
+    def test_category_tracks_dirty_fields(self, _validator):
+        category = Category(name="Cat1")
+        self.assertEqual(
+            category.dirty_fields, {'name', 'description', 'is_active', 'created_at'})
+
+        category = Category.restore(name="Cat1", description="Description")
+        category.update(name="Cat1", description="Description")
+        category.activate()
+        self.assertEqual(category.dirty_fields, set())
+
+        category.update(name="Cat2", description="Description")
+        category.inactivate()
+        self.assertEqual(category.dirty_fields, {'name', 'is_active'})
+
+        category.clear_dirty_fields()
+        self.assertEqual(category.dirty_fields, set())
+
+    def test_category_restore_does_not_validate(self, validator):
+        created_at = dt.datetime.now(dt.timezone.utc)
+        unique_entity_id = UniqueEntityId()
+        category = Category.restore(
+            unique_entity_id=unique_entity_id,
+            name="Cat1",
+            description="Description",
+            is_active=False,
+            created_at=created_at,
+        )
+        validator.assert_not_called()
+        self.assertEqual(category, Category(
+            unique_entity_id=unique_entity_id,
+            name="Cat1",
+            description="Description",
+            is_active=False,
+            created_at=created_at,
+        ))
+
+        category = Category.restore(name="")
+        validator.assert_called_once()
+        self.assertEqual(category.name, "")
+        self.assertEqual(category.description, None)
+        self.assertEqual(category.is_active, True)
+        self.assertIsInstance(category.created_at, dt.datetime)
+        self.assertIsInstance(category.unique_entity_id, UniqueEntityId)
+
+    def test_category_restore_with_invalid_props(self, _validator):
+        with self.assertRaises(TypeError) as assert_error:
+            Category.restore(description="Description")
+        self.assertIn("missing 1 required keyword-only argument: 'name'",
+                      assert_error.exception.args[0])
+
+        with self.assertRaises(TypeError) as assert_error:
+            Category.restore(name="Cat1", fake="fake")
+        self.assertIn("unexpected keyword argument 'fake'", assert_error.exception.args[0])
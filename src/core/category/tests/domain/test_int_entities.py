@@ -1,8 +1,10 @@
 # pylint: disable=unexpected-keyword-arg
+import datetime as dt
 import unittest
 
 from core.__seedwork.domain.exceptions import ValidationException
 from core.category.domain.entities import Category
+from core.category.domain.validators import CategoryValidatorFactory
 
 
 class TestCategoryIntegration(unittest.TestCase):
@@ -119,3 +121,54 @@ class TestCategoryIntegration(unittest.TestCase):
             category.update(name='Movie', description='')
         except ValidationException as exception:
             self.fail(f'Some prop is not valid. Error: {exception.args[0]}')
+
+    def test_create_many(self):
+        created_at = dt.datetime.now(dt.timezone.utc)
+        props_list = [
+            {'name': 'Movie'},
+            {'name': None},
+            {'name': 'Documentary', 'description': 'some description', 'is_active': False},
+            {'name': 'Movie', 'description': 5, 'is_active': ''},
+            {'name': 'Serie', 'created_at': created_at},
+            {'name': 'Anime', 'created_at': None},
+            {'description': 'no name'},
+            {'name': 'Drama', 'color': 'red'},
+        ]
+
+        for mode in ('drf', 'compiled'):
+            CategoryValidatorFactory.mode = mode
+            try:
+                batch = Category.create_many(props_list)
+            finally:
+                CategoryValidatorFactory.mode = 'drf'
+
+            self.assertEqual(
+                [category.name for category in batch.entities],
+                ['Movie', 'Documentary', 'Serie', 'Anime'],
+                mode,
+            )
+            self.assertEqual(batch.errors, {
+                1: {'name': ['This field may not be null.']},
+                3: {
+                    'description': ['Not a valid string.'],
+                    'is_active': ['Must be a valid boolean.'],
+                },
+                6: {'name': ['This field is required.']},
+                7: {'color': ['Unexpected field.']},
+            }, mode)
+            self.assertEqual(batch.entities[1].is_active, False)
+            self.assertEqual(batch.entities[2].created_at, created_at)
+            self.assertIsInstance(batch.entities[3].created_at, dt.datetime)
+
+    def test_create_many_errors_are_the_same_of_the_constructor(self):
+        props_list = [{'name': 'Movie', 'is_active': 5}, {'name': 't' * 256}]
+        batch = Category.create_many(props_list)
+        for index, props in enumerate(props_list):
+            with self.assertRaises(ValidationException) as assert_error:
+                Category(**props)
+            self.assertEqual(batch.errors[index], assert_error.exception.error)
+
+    def test_create_many_with_an_empty_batch(self):
+        batch = Category.create_many([])
+        self.assertEqual(batch.entities, [])
+        self.assertEqual(batch.errors, {})
@@ -0,0 +1,105 @@
+import datetime as dt
+import unittest
+
+from core.__seedwork.domain.storage import EntitySource
+from core.__seedwork.domain.value_objects import UniqueEntityId
+from core.category.domain.batch import CategoryBatch
+from core.category.domain.entities import Category
+
+
+class TestCategoryBatchUnit(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.categories = [
+            Category(name='Movie', description='Movie description'),
+            Category(name='Serie', is_active=False),
+            Category(
+                name='Documentary',
+                created_at=dt.datetime(2023, 1, 2, 3, 4, 5, 678901),
+            ),
+        ]
+        self.batch = CategoryBatch(self.categories)
+
+    def test_len_and_iteration_keep_the_order(self):
+        self.assertEqual(len(self.batch), 3)
+        self.assertEqual(list(self.batch), self.categories)
+        self.assertEqual(
+            [category.to_dict() for category in self.batch],
+            [category.to_dict() for category in self.categories],
+        )
+
+    def test_getitem_restores_a_detached_category(self):
+        category = self.batch[1]
+        self.assertIsInstance(category, Category)
+        self.assertEqual(category.to_dict(), self.categories[1].to_dict())
+        self.assertIsNot(category, self.batch[1])
+
+        category.activate()
+        self.assertFalse(self.batch[1].is_active)
+
+        self.assertEqual(self.batch[-1], self.categories[-1])
+        with self.assertRaises(IndexError):
+            self.batch[3]  # pylint: disable=pointless-statement
+
+    def test_getitem_with_slice(self):
+        self.assertEqual(self.batch[1:], self.categories[1:])
+        self.assertEqual(self.batch[::-1], self.categories[::-1])
+
+    def test_created_at_keeps_microseconds_and_timezone(self):
+        self.assertEqual(self.batch[0].created_at, self.categories[0].created_at)
+        self.assertEqual(self.batch[0].created_at.tzinfo, dt.timezone.utc)
+        self.assertEqual(self.batch[2].created_at, dt.datetime(2023, 1, 2, 3, 4, 5, 678901))
+        self.assertIsNone(self.batch[2].created_at.tzinfo)
+
+    def test_ids_use_the_full_128_bits(self):
+        unique_entity_id = UniqueEntityId.from_int((1 << 128) - 1)
+        category = Category(unique_entity_id=unique_entity_id, name='Movie')
+        batch = CategoryBatch([category])
+        self.assertEqual(batch.unique_entity_id(0), unique_entity_id)
+        self.assertEqual(batch[0].id, unique_entity_id.id)
+
+    def test_it_is_an_entity_source(self):
+        self.assertIsInstance(self.batch, EntitySource)
+        self.assertListEqual(
+            list(self.batch.id_values()),
+            [category.unique_entity_id.value for category in self.categories])
+        for field_name in ('name', 'description', 'is_active', 'created_at'):
+            self.assertListEqual(
+                list(self.batch.field_values(field_name)),
+                [getattr(category, field_name) for category in self.categories])
+
+    def test_replace(self):
+        category = self.batch[0]
+        category.update(name='Film', description=None)
+        category.inactivate()
+        self.batch.replace(0, category)
+        self.assertEqual(self.batch[0].to_dict(), category.to_dict())
+        self.assertEqual(self.batch[1], self.categories[1])
+
+    def test_pop(self):
+        category = self.batch.pop(0)
+        self.assertEqual(category, self.categories[0])
+        self.assertEqual(list(self.batch), self.categories[1:])
+        self.assertEqual(self.batch.pop(), self.categories[2])
+        self.assertEqual(len(self.batch), 1)
+
+    def test_index(self):
+        for position, category in enumerate(self.categories):
+            self.assertEqual(self.batch.index(category.unique_entity_id), position)
+        with self.assertRaises(ValueError):
+            self.batch.index(UniqueEntityId())
+
+    def test_index_with_same_high_bits(self):
+        low_a = UniqueEntityId.from_int(1 << 64 | 1)
+        low_b = UniqueEntityId.from_int(1 << 64 | 2)
+        batch = CategoryBatch([
+            Category(unique_entity_id=low_a, name='A'),
+            Category(unique_entity_id=low_b, name='B'),
+        ])
+        self.assertEqual(batch.index(low_b), 1)
+
+    def test_rows_use_the_to_dict_format(self):
+        self.assertEqual(
+            list(self.batch.rows()),
+            [category.to_dict() for category in self.categories],
+        )
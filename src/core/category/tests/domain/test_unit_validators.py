@@ -1,7 +1,9 @@
+import datetime as dt
 import unittest
 from collections import namedtuple
 
 from core.category.domain.validators import (CategoryValidatorFactory,
+                                             CompiledCategoryValidator,
                                              DRFCategoryValidator)
 
 
@@ -137,3 +139,80 @@ class TestCategoryValidatorUnit(unittest.TestCase):
             is_valid = self.validator.validate(data)
             self.assertTrue(
                 is_valid, f"Row: {index}, valid_data: {data}, {self.validator.errors}")
+
+
+class TestCompiledCategoryValidatorUnit(TestCategoryValidatorUnit):
+
+    validator: CompiledCategoryValidator
+
+    def setUp(self) -> None:
+        self.validator = CategoryValidatorFactory.create('compiled')
+
+    def test_factory_mode(self):
+        self.assertIsInstance(CategoryValidatorFactory.create(), DRFCategoryValidator)
+        self.assertIsInstance(
+            CategoryValidatorFactory.create('compiled'), CompiledCategoryValidator)
+
+        CategoryValidatorFactory.mode = 'compiled'
+        try:
+            self.assertIsInstance(CategoryValidatorFactory.create(), CompiledCategoryValidator)
+        finally:
+            CategoryValidatorFactory.mode = 'drf'
+
+    def test_same_result_of_drf_validator(self):
+        now = dt.datetime.now(dt.timezone.utc)
+        arrange = [
+            None,
+            {},
+            [],
+            'not a dict',
+            {'name': 'Movie'},
+            {'name': '  Movie  ', 'description': '  '},
+            {'name': '   '},
+            {'name': 'Movie\x00'},
+            {'name': 'Movie \ud800'},
+            {'name': 'Movié'},
+            {'name': 'a' * 255},
+            {'name': 'a' * 256, 'description': 5, 'is_active': None},
+            {'name': 5, 'is_active': 'true'},
+            {'name': 'Movie', 'description': None, 'is_active': False, 'created_at': now},
+            {'name': 'Movie', 'created_at': now.replace(tzinfo=None)},
+            {'name': 'Movie', 'created_at': now.isoformat()},
+            {'name': 'Movie', 'created_at': None},
+            {'name': 'Movie', 'created_at': 'fake'},
+            {'name': 'Movie', 'unknown_field': 'ignored'},
+        ]
+
+        for data in arrange:
+            drf_validator = CategoryValidatorFactory.create('drf')
+            compiled_validator = CategoryValidatorFactory.create('compiled')
+            is_valid = drf_validator.validate(data)
+            self.assertEqual(is_valid, compiled_validator.validate(data), data)
+            self.assertEqual(drf_validator.errors, compiled_validator.errors, data)
+            self.assertEqual(
+                dict(drf_validator.validated_data or {}),
+                dict(compiled_validator.validated_data or {}),
+                data,
+            )
+
+    def test_validate_many_same_result_of_drf_validator(self):
+        data_list = [
+            {'name': 'Movie'},
+            {},
+            {'name': 'a' * 256, 'description': 5},
+            {'name': 'Movie', 'is_active': False},
+            {'name': 5, 'is_active': 'true'},
+        ]
+        expected = {
+            1: {'name': ['This field is required.']},
+            2: {
+                'name': ['Ensure this field has no more than 255 characters.'],
+                'description': ['Not a valid string.'],
+            },
+            4: {'name': ['Not a valid string.'], 'is_active': ['Must be a valid boolean.']},
+        }
+        for mode in ('drf', 'compiled'):
+            validator = CategoryValidatorFactory.create(mode)
+            self.assertEqual(validator.validate_many(data_list), expected, mode)
+            self.assertEqual(validator.validate_many(data_list[:1]), {}, mode)
+            self.assertEqual(validator.validate_many([]), {}, mode)
@@ -0,0 +1,109 @@
+# pylint: disable=protected-access
+import random
+import time
+from array import array
+from importlib.util import find_spec
+
+import pytest
+
+from core.__seedwork.infra.testing_helpers import measure, print_benchmark
+from core.category.domain.batch import CategoryBatch, CategoryColumns
+from core.category.domain.entities import Category
+from core.category.infra.repositories import InMemoryCategoryRepository
+from core.category.infra.snapshot import save_snapshot
+
+
+@pytest.mark.group('benchmark')
+class TestTrigramFilterBenchmark:
+
+    size = 100000
+    words = ['movie', 'serie', 'documentary', 'anime', 'show', 'drama', 'comedy', 'horror']
+
+    def test_filter_against_the_scan(self):
+        rand = random.Random(self.size)
+        repo = InMemoryCategoryRepository()
+        repo.bulk_insert([
+            Category.restore(name=f'{rand.choice(self.words)} {rand.randrange(self.size)}')
+            for _ in range(self.size)
+        ])
+        params = repo.SearchParams(filters='comedy 12')
+
+        def scan():
+            items_filtered = repo._apply_filter(repo.items, params.filters)
+            return repo._apply_paginate(
+                repo._apply_sort(items_filtered, None, None), params.page, params.per_page)
+
+        assert repo.search(params).items == scan()
+        results = {
+            'scan': measure(scan, number=5, repeat=3),
+            'trigram index': measure(lambda: repo.search(params), number=5, repeat=3),
+        }
+        print_benchmark(f'filter over {self.size} categories', results)
+        assert results['trigram index'] < results['scan']
+
+
+@pytest.mark.group('benchmark')
+@pytest.mark.skipif(not find_spec('numpy'), reason='NumPy is not installed')
+class TestNumPySearchBenchmark:
+
+    size = 100000
+    words = TestTrigramFilterBenchmark.words
+
+    def test_numpy_search_against_the_python_search(self):
+        from core.category.infra.numpy_repositories import \
+            NumPyInMemoryCategoryRepository  # pylint: disable=import-outside-toplevel
+        rand = random.Random(self.size)
+        categories = [
+            Category.restore(name=f'{rand.choice(self.words)} {rand.randrange(self.size)}')
+            for _ in range(self.size)
+        ]
+        python_repo = InMemoryCategoryRepository(categories)
+        numpy_repo = NumPyInMemoryCategoryRepository(categories)
+
+        for title, params in (
+            ('short filter sorted by name', python_repo.SearchParams(filters='s', sort='name')),
+            ('filter sorted by name', python_repo.SearchParams(filters='comedy', sort='name')),
+            ('page 100 by created_at', python_repo.SearchParams(page=100, sort_dir='desc')),
+        ):
+            assert numpy_repo.search(params) == python_repo.search(params)
+            results = {
+                'python': measure(lambda params=params: python_repo.search(params), 3, 3),
+                'numpy': measure(lambda params=params: numpy_repo.search(params), 3, 3),
+            }
+            print_benchmark(f'{title} over {self.size} categories', results)
+
+
+@pytest.mark.group('benchmark')
+class TestSnapshotLoadBenchmark:
+
+    size = 2000000
+    # O arquivo fica mapeado, carregar não lê os itens
+    max_load_seconds = 0.5
+
+    def test_load_a_multi_million_rows_snapshot(self, tmp_path):
+        path = tmp_path / 'categories.snapshot'
+        rand = random.Random(self.size)
+        save_snapshot(path, CategoryBatch.from_columns(CategoryColumns(
+            id_high=array('Q', (rand.getrandbits(64) for _ in range(self.size))),
+            id_low=array('Q', (rand.getrandbits(64) for _ in range(self.size))),
+            names=[f'Movie {index}' for index in range(self.size)],
+            descriptions=[None] * self.size,
+            is_active=bytearray(b'\1') * self.size,
+            created_at=array('q', range(self.size)),
+            created_at_aware=bytearray(b'\1') * self.size,
+        )))
+        repo = InMemoryCategoryRepository()
+
+        started_at = time.perf_counter()
+        loaded = repo.load_snapshot(path)
+        load_seconds = time.perf_counter() - started_at
+        started_at = time.perf_counter()
+        category = repo.find_by_id(repo.search(repo.SearchParams(sort='name')).items[0].id)
+        first_search_seconds = time.perf_counter() - started_at
+
+        print(f'\nLoad of a {self.size} categories snapshot')
+        print(f'    load_snapshot          {load_seconds * 1000:>10.1f} ms')
+        print(f'    first search and find  {first_search_seconds * 1000:>10.1f} ms')
+        assert loaded == self.size
+        assert category.name == 'Movie 0'
+        assert load_seconds < self.max_load_seconds
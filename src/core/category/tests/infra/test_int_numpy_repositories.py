@@ -0,0 +1,115 @@
+# pylint: disable=protected-access
+import datetime
+import random
+import unittest
+from importlib.util import find_spec
+
+from core.category.domain.entities import Category
+from core.category.infra.repositories import InMemoryCategoryRepository
+
+if find_spec('numpy'):
+    from core.category.infra.numpy_repositories import (
+        ConcurrentNumPyInMemoryCategoryRepository,
+        NumPyInMemoryCategoryRepository)
+else:
+    NumPyInMemoryCategoryRepository = ConcurrentNumPyInMemoryCategoryRepository = None
+
+
+@unittest.skipUnless(find_spec('numpy'), 'NumPy is not installed')
+class TestNumPyInMemoryCategoryRepositoryParity(unittest.TestCase):
+
+    names = ['Movie', 'movie night', 'Série', 'documentary', 'Anime', 'drama', 'İstanbul', 'a']
+    filters = [None, 'm', 'mo', 'movie', 'MOVIE', 'ie', 'série', 'i̇st', 'zzz', 'a', ' ']
+
+    def setUp(self) -> None:
+        self.rand = random.Random(19)
+        self.created_at = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+        self.python = InMemoryCategoryRepository()
+        self.numpy = NumPyInMemoryCategoryRepository()
+
+    def _category(self, **props) -> Category:
+        return Category.restore(
+            name=f'{self.rand.choice(self.names)} {self.rand.randrange(30)}',
+            description=self.rand.choice(['b', 'a', 'c']),
+            is_active=self.rand.random() < 0.5,
+            # Datas repetidas para testar a ordem dos empates
+            created_at=self.created_at + datetime.timedelta(seconds=self.rand.randrange(20)),
+            **props,
+        )
+
+    def _assert_same_search(self, **props):
+        params = InMemoryCategoryRepository.SearchParams(**props)
+        self.assertEqual(self.numpy.search(params), self.python.search(params), props)
+
+    def test_search_returns_the_same_result_of_the_python_search(self):
+        categories = []
+        for step in range(300):
+            operation = self.rand.random()
+            if operation < 0.3 or len(categories) < 5:
+                category = self._category()
+                self.python.insert(category)
+                self.numpy.insert(category)
+                categories.append(category)
+            elif operation < 0.5:
+                batch = [self._category() for _ in range(self.rand.randint(1, 30))]
+                self.python.bulk_insert(batch)
+                self.numpy.bulk_insert(batch)
+                categories[:0] = batch
+            elif operation < 0.7:
+                index = self.rand.randrange(len(categories))
+                category = self._category(unique_entity_id=categories[index].unique_entity_id)
+                self.python.update(category)
+                self.numpy.update(category)
+                categories[index] = category
+            elif operation < 0.8:
+                category = categories.pop(self.rand.randrange(len(categories)))
+                self.python.delete(category)
+                self.numpy.delete(category)
+
+            for _ in range(3):
+                self._assert_same_search(
+                    page=self.rand.randint(1, 4),
+                    per_page=self.rand.choice([1, 5, 15, 50]),
+                    sort=self.rand.choice([None, 'name', 'created_at', 'description', 'is_active']),
+                    sort_dir=self.rand.choice([None, 'asc', 'desc']),
+                    filters=self.rand.choice(self.filters),
+                )
+            self.assertEqual(self.numpy.find_all(), self.python.find_all(), step)
+
+    def test_search_an_empty_repository(self):
+        for sort in (None, 'name', 'created_at'):
+            self._assert_same_search(sort=sort, filters='movie')
+            self._assert_same_search(sort=sort, sort_dir='desc')
+
+    def test_search_from_items_set_at_once(self):
+        categories = [self._category() for _ in range(200)]
+        self.python.items = categories
+        self.numpy.items = categories
+
+        for sort in (None, 'name', 'created_at'):
+            for sort_dir in ('asc', 'desc'):
+                for filters in self.filters:
+                    self._assert_same_search(
+                        sort=sort, sort_dir=sort_dir, filters=filters, per_page=200)
+
+    def test_columns_are_rebuilt_only_after_a_write(self):
+        self.numpy.bulk_insert([self._category() for _ in range(10)])
+        self.numpy.search(self.numpy.SearchParams())
+        columns = self.numpy._columns
+
+        self.numpy.search(self.numpy.SearchParams(sort='name', filters='movie'))
+        self.assertIs(self.numpy._columns, columns)
+
+        self.numpy.insert(self._category())
+        self.assertEqual(self.numpy.search(self.numpy.SearchParams()).total, 11)
+        self.assertIsNot(self.numpy._columns, columns)
+
+    def test_concurrent_repository_uses_the_numpy_search(self):
+        repo = ConcurrentNumPyInMemoryCategoryRepository(search_cache_size=2)
+        categories = [self._category() for _ in range(20)]
+        repo.bulk_insert(categories)
+        self.python.bulk_insert(categories)
+
+        params = repo.SearchParams(sort='name', filters='movie')
+        self.assertEqual(repo.search(params), self.python.search(params))
+        self.assertIsNotNone(repo._columns)
@@ -1,8 +1,14 @@
 import datetime
+import random
+import threading
 import unittest
 
+from core.__seedwork.infra.testing_helpers import \
+    assert_bulk_update_cleans_the_written_fields
+from core.category.domain.batch import CategoryBatch
 from core.category.domain.entities import Category
-from core.category.infra.repositories import InMemoryCategoryRepository
+from core.category.infra.repositories import (
+    ConcurrentInMemoryCategoryRepository, InMemoryCategoryRepository)
 
 
 class TestInMemoryCategoryRepository(unittest.TestCase):
@@ -24,6 +30,14 @@ class TestInMemoryCategoryRepository(unittest.TestCase):
         self.repo.insert(Category(name="Test3"))
         self.assertEqual(len(self.repo.items), 3)
 
+    def test_it_can_bulk_insert_a_category_batch(self):
+        categories = [Category(name="Test1"), Category(name="Test2")]
+        self.repo.bulk_insert(CategoryBatch(categories))
+
+        self.assertEqual(self.repo.find_all(), categories)
+        found = self.repo.find_by_id(categories[1].id)
+        self.assertIs(found, self.repo.items[1])
+
     def test_it_can_find_by_id(self):
         categories = [
             Category(name="Test1"),
@@ -136,3 +150,189 @@ class TestInMemoryCategoryRepository(unittest.TestCase):
         self.assertEqual(output.items, categories[4:1:-1])
         self.assertEqual(output.last_page, 2)
         self.assertEqual(output.total, 4)
+
+    def test_search_by_a_field_without_index_selects_the_page(self):
+        categories = [
+            Category(name=f"Test{index}", description=f"Description{index % 7}")
+            for index in range(1000)
+        ]
+        self.repo.bulk_insert(categories)
+
+        for sort_dir in ["asc", "desc"]:
+            input_params = self.repo.SearchParams(
+                page=2, per_page=5, sort="description", sort_dir=sort_dir)
+            output = self.repo.search(input_params)
+            expected = sorted(
+                categories, key=lambda category: category.description, reverse=sort_dir == "desc")
+            self.assertEqual(output.items, expected[5:10])
+            self.assertEqual(output.total, 1000)
+
+    def test_bulk_update_cleans_the_written_fields(self):
+        assert_bulk_update_cleans_the_written_fields(
+            self.repo,
+            [Category(name=f"Movie {index}", description="Movie") for index in range(3)],
+            lambda category: category.update(name=f"Serie {category.name}", description="Serie"),
+            Category(name="Unknown"),
+            "description",
+        )
+
+    def test_bulk_writes_keep_the_indexes(self):
+        categories = [Category(name=f"Movie {index}") for index in range(200)]
+        self.repo.bulk_insert(categories)
+
+        for category in categories[:100]:
+            category.update(name=f"Serie {category.name}", description=None)
+        self.assertEqual(self.repo.bulk_update(categories[:100]), 100)
+        self.assertEqual(self.repo.bulk_delete(category.id for category in categories[150:]), 50)
+        self.repo.upsert_many([Category(name="Serie new"), categories[120]])
+
+        output = self.repo.search(self.repo.SearchParams(
+            per_page=200, sort="name", filters="serie"))
+        expected = sorted(
+            [*categories[:100], self.repo.items[0]],
+            key=lambda category: (category.name, category.unique_entity_id.value),
+        )
+        self.assertEqual(output.items, expected)
+        self.assertEqual(self.repo.search(self.repo.SearchParams(filters="movie")).total, 150)
+
+    def test_search_filter_by_the_trigram_index_matches_the_scan(self):
+        rand = random.Random(14)
+        words = ["Movie", "serie", "DOCUMENTARY", "movies", "Anime", "İstanbul"]
+        filters = ["mov", "movie", "ie", "MOV", "ocu", "es", "i̇st", "xyz", "nime", "e"]
+        now = datetime.datetime.now(datetime.timezone.utc)
+        reference = []
+        for step in range(300):
+            operation = rand.random()
+            if operation < 0.5 or not reference:
+                categories = [
+                    Category.restore(
+                        name=f"{rand.choice(words)} {rand.choice(words)}",
+                        created_at=now + datetime.timedelta(seconds=rand.randrange(50)),
+                    )
+                    for _ in range(rand.choice([1, 1, 100]))
+                ]
+                self.repo.bulk_insert(categories)
+                reference[:0] = categories
+            elif operation < 0.8:
+                category = rand.choice(reference)
+                category.update(name=rand.choice(words), description=None)
+                self.repo.update(category)
+            else:
+                self.repo.delete(reference.pop(rand.randrange(len(reference))))
+
+            filter_param = rand.choice(filters)
+            sort = rand.choice([None, "name", "created_at"])
+            input_params = self.repo.SearchParams(
+                page=rand.randint(1, 3),
+                per_page=5,
+                sort=sort,
+                sort_dir=rand.choice(["asc", "desc"]),
+                filters=filter_param,
+            )
+            output = self.repo.search(input_params)
+
+            self.assertEqual(
+                (output.items, output.total),
+                self._scan_page(reference, input_params),
+                f"{step=} {input_params}",
+            )
+
+    @staticmethod
+    def _scan_page(categories, params):
+        """The page and the total of the search by filtering and sorting all the categories"""
+        sort = params.sort
+        matches = [category for category in categories if params.filters in category.name.lower()]
+        matches.sort(
+            key=lambda category: getattr(category, sort or "created_at"),
+            reverse=sort is not None and params.sort_dir == "desc",
+        )
+        start = (params.page - 1) * params.per_page
+        return matches[start:start + params.per_page], len(matches)
+
+
+class TestConcurrentInMemoryCategoryRepository(unittest.TestCase):
+
+    readers = 8
+    writers = 4
+    operations = 150
+
+    def test_readers_and_writers_see_a_consistent_state(self):
+        self._run_readers_and_writers(ConcurrentInMemoryCategoryRepository())
+
+    def test_readers_and_writers_see_a_consistent_state_with_the_search_cache(self):
+        repo = ConcurrentInMemoryCategoryRepository(search_cache_size=4)
+        self._run_readers_and_writers(repo)
+        self.assertGreater(repo.search_cache_info().misses, 0)
+
+    def _run_readers_and_writers(self, repo: ConcurrentInMemoryCategoryRepository):
+        stable = [Category.restore(name=f"Stable movie {index}") for index in range(50)]
+        repo.bulk_insert(stable)
+        errors = []
+        start = threading.Barrier(self.readers + self.writers)
+
+        def write(seed):
+            rand = random.Random(seed)
+            own = []
+            start.wait()
+            for step in range(self.operations):
+                operation = rand.random()
+                if operation < 0.4 or not own:
+                    categories = [
+                        Category.restore(name=f"Movie {seed} {step} {index}")
+                        for index in range(rand.choice([1, 20]))
+                    ]
+                    repo.bulk_insert(categories)
+                    own.extend(categories)
+                elif operation < 0.7:
+                    category = rand.choice(own)
+                    repo.update(Category.restore(
+                        unique_entity_id=category.unique_entity_id,
+                        name=f"Serie {seed} {step}",
+                        created_at=category.created_at,
+                    ))
+                else:
+                    repo.delete(own.pop(rand.randrange(len(own))))
+
+        def read(seed):
+            rand = random.Random(seed)
+            start.wait()
+            for _ in range(self.operations):
+                params = repo.SearchParams(
+                    per_page=20,
+                    sort=rand.choice([None, "name"]),
+                    filters=rand.choice([None, "movie", "stable"]),
+                )
+                result = repo.search(params)
+                self.assertEqual(len(result.items), min(20, result.total))
+                if params.filters:
+                    for category in result.items:
+                        self.assertIn(params.filters, category.name.lower())
+                if params.sort:
+                    names = [category.name for category in result.items]
+                    self.assertEqual(names, sorted(names))
+                if params.filters == "stable":
+                    self.assertEqual(result.total, len(stable))
+
+                category = rand.choice(stable)
+                self.assertIs(repo.find_by_id(category.unique_entity_id), category)
+                items = repo.find_all()
+                self.assertEqual(len(items), len({item.unique_entity_id for item in items}))
+
+        def run(target, seed):
+            try:
+                target(seed)
+            except Exception as error:  # pylint: disable=broad-except
+                errors.append(error)
+
+        threads = [
+            threading.Thread(target=run, args=(write, seed)) for seed in range(self.writers)
+        ] + [
+            threading.Thread(target=run, args=(read, seed)) for seed in range(self.readers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(repo.search(repo.SearchParams(filters="stable")).total, len(stable))
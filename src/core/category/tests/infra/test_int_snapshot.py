@@ -0,0 +1,216 @@
+# pylint: disable=protected-access
+import datetime
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from core.__seedwork.domain.exceptions import InvalidSnapshotException
+from core.__seedwork.domain.storage import EntitySource
+from core.__seedwork.domain.value_objects import UniqueEntityId
+from core.category.domain.batch import CategoryBatch
+from core.category.domain.entities import Category
+from core.category.infra.repositories import InMemoryCategoryRepository
+from core.category.infra.snapshot import (CategorySnapshot, SnapshotScheduler,
+                                          save_snapshot)
+
+
+class TestCategorySnapshot(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.folder = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self.folder.cleanup)
+        self.path = Path(self.folder.name) / 'categories.snapshot'
+        self.categories = [
+            Category.restore(
+                unique_entity_id=UniqueEntityId.from_int((1 << 128) - 1),
+                name='Movie',
+                description='some description',
+                created_at=datetime.datetime(2020, 1, 1, 12, 30, 15, 123456,
+                                             tzinfo=datetime.timezone.utc),
+            ),
+            Category.restore(
+                name='Ação e aventura 🎬',
+                description=None,
+                is_active=False,
+                created_at=datetime.datetime(1960, 6, 1, 8, 0, 0, 1),
+            ),
+            Category.restore(name='Documentary', description=''),
+        ]
+
+    def test_it_reads_back_the_saved_categories(self):
+        self.assertEqual(save_snapshot(self.path, self.categories), 3)
+
+        with CategorySnapshot(self.path) as snapshot:
+            self.assertEqual(len(snapshot), 3)
+            self.assertEqual(list(snapshot), self.categories)
+            self.assertEqual(snapshot[-1], self.categories[-1])
+            self.assertEqual(list(snapshot.to_batch()), self.categories)
+            with self.assertRaises(IndexError):
+                snapshot[3]  # pylint: disable=pointless-statement
+
+    def test_it_saves_a_category_batch(self):
+        save_snapshot(self.path, CategoryBatch(self.categories))
+
+        with CategorySnapshot(self.path) as snapshot:
+            self.assertEqual(list(snapshot), self.categories)
+            self.assertEqual(snapshot[1].dirty_fields, frozenset())
+
+    def test_it_saves_an_empty_snapshot(self):
+        save_snapshot(self.path, [])
+
+        with CategorySnapshot(self.path) as snapshot:
+            self.assertEqual(len(snapshot), 0)
+            self.assertEqual(list(snapshot), [])
+            self.assertEqual(len(snapshot.to_batch()), 0)
+
+    def test_it_replaces_the_file_without_leaving_temporary_ones(self):
+        save_snapshot(self.path, self.categories)
+        save_snapshot(self.path, self.categories[:1])
+
+        with CategorySnapshot(self.path) as snapshot:
+            self.assertEqual(list(snapshot), self.categories[:1])
+        self.assertEqual(list(Path(self.folder.name).iterdir()), [self.path])
+
+    def test_it_rejects_a_file_that_is_not_a_snapshot(self):
+        save_snapshot(self.path, self.categories)
+        truncated = self.path.read_bytes()[:64]
+        for content in (b'', b'not a snapshot file', truncated):
+            self.path.write_bytes(content)
+            with self.assertRaises(InvalidSnapshotException):
+                CategorySnapshot(self.path)
+
+    def test_it_rejects_a_snapshot_with_the_texts_cut_or_extended(self):
+        save_snapshot(self.path, self.categories)
+        content = self.path.read_bytes()
+        for changed in (content[:-1], content[:-20], content + b'\0'):
+            self.path.write_bytes(changed)
+            with self.assertRaises(InvalidSnapshotException):
+                CategorySnapshot(self.path)
+
+    def test_it_rejects_texts_that_are_not_utf8(self):
+        save_snapshot(self.path, self.categories)
+        content = bytearray(self.path.read_bytes())
+        # O primeiro byte dos nomes, logo depois das colunas e das flags
+        content[16 + 3 * 41 + 5] = 0xff
+        self.path.write_bytes(content)
+        with self.assertRaises(InvalidSnapshotException):
+            CategorySnapshot(self.path)
+
+    def test_it_is_an_entity_source(self):
+        save_snapshot(self.path, self.categories)
+        with CategorySnapshot(self.path) as snapshot:
+            self.assertIsInstance(snapshot, EntitySource)
+            self.assertListEqual(
+                list(snapshot.id_values()),
+                [category.unique_entity_id.value for category in self.categories])
+            for field_name in ('name', 'description', 'is_active', 'created_at'):
+                self.assertListEqual(
+                    list(snapshot.field_values(field_name)),
+                    [getattr(category, field_name) for category in self.categories])
+
+    def test_repository_reads_the_loaded_snapshot_from_the_file(self):
+        # Só os created_at com fuso, a busca ordena por eles
+        categories = self.categories[::2]
+        save_snapshot(self.path, categories)
+        repo = InMemoryCategoryRepository()
+        repo.load_snapshot(self.path)
+        self.assertIsInstance(repo._storage._source, CategorySnapshot)
+
+        # Um novo snapshot no mesmo caminho substitui o arquivo, não o mapeado
+        save_snapshot(self.path, [])
+        self.assertEqual(repo.find_all(), categories)
+        self.assertEqual(
+            repo.search(repo.SearchParams(filters='movie')).items, [categories[0]])
+
+    def test_repository_loads_the_snapshot_it_saved(self):
+        repo = InMemoryCategoryRepository(self.categories[:1] + self.categories[2:])
+        self.assertEqual(repo.save_snapshot(self.path), 2)
+
+        loaded = InMemoryCategoryRepository([Category.restore(name='Old')])
+        self.assertEqual(loaded.load_snapshot(self.path), 2)
+        self.assertEqual(loaded.find_all(), repo.find_all())
+        self.assertEqual(
+            loaded.find_by_id(self.categories[0].id), self.categories[0])
+
+
+class TestSnapshotScheduler(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.folder = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self.folder.cleanup)
+        self.path = Path(self.folder.name) / 'categories.snapshot'
+        self.repo = InMemoryCategoryRepository([Category.restore(name='Movie')])
+
+    def test_snapshot_now(self):
+        scheduler = SnapshotScheduler(self.repo, self.path)
+        self.assertEqual(scheduler.snapshot_now(), 1)
+
+        with CategorySnapshot(self.path) as snapshot:
+            self.assertEqual(list(snapshot), self.repo.find_all())
+
+    def test_it_needs_an_interval_to_start(self):
+        with self.assertRaises(ValueError):
+            SnapshotScheduler(self.repo, self.path).start()
+
+    def test_resume_loads_the_last_snapshot_and_starts(self):
+        SnapshotScheduler(self.repo, self.path).snapshot_now()
+        repo = InMemoryCategoryRepository()
+        scheduler = SnapshotScheduler(repo, self.path, interval=60)
+        self.assertEqual(scheduler.resume(), 1)
+        scheduler.stop()
+        self.assertEqual(repo.find_all(), self.repo.find_all())
+
+    def test_resume_starts_empty_without_a_snapshot(self):
+        repo = InMemoryCategoryRepository()
+        scheduler = SnapshotScheduler(repo, self.path, interval=60)
+        self.assertEqual(scheduler.resume(), 0)
+        self.assertIsNotNone(scheduler._thread)
+        scheduler.stop()
+        self.assertEqual(repo.find_all(), [])
+
+    def test_resume_never_saves_over_a_snapshot_that_failed_to_load(self):
+        self.path.write_bytes(b'not a snapshot file')
+        repo = InMemoryCategoryRepository()
+        scheduler = SnapshotScheduler(repo, self.path, interval=0.01)
+        with self.assertLogs('core.category.infra.snapshot', 'ERROR'):
+            self.assertEqual(scheduler.resume(), 0)
+        self.assertIsNone(scheduler._thread)
+        time.sleep(0.05)
+        self.assertEqual(self.path.read_bytes(), b'not a snapshot file')
+        self.assertEqual(repo.find_all(), [])
+
+    def test_it_logs_a_failed_save_and_keeps_running(self):
+        saved = threading.Event()
+        calls = []
+
+        def save_snapshot_once_failing(path):
+            calls.append(path)
+            if len(calls) == 1:
+                raise OSError('disk full')
+            saved.set()
+            return 1
+
+        self.repo.save_snapshot = save_snapshot_once_failing
+        scheduler = SnapshotScheduler(self.repo, self.path, interval=0.01)
+        with self.assertLogs('core.category.infra.snapshot', 'ERROR') as logs:
+            scheduler.start()
+            try:
+                self.assertTrue(saved.wait(5))
+            finally:
+                scheduler.stop()
+        self.assertIn('disk full', '\n'.join(logs.output))
+
+    def test_it_saves_periodically_until_stopped(self):
+        scheduler = SnapshotScheduler(self.repo, self.path, interval=0.01)
+        scheduler.start()
+        try:
+            deadline = time.monotonic() + 5
+            while not self.path.exists() and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            scheduler.stop()
+
+        self.assertTrue(self.path.exists())
+        self.assertIsNone(scheduler._thread)  # pylint: disable=protected-access
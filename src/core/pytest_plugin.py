@@ -5,6 +5,9 @@ from typing import List
 import pytest
 from colorama import Fore, Style
 
+# groups too slow to run by default, they only run when selected with --group
+_OPT_IN_GROUPS = ('benchmark',)
+
 
 def pytest_addoption(parser: pytest.Parser):
     parser.addoption(
@@ -43,3 +46,5 @@ def pytest_runtest_setup(item: pytest.Item):
     if group_option:
         if group_mark is None or group_option not in group_mark.args:
             pytest.skip("test requires group {group_option}")
+    elif group_mark is not None and any(group in _OPT_IN_GROUPS for group in group_mark.args):
+        pytest.skip(f"test runs only with --group {group_mark.args[0]}")
@@ -11,6 +11,10 @@ import os
 
 from django.core.asgi import get_asgi_application
 
+from django_app.category.apps import start_category_snapshots
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'django_app.settings')
 
 application = get_asgi_application()
+
+start_category_snapshots()
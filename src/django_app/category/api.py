@@ -1,7 +1,7 @@
 # pylint: disable=redefined-builtin
 # pylint: disable=invalid-name
 from dataclasses import dataclass
-from typing import Callable, Optional
+from typing import Callable, List, Optional
 
 from rest_framework.request import Request
 from rest_framework.response import Response
@@ -9,10 +9,12 @@ from rest_framework.status import (HTTP_200_OK, HTTP_201_CREATED,
                                    HTTP_204_NO_CONTENT)
 from rest_framework.views import APIView
 
-from core.__seedwork.infra.serializers import UUIDSerializer
+from core.__seedwork.infra.serializers import (UUIDListSerializer,
+                                               UUIDSerializer)
 from core.category.application.dto import CategoryOutput
 from core.category.application.usecase import (CreateCategoryUseCase,
                                                DeleteCategoryUseCase,
+                                               GetCategoriesUseCase,
                                                GetCategoryUseCase,
                                                ListCategoriesUseCase,
                                                UpdateCategoryUseCase)
@@ -26,6 +28,7 @@ class CategoryResource(APIView):
     create_use_case: Optional[Callable[[], CreateCategoryUseCase]] = None
     list_use_case: Optional[Callable[[], ListCategoriesUseCase]] = None
     get_use_case: Optional[Callable[[], GetCategoryUseCase]] = None
+    get_many_use_case: Optional[Callable[[], GetCategoriesUseCase]] = None
     update_use_case: Optional[Callable[[], UpdateCategoryUseCase]] = None
     delete_use_case: Optional[Callable[[], DeleteCategoryUseCase]] = None
 
@@ -42,6 +45,9 @@ class CategoryResource(APIView):
     def get(self, req: Request, id: str = None):
         if id:
             return self.get_object(id=id)
+        if 'ids' in req.query_params:
+            # Aceita ?ids=a,b e também ?ids=a&ids=b
+            return self.get_many(','.join(req.query_params.getlist('ids')).split(','))
         input_param = ListCategoriesUseCase.Input(**req.query_params.dict())
         output = self.list_use_case()(input_param)
         data = CategoryCollectionSerializer(instance=output).data
@@ -54,6 +60,15 @@ class CategoryResource(APIView):
         body = self.category_to_response(output)
         return Response(body, HTTP_200_OK)
 
+    def get_many(self, ids: List[str]):
+        serializer = UUIDListSerializer(data={'ids': ids})
+        serializer.is_valid(raise_exception=True)
+        input_param = GetCategoriesUseCase.Input(
+            ids=[str(uuid) for uuid in serializer.validated_data['ids']])
+        output = self.get_many_use_case()(input_param)
+        body = {'data': [self.category_to_response(item)['data'] for item in output.items]}
+        return Response(body, HTTP_200_OK)
+
     def put(self, req: Request, id: str):  # pylint: disable=redefined-builtin,invalid-name
         CategoryResource.validate_id(id)
         serializer = CategorySerializer(data=req.data)
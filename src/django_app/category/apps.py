@@ -1,6 +1,49 @@
+import atexit
+from typing import Collection, get_args
+
 from django.apps import AppConfig
+from django.core.exceptions import ImproperlyConfigured
 
 
 class CategoryConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'django_app.category'
+
+    def ready(self):
+        # pylint: disable=import-outside-toplevel
+        from core.__seedwork.domain.value_objects import (ID_GENERATORS,
+                                                          UniqueEntityId)
+        from core.category.domain.validators import (CategoryValidatorFactory,
+                                                     ValidatorMode)
+        from django_app.config import config_service
+        UniqueEntityId.generator_mode = check_choice(
+            'UNIQUE_ENTITY_ID_GENERATOR', config_service.unique_entity_id_generator, ID_GENERATORS)
+        CategoryValidatorFactory.mode = check_choice(
+            'CATEGORY_VALIDATOR_MODE',
+            config_service.category_validator_mode,
+            get_args(ValidatorMode),
+        )
+
+
+def check_choice(setting: str, value: str, choices: Collection[str]) -> str:
+    """The value of a mode setting, a typo stops the startup instead of falling back"""
+    if value not in choices:
+        raise ImproperlyConfigured(
+            f"{setting} must be one of {', '.join(choices)}, not {value!r}")
+    return value
+
+
+def start_category_snapshots() -> None:
+    """
+        Warm the in-memory repository from its last snapshot and keep saving new ones, when
+        CATEGORY_SNAPSHOT_INTERVAL is positive. Only the WSGI and ASGI entry points call it,
+        so the management commands and the autoreloader never write the snapshot
+    """
+    # pylint: disable=import-outside-toplevel
+    from django_app import container
+    from django_app.config import config_service
+    if config_service.category_snapshot_interval <= 0:
+        return
+    scheduler = container.snapshot_scheduler_category_in_memory()
+    scheduler.resume()
+    atexit.register(scheduler.stop)
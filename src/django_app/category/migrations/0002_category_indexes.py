@@ -0,0 +1,49 @@
+# Generated by Django 4.2.30 on 2026-10-17 08:32
+
+from django.db import migrations, models
+
+FULLTEXT_INDEX = 'categories_name_fulltext'
+
+
+def create_fulltext_index(apps, schema_editor):  # pylint: disable=unused-argument
+    # Só o MySQL tem o parser ngram, nos outros bancos a busca continua no icontains
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    # O parser ngram descarta os tokens com stopwords, o que esconderia linhas que o
+    # icontains acha. O índice guarda a lista de stopwords da sessão que o cria
+    schema_editor.execute('SET SESSION innodb_ft_enable_stopword = OFF')
+    try:
+        schema_editor.execute(
+            f'CREATE FULLTEXT INDEX {FULLTEXT_INDEX} ON categories (name) WITH PARSER ngram')
+    finally:
+        schema_editor.execute('SET SESSION innodb_ft_enable_stopword = DEFAULT')
+
+
+def drop_fulltext_index(apps, schema_editor):  # pylint: disable=unused-argument
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    schema_editor.execute(f'DROP INDEX {FULLTEXT_INDEX} ON categories')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('category', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='categorymodel',
+            index=models.Index(fields=['created_at', 'id'], name='categories_created_at_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='categorymodel',
+            index=models.Index(fields=['name', 'id'], name='categories_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='categorymodel',
+            index=models.Index(
+                fields=['is_active', 'created_at'], name='categories_active_created_idx'),
+        ),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index, elidable=False),
+    ]
@@ -12,3 +12,9 @@ class CategoryModel(models.Model):
 
     class Meta:
         db_table = "categories"
+        # O id no fim segue a ordem das páginas da busca, que desempata por ele
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="categories_created_at_id_idx"),
+            models.Index(fields=["name", "id"], name="categories_name_id_idx"),
+            models.Index(fields=["is_active", "created_at"], name="categories_active_created_idx"),
+        ]
@@ -1,79 +1,408 @@
-# pylint: disable=no-member,import-outside-toplevel
-from typing import TYPE_CHECKING, List, Optional, Type
+# pylint: disable=no-member,import-outside-toplevel,protected-access
+from typing import (TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional,
+                    Tuple, Type)
 
 from django.core.exceptions import ValidationError
-from django.core.paginator import Paginator
+from django.db import connections, transaction
+from django.db.models import F, Lookup, Q
 
-from core.__seedwork.domain.exceptions import EntityNotFound
+from core.__seedwork.domain.exceptions import (EntityNotFound,
+                                               InvalidCursorException)
+from core.__seedwork.domain.repositories import (Cursor, SearchCache,
+                                                 check_batch_size,
+                                                 valid_unique_entity_ids)
 from core.__seedwork.domain.value_objects import UniqueEntityId
+from core.category.domain.batch import CategoryBatch
 from core.category.domain.entities import Category
 from core.category.domain.repositories import CategoryRepository
 from core.category.infra.mapper import CategoryDjangoModelMapper
 
 if TYPE_CHECKING:
+    from django.db.models import QuerySet
+
     from django_app.category.models import CategoryModel
 
 
+class FullTextPhrase(Lookup):  # pylint: disable=abstract-method
+    """MATCH (field) AGAINST ('"text"' IN BOOLEAN MODE) of MySQL, the text as one phrase"""
+
+    lookup_name = 'fulltext_phrase'
+    prepare_rhs = False
+
+    def get_db_prep_lookup(self, value, connection):
+        # Entre aspas os operadores do modo booleano são texto, só a aspa precisa sair
+        phrase = value.replace('"', ' ')
+        return '%s', [f'"{phrase}"']
+
+    def as_sql(self, compiler, connection):
+        lhs_sql, lhs_params = self.process_lhs(compiler, connection)
+        rhs_sql, rhs_params = self.process_rhs(compiler, connection)
+        return f'MATCH ({lhs_sql}) AGAINST ({rhs_sql} IN BOOLEAN MODE)', (*lhs_params, *rhs_params)
+
+
 class CategoryDjangoRepository(CategoryRepository):
+    """
+        With a count_cache_size the totals of the searches are kept in a SearchCache by their
+        filter, until the next write through this repository. The cache lives in the process,
+        writes made by other processes are only seen once this one writes too.
+        On MySQL the filter goes through the FULLTEXT ngram index of the name, when the
+        migration created it, and icontains still checks every row it finds. The filters
+        shorter than the ngram_token_size, or not a single word, only use icontains, so the
+        results are the same of icontains alone
+    """
 
     model: Type['CategoryModel']
+    trusted_hydration: bool
+    validation_sample_rate: float
+    write_version: int
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        trusted_hydration: bool = True,
+        validation_sample_rate: float = 0.0,
+        count_cache_size: int = 0,
+    ) -> None:
         from django_app.category.models import CategoryModel
         self.model = CategoryModel
+        self.trusted_hydration = trusted_hydration
+        self.validation_sample_rate = validation_sample_rate
+        self.write_version = 0
+        self._count_cache = SearchCache(count_cache_size) if count_cache_size else None
+        self._fulltext_checked = False
+        self._fulltext_token_size: Optional[int] = None
 
     def insert(self, entity: Category) -> None:
         model = CategoryDjangoModelMapper.to_model(entity)
-        model.save()
+        # Sem o force_insert o save de uma pk preenchida tenta um UPDATE antes do INSERT
+        model.save(force_insert=True)
+        self._written()
+        entity.clear_dirty_fields()
 
     def update(self, entity: Category) -> None:
-        self._get(entity.id)
+        """
+            Write only the dirty fields in a single UPDATE, whose count of matched rows tells if
+            the entity exists. An entity restored and left unchanged is not written
+        """
+        dirty_fields = entity.dirty_fields
+        if not dirty_fields:
+            return
         model = CategoryDjangoModelMapper.to_model(entity)
-        model.save()
+        updated = self.model.objects.filter(pk=model.pk).update(
+            **{field_name: getattr(model, field_name) for field_name in dirty_fields}
+        )
+        if not updated:
+            raise EntityNotFound(Category)
+        self._written()
+        entity.clear_dirty_fields()
 
-    def bulk_insert(self, entities: List[Category]) -> None:
+    def bulk_insert(self, entities: List[Category] | CategoryBatch) -> None:
+        if isinstance(entities, CategoryBatch):
+            self.model.objects.bulk_create(CategoryDjangoModelMapper.batch_to_models(entities))
+            self._written()
+            return
+        entities = list(entities)
         self.model.objects.bulk_create(
             [CategoryDjangoModelMapper.to_model(entity) for entity in entities]
         )
+        self._written()
+        for entity in entities:
+            entity.clear_dirty_fields()
 
     def delete(self, entity: Category) -> None:
-        self._get(entity.id)
-        model = CategoryDjangoModelMapper.to_model(entity)
-        model.delete()
+        # Sem relações nem sinais o Django apaga direto, num só DELETE
+        deleted, _ = self.model.objects.filter(pk=entity.id).delete()
+        if not deleted:
+            raise EntityNotFound(Category)
+        self._written()
+
+    def bulk_update(
+        self,
+        entities: List[Category],
+        fields: Optional[Iterable[str]] = None,
+        batch_size: int = 1000,
+    ) -> int:
+        """
+            One UPDATE with a CASE of the ids for each batch, like QuerySet.bulk_update.
+            Without fields it writes the dirty fields of any of the entities. Only the fields
+            written are marked clean, and only in the entities whose row exists
+        """
+        check_batch_size(batch_size)
+        entities = list(entities)
+        field_names = sorted(
+            set(fields) if fields is not None
+            else {field_name for entity in entities for field_name in entity.dirty_fields}
+        )
+        if not entities or not field_names:
+            return 0
+        updated = self.model.objects.bulk_update(
+            [CategoryDjangoModelMapper.to_model(entity) for entity in entities],
+            field_names,
+            batch_size=batch_size,
+        )
+        if updated:
+            self._written()
+        written = entities
+        ids = list(dict.fromkeys(entity.id for entity in entities))
+        if updated < len(ids):
+            # Só no caso raro de ids que não existem, um SELECT por lote diz quais foram escritas
+            existing = set()
+            for start in range(0, len(ids), batch_size):
+                existing.update(str(pk) for pk in self.model.objects.filter(
+                    pk__in=ids[start:start + batch_size]).values_list('pk', flat=True))
+            written = [entity for entity in entities if entity.id in existing]
+        for entity in written:
+            entity.clear_dirty_fields(field_names)
+        return updated
+
+    def bulk_delete(
+        self,
+        entity_ids: Iterable[str | UniqueEntityId],
+        batch_size: int = 1000,
+    ) -> int:
+        """One DELETE ... WHERE id IN of each batch, the invalid ids are left out"""
+        check_batch_size(batch_size)
+        ids = [str(unique_entity_id) for unique_entity_id in valid_unique_entity_ids(entity_ids)]
+        deleted = 0
+        for start in range(0, len(ids), batch_size):
+            count, _ = self.model.objects.filter(pk__in=ids[start:start + batch_size]).delete()
+            deleted += count
+        if deleted:
+            self._written()
+        return deleted
+
+    def upsert_many(self, entities: List[Category], batch_size: int = 1000) -> None:
+        """
+            One INSERT ... ON CONFLICT, or ON DUPLICATE KEY UPDATE on MySQL, of each batch,
+            that overwrites all the fields of the rows that exist
+        """
+        check_batch_size(batch_size)
+        entities = list(entities)
+        if not entities:
+            return
+        features = connections[self.model.objects.db].features
+        self.model.objects.bulk_create(
+            [CategoryDjangoModelMapper.to_model(entity) for entity in entities],
+            batch_size=batch_size,
+            update_conflicts=True,
+            # O MySQL não aceita a coluna do conflito, ele usa qualquer chave única
+            unique_fields=['id'] if features.supports_update_conflicts_with_target else None,
+            update_fields=[
+                field.name for field in self.model._meta.concrete_fields if not field.primary_key
+            ],
+        )
+        self._written()
+        for entity in entities:
+            entity.clear_dirty_fields()
 
     def find_by_id(self, entity_id: str | UniqueEntityId) -> Optional[Category]:
         model = self._get(str(entity_id))
-        return CategoryDjangoModelMapper.to_entity(model)
+        return self._to_entity(model)
+
+    def find_by_ids(
+        self,
+        entity_ids: Iterable[str | UniqueEntityId],
+        batch_size: int = 1000,
+    ) -> Dict[UniqueEntityId, Category]:
+        """One SELECT ... WHERE id IN of each batch, the invalid and repeated ids are left out"""
+        check_batch_size(batch_size)
+        ids = list(dict.fromkeys(
+            str(unique_entity_id) for unique_entity_id in valid_unique_entity_ids(entity_ids)
+        ))
+        found = {}
+        for start in range(0, len(ids), batch_size):
+            for model in self.model.objects.filter(pk__in=ids[start:start + batch_size]):
+                category = self._to_entity(model)
+                found[category.unique_entity_id] = category
+        return found
 
     def find_all(self) -> List[Category]:
         return [
-            CategoryDjangoModelMapper.to_entity(model)
+            self._to_entity(model)
             for model in self.model.objects.all()
         ]
 
+    def iter_all(self, chunk_size: int = 2000) -> Iterator[Category]:
+        """
+            Read the table in chunks ordered by the primary key, each one seeking past the last
+            id of the previous chunk. Unlike QuerySet.iterator, which MySQL can not stream, no
+            chunk holds more than chunk_size rows in the driver and a long iteration does not
+            keep a cursor open between them
+        """
+        check_batch_size(chunk_size, 'chunk_size')
+        query = self.model.objects.order_by('pk')
+        models = list(query[:chunk_size])
+        while models:
+            for model in models:
+                yield self._to_entity(model)
+            if len(models) < chunk_size:
+                return
+            models = list(query.filter(pk__gt=models[-1].pk)[:chunk_size])
+
     def search(self, params: CategoryRepository.SearchParams) -> CategoryRepository.SearchResult:
+        """
+            The pages are ordered by the sort field and then by the id, so every row has one
+            place and a cursor of the first or last item seeks the page before or after it,
+            without OFFSET. A row past the page tells if there is a next one, so the COUNT
+            only runs for the total, when the search asks for it
+        """
         # Não executa a query ainda
         query = self.model.objects.all()
 
         if params.filters:
-            # O __contains vem do lookup do django
-            query = query.filter(name__icontains=params.filters)
+            query = self._filter(query, params.filters)
 
-        if params.sort and params.sort in self.sortable_fields:
-            query = query.order_by(
-                params.sort
-                if params.sort_dir == "asc" else
-                f"-{params.sort}"
-            )
-        else:
-            query = query.order_by("-created_at")
+        sort, descending = self._keyset_sort(params)
+        if params.cursor is not None:
+            cursor = Cursor.decode(params.cursor)
+            cursor.check_sort(sort, descending)
+            return self._search_by_cursor(params, query, cursor)
 
-        paginator = Paginator(query, params.per_page)
-        page_obj = paginator.page(params.page)
+        total = self._count(params, query)
+        start = (params.page - 1) * params.per_page
+        models = list(
+            query.order_by(*((f"-{sort}", "-id") if descending else (sort, "id")))
+            [start:start + params.per_page + 1]
+        )
+        items = [self._to_entity(model) for model in models[:params.per_page]]
+        return CategoryRepository.SearchResult(
+            search_params=params,
+            items=items,
+            total=total,
+            next_cursor=Cursor.of(items[-1], sort, descending).encode()
+            if len(models) > params.per_page else None,
+            prev_cursor=Cursor.of(items[0], sort, descending, backward=True).encode()
+            if items and params.page > 1 else None,
+        )
+
+    def _search_by_cursor(
+        self,
+        params: CategoryRepository.SearchParams,
+        query: 'QuerySet[CategoryModel]',
+        cursor: Cursor,
+    ) -> CategoryRepository.SearchResult:
+        sort = cursor.sort
+        # Ir para frente na ordem crescente ou para trás na decrescente é ir para as chaves maiores
+        greater = cursor.descending == cursor.backward
+        lookup = 'gt' if greater else 'lt'
+        try:
+            seek = query.filter(
+                # O gte/lte redundante deixa o banco usar o índice do campo como um intervalo
+                Q(**{f"{sort}__{lookup}e": cursor.value}),
+                Q(**{f"{sort}__{lookup}": cursor.value})
+                | Q(**{sort: cursor.value, f"id__{lookup}": cursor.id}),
+            ).order_by(*((sort, "id") if greater else (f"-{sort}", "-id")))
+            models = list(seek[:params.per_page + 1])
+        # Um valor do tipo errado para o campo, como um número no created_at
+        except (ValidationError, TypeError, ValueError) as err:
+            raise InvalidCursorException() from err
+
+        items = [self._to_entity(model) for model in models[:params.per_page]]
+        if cursor.backward:
+            items.reverse()
+        next_cursor, prev_cursor = cursor.page_cursors(items, len(models) > params.per_page)
         return CategoryRepository.SearchResult(
             search_params=params,
-            items=[CategoryDjangoModelMapper.to_entity(model) for model in page_obj.object_list],
-            total=paginator.count,
+            items=items,
+            total=self._count(params, query),
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
+        )
+
+    def _filter(self, query: 'QuerySet[CategoryModel]', text: str) -> 'QuerySet[CategoryModel]':
+        # O __contains vem do lookup do django
+        query = query.filter(name__icontains=text)
+        token_size = self._fulltext_index_token_size()
+        # Só um trecho de palavra vira uma frase de ngrams que o índice acha inteira
+        if token_size is not None and len(text) >= token_size and text.isalnum():
+            query = query.filter(FullTextPhrase(F('name'), text))
+        return query
+
+    def _fulltext_index_token_size(self) -> Optional[int]:
+        """
+            The ngram_token_size of the server if the name has a FULLTEXT index, looked up by
+            the first search. The ngram parser drops the tokens with stopwords, so the
+            migration builds the index with innodb_ft_enable_stopword off
+        """
+        if self._fulltext_checked:
+            return self._fulltext_token_size
+        connection = connections[self.model.objects.db]
+        token_size = None
+        if connection.vendor == 'mysql':
+            with connection.cursor() as cursor:
+                constraints = connection.introspection.get_constraints(
+                    cursor, self.model._meta.db_table)
+                if any(
+                    constraint['type'] == 'fulltext' and constraint['columns'] == ['name']
+                    for constraint in constraints.values()
+                ):
+                    cursor.execute("SELECT @@ngram_token_size")
+                    token_size = cursor.fetchone()[0]
+        self._fulltext_token_size = token_size
+        self._fulltext_checked = True
+        return token_size
+
+    def _count(
+        self,
+        params: CategoryRepository.SearchParams,
+        query: 'QuerySet[CategoryModel]',
+    ) -> Optional[int]:
+        if not params.with_total:
+            return None
+        if params.with_total == 'estimate' and not params.filters:
+            estimate = self._estimated_count()
+            if estimate is not None:
+                return estimate
+        cache = self._count_cache
+        if cache is None:
+            return query.count()
+        version = self.write_version
+        total = cache.get(params.filters, version)
+        if total is None:
+            total = query.count()
+            cache.put(params.filters, version, total)
+        return total
+
+    def _estimated_count(self) -> Optional[int]:
+        """
+            The rows of the table by the statistics of the database, that the planner keeps
+            without reading the table. None for the databases without them, like SQLite
+        """
+        connection = connections[self.model.objects.db]
+        if connection.vendor == 'postgresql':
+            # reltuples é -1 enquanto a tabela nunca foi analisada
+            sql = "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass"
+        elif connection.vendor == 'mysql':
+            sql = (
+                "SELECT table_rows FROM information_schema.tables"
+                " WHERE table_schema = DATABASE() AND table_name = %s"
+            )
+        else:
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [self.model._meta.db_table])
+            row = cursor.fetchone()
+        if row is None or row[0] is None or row[0] < 0:
+            return None
+        return int(row[0])
+
+    def _written(self) -> None:
+        self.write_version += 1
+        # Uma leitura antes do commit ainda conta as linhas antigas, então invalida de novo
+        transaction.on_commit(self._invalidate_counts, using=self.model.objects.db)
+
+    def _invalidate_counts(self) -> None:
+        self.write_version += 1
+
+    def _keyset_sort(self, params: CategoryRepository.SearchParams) -> Tuple[str, bool]:
+        if params.sort and params.sort in self.sortable_fields:
+            return params.sort, params.sort_dir == "desc"
+        return "created_at", True
+
+    def _to_entity(self, model: 'CategoryModel') -> Category:
+        return CategoryDjangoModelMapper.to_entity(
+            model,
+            trusted=self.trusted_hydration,
+            validation_sample_rate=self.validation_sample_rate,
         )
 
     def _get(self, entity_id: str) -> 'CategoryModel':
@@ -25,6 +25,7 @@ class TestCategoryResourceGetMethodInt:
         cls.resource = init_category_resource_all_none(
             CategoryResource,
             list_use_case=container.use_case_category_list_category,
+            get_many_use_case=container.use_case_category_get_categories,
         )
 
     @pytest.mark.parametrize('item', ListCategoriesApiFixture.arrange_incremented_with_created_at())
@@ -37,6 +38,20 @@ class TestCategoryResourceGetMethodInt:
         self.repo.bulk_insert(item.entities)
         self.assert_response(item.send_data, item.expected)
 
+    def test_execute_getting_many_by_ids(self):
+        categories = Category.fake().the_categories(3).build()
+        self.repo.bulk_insert(categories)
+        ids = [categories[2].id, Category.fake().a_category().build().id, categories[0].id]
+
+        request = make_request(http_method='get', url=f'/?{urlencode({"ids": ",".join(ids)})}')
+        response = self.resource.get(request)
+
+        expected = [categories[2], categories[0]]
+        assert response.status_code == 200
+        assert response.data == {
+            'data': [self.serialize_category(category) for category in expected],
+        }
+
     def assert_response(self, send_data: dict, expected: SearchExpectation.Expected):
         request = make_request(
             http_method='get',
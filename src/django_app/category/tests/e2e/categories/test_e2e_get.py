@@ -1,13 +1,16 @@
 from urllib.parse import urlencode
+
 import pytest
 from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIClient
 
+from core.__seedwork.domain.repositories import Cursor
 from core.category.domain.entities import Category
 from core.category.domain.repositories import CategoryRepository
-from django_app.category.tests.fixture.categories_api_fixtures import ListCategoriesApiFixture, SearchExpectation
-from django_app.category.api import CategoryResource
 from django_app import container
+from django_app.category.api import CategoryResource
+from django_app.category.tests.fixture.categories_api_fixtures import (
+    ListCategoriesApiFixture, SearchExpectation)
 
 
 @pytest.mark.group('e2e')
@@ -32,6 +35,45 @@ class TestCategoryResourceGetE2E:
         self.repo.bulk_insert(item.entities)
         self.assert_response(item.send_data, item.expected)
 
+    def test_execute_without_the_total(self):
+        self.repo.bulk_insert([Category(name=f"Movie {index}") for index in range(3)])
+        response = self.client_http.get('/categories/?per_page=2&with_total=false')
+
+        assert response.status_code == 200
+        assert len(response.data['data']) == 2
+        assert response.data['meta']['total'] is None
+        assert response.data['meta']['last_page'] is None
+        assert response.data['meta']['next_cursor'] is not None
+
+    @pytest.mark.parametrize('cursor', [
+        'invalid',
+        Cursor('created_at', True, 20230501, Category(name="Movie").id).encode(),
+        Cursor('name', False, None, 'not an id').encode(),
+    ])
+    def test_throw_error_with_an_invalid_cursor(self, cursor: str):
+        response = self.client_http.get(f'/categories/?cursor={cursor}', format='json')
+
+        assert response.status_code == 422
+        assert response.data == {'message': 'Invalid pagination cursor'}
+
+    def test_execute_getting_many_by_ids(self):
+        categories = [Category(name=f"Movie {index}") for index in range(3)]
+        self.repo.bulk_insert(categories)
+        ids = [categories[1].id, Category(name="Unknown").id, categories[0].id]
+        response = self.client_http.get(f'/categories/?ids={",".join(ids)}', format='json')
+
+        expected = [categories[1], categories[0]]
+        assert response.status_code == 200
+        assert response.data == {
+            'data': [self.serialize_category(category) for category in expected],
+        }
+
+    def test_throw_error_with_an_invalid_id_in_ids(self):
+        response = self.client_http.get('/categories/?ids=fake id', format='json')
+
+        assert response.status_code == 422
+        assert response.data == {'ids': {0: ['Must be a valid UUID.']}}
+
     def assert_response(self, send_data: dict, expected: SearchExpectation.Expected):
         response = self.client_http.get(f'/categories/?{urlencode(send_data)}', format='json')
 
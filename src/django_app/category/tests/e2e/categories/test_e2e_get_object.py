@@ -5,8 +5,8 @@ from rest_framework.test import APIClient
 from core.__seedwork.domain.value_objects import UniqueEntityId
 from core.category.domain.entities import Category
 from core.category.domain.repositories import CategoryRepository
-from django_app.category.api import CategoryResource
 from django_app import container
+from django_app.category.api import CategoryResource
 
 
 @pytest.mark.group('e2e')
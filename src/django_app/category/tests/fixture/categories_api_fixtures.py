@@ -8,6 +8,7 @@ import pytest
 from rest_framework.exceptions import ErrorDetail, ValidationError
 
 from core.__seedwork.domain.exceptions import ValidationException
+from core.__seedwork.domain.repositories import Cursor
 from core.category.domain.entities import Category
 
 
@@ -446,7 +447,14 @@ class ListCategoriesApiFixture:
                         categories_named.second,
                         categories_named.first
                     ],
-                    meta={'page': 1, 'per_page': 15, 'last_page': 1, 'total': 4}
+                    meta={
+                        'page': 1,
+                        'per_page': 15,
+                        'last_page': 1,
+                        'total': 4,
+                        'next_cursor': None,
+                        'prev_cursor': None,
+                    }
                 ),
                 entities=categories
             ),
@@ -454,7 +462,15 @@ class ListCategoriesApiFixture:
                 send_data={'page': 1, 'per_page': 2},
                 expected=SearchExpectation.Expected(
                     entities=[categories_named.fourth, categories_named.third],
-                    meta={'page': 1, 'per_page': 2, 'last_page': 2, 'total': 4}
+                    meta={
+                        'page': 1,
+                        'per_page': 2,
+                        'last_page': 2,
+                        'total': 4,
+                        'next_cursor': Cursor.of(
+                            categories_named.third, 'created_at', True).encode(),
+                        'prev_cursor': None,
+                    }
                 ),
                 entities=categories
             ),
@@ -462,7 +478,15 @@ class ListCategoriesApiFixture:
                 send_data={'page': 2, 'per_page': 2},
                 expected=SearchExpectation.Expected(
                     entities=[categories_named.second, categories_named.first],
-                    meta={'page': 2, 'per_page': 2, 'last_page': 2, 'total': 4}
+                    meta={
+                        'page': 2,
+                        'per_page': 2,
+                        'last_page': 2,
+                        'total': 4,
+                        'next_cursor': None,
+                        'prev_cursor': Cursor.of(
+                            categories_named.second, 'created_at', True, backward=True).encode(),
+                    }
                 ),
                 entities=categories
             ),
@@ -505,7 +529,9 @@ class ListCategoriesApiFixture:
                         'total': 3,
                         'page': 1,
                         'last_page': 2,
-                        'per_page': 2
+                        'per_page': 2,
+                        'next_cursor': Cursor.of(categories_named.AaA, 'name', False).encode(),
+                        'prev_cursor': None,
                     }
                 ),
                 entities=categories
@@ -525,7 +551,10 @@ class ListCategoriesApiFixture:
                         'total': 3,
                         'page': 2,
                         'last_page': 2,
-                        'per_page': 2
+                        'per_page': 2,
+                        'next_cursor': None,
+                        'prev_cursor': Cursor.of(
+                            categories_named.a, 'name', False, backward=True).encode(),
                     }
                 ),
                 entities=categories
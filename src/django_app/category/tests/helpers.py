@@ -3,6 +3,7 @@ def init_category_resource_all_none(category_resource_class, **kwargs):
         "create_use_case": None,
         "list_use_case": None,
         "get_use_case": None,
+        "get_many_use_case": None,
         "update_use_case": None,
         "delete_use_case": None,
     } | kwargs
@@ -0,0 +1,72 @@
+# pylint: disable=no-member
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+from core.__seedwork.domain.value_objects import UniqueEntityId
+from core.category.domain.entities import Category
+from core.category.infra.repositories import InMemoryCategoryRepository
+from core.category.infra.snapshot import CategorySnapshot
+from django_app.category.models import CategoryModel
+from django_app.category.repositories import CategoryDjangoRepository
+
+
+@pytest.mark.group('benchmark')
+@pytest.mark.django_db
+class TestCategoryDjangoRepositoryBenchmark:
+
+    table_size = 200_000
+    batch_size = 1000
+
+    def test_insert_throughput_by_id_generator(self):
+        repo = CategoryDjangoRepository()
+        results: Dict[str, float] = {}
+        for mode in ('uuid4', 'uuid7'):
+            CategoryModel.objects.all().delete()
+            UniqueEntityId.generator_mode = mode
+            try:
+                started_at = time.perf_counter()
+                for _ in range(self.table_size // self.batch_size):
+                    repo.bulk_insert([
+                        Category.restore(name='Movie') for _ in range(self.batch_size)
+                    ])
+                results[mode] = self.table_size / (time.perf_counter() - started_at)
+            finally:
+                UniqueEntityId.generator_mode = 'uuid4'
+
+        print(f"\nInsert throughput on a {self.table_size} rows table")
+        for mode, rows_per_second in results.items():
+            print(f"    {mode:<8} {rows_per_second:>12.0f} rows/s")
+        assert CategoryModel.objects.count() == self.table_size
+
+    def test_cold_start_from_snapshot_against_find_all(self):
+        repo = CategoryDjangoRepository()
+        for _ in range(self.table_size // self.batch_size):
+            repo.bulk_insert([Category.restore(name='Movie') for _ in range(self.batch_size)])
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = Path(folder) / 'categories.snapshot'
+            results: Dict[str, float] = {}
+
+            started_at = time.perf_counter()
+            loaded = InMemoryCategoryRepository(repo.find_all())
+            results['find_all'] = time.perf_counter() - started_at
+            loaded.save_snapshot(path)
+
+            started_at = time.perf_counter()
+            with CategorySnapshot(path) as snapshot:
+                results['snapshot open'] = time.perf_counter() - started_at
+                batch = snapshot.to_batch()
+            results['snapshot to batch'] = time.perf_counter() - started_at
+
+            started_at = time.perf_counter()
+            InMemoryCategoryRepository().load_snapshot(path)
+            results['snapshot load'] = time.perf_counter() - started_at
+
+        print(f"\nCold start of the in-memory repository with {self.table_size} rows")
+        for title, seconds in results.items():
+            print(f"    {title:<18} {seconds * 1000:>10.1f} ms")
+        assert len(batch) == self.table_size
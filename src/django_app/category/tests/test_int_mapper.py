@@ -1,10 +1,12 @@
 
 import datetime as dt
 import unittest
+from unittest.mock import patch
 
 import pytest
 from django.utils import timezone
 
+from core.__seedwork.domain.exceptions import LoadValidationException
 from core.category.domain.entities import Category
 from core.category.infra.mapper import CategoryDjangoModelMapper
 from django_app.category.models import CategoryModel
@@ -30,6 +32,46 @@ class TestCategoryDjangoModelMapper(unittest.TestCase):
         self.assertEqual(entity.is_active, True)
         self.assertEqual(entity.created_at, created_at)
 
+    def test_to_entity_trusted(self):
+        created_at = timezone.now()
+        model = CategoryModel(
+            id='4e450808-bdd6-4fd0-9442-86bdc5b8bc5c',
+            name="Movie",
+            description="Movie Description",
+            is_active=True,
+            created_at=created_at,
+        )
+
+        with patch.object(Category, 'validate') as validate:
+            entity = CategoryDjangoModelMapper.to_entity(model, trusted=True)
+            validate.assert_not_called()
+        self.assertEqual(entity, CategoryDjangoModelMapper.to_entity(model))
+
+    def test_to_entity_trusted_validates_a_sample_of_the_models(self):
+        model = CategoryModel(
+            id='4e450808-bdd6-4fd0-9442-86bdc5b8bc5c',
+            name="",
+            is_active=True,
+            created_at=timezone.now(),
+        )
+
+        with patch('core.category.infra.mapper.random.random') as draw:
+            entity = CategoryDjangoModelMapper.to_entity(model, trusted=True)
+            draw.assert_not_called()
+        self.assertEqual(entity.name, "")
+
+        with self.assertRaises(LoadValidationException) as assert_error:
+            CategoryDjangoModelMapper.to_entity(model, trusted=True, validation_sample_rate=1)
+        self.assertEqual(assert_error.exception.error, {'name': ['This field may not be blank.']})
+
+        with patch('core.category.infra.mapper.random.random', side_effect=[0.2, 0.05]):
+            entity = CategoryDjangoModelMapper.to_entity(
+                model, trusted=True, validation_sample_rate=0.1)
+            self.assertEqual(entity.name, "")
+            with self.assertRaises(LoadValidationException):
+                CategoryDjangoModelMapper.to_entity(
+                    model, trusted=True, validation_sample_rate=0.1)
+
     def test_to_model(self):
         created_at = dt.datetime.now(dt.timezone.utc)
         entity = Category(
@@ -1,5 +1,7 @@
 # pylint: disable=no-member,protected-access
+import importlib
 import unittest
+from unittest.mock import Mock
 
 import pytest
 from django.db import models
@@ -26,6 +28,33 @@ class TestCategoryModelInt(unittest.TestCase):
         self.assertIsNone(id_field.db_column)
         self.assertTrue(id_field.editable)
 
+    def test_indexes(self):
+        self.assertListEqual(
+            [(index.name, index.fields) for index in CategoryModel._meta.indexes],
+            [
+                ('categories_created_at_id_idx', ['created_at', 'id']),
+                ('categories_name_id_idx', ['name', 'id']),
+                ('categories_active_created_idx', ['is_active', 'created_at']),
+            ],
+        )
+
+    def test_fulltext_index_is_built_without_stopwords(self):
+        migration = importlib.import_module('django_app.category.migrations.0002_category_indexes')
+        schema_editor = Mock()
+        schema_editor.connection.vendor = 'mysql'
+        migration.create_fulltext_index(None, schema_editor)
+        self.assertListEqual([call.args[0] for call in schema_editor.execute.call_args_list], [
+            'SET SESSION innodb_ft_enable_stopword = OFF',
+            'CREATE FULLTEXT INDEX categories_name_fulltext ON categories (name) '
+            'WITH PARSER ngram',
+            'SET SESSION innodb_ft_enable_stopword = DEFAULT',
+        ])
+
+        schema_editor = Mock()
+        schema_editor.connection.vendor = 'sqlite'
+        migration.create_fulltext_index(None, schema_editor)
+        schema_editor.execute.assert_not_called()
+
     def test_create_category(self, ):
         arrange = {
             "id": 'bee01e76-f8fc-11ed-be56-0242ac120002',
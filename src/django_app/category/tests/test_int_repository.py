@@ -1,15 +1,24 @@
-# pylint: disable=no-member
+# pylint: disable=no-member,too-many-public-methods
 import datetime as dt
 import unittest
 from typing import List
 
 import pytest
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from model_bakery import baker
 from model_bakery.utils import seq
 
-from core.__seedwork.domain.exceptions import EntityNotFound
+from core.__seedwork.domain.exceptions import (EntityNotFound,
+                                               InvalidCursorException,
+                                               LoadValidationException)
+from core.__seedwork.domain.repositories import Cursor
 from core.__seedwork.domain.value_objects import UniqueEntityId
+from core.__seedwork.infra.testing_helpers import (
+    assert_bulk_update_cleans_the_written_fields, walk_pages_backward,
+    walk_pages_forward)
+from core.category.domain.batch import CategoryBatch
 from core.category.domain.entities import Category
 from core.category.domain.repositories import CategoryRepository
 from core.category.infra.mapper import CategoryDjangoModelMapper
@@ -43,7 +52,13 @@ class TestCategoryDjangoRepositoryInt(unittest.TestCase):
         self.assertFalse(category2.is_active)
 
     def test_cannot_insert_the_same_category_by_id_multiple_times(self):
-        pytest.skip()
+        category = Category(name="Movie")
+        self.repo.insert(category)
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            self.repo.insert(Category.restore(
+                unique_entity_id=category.unique_entity_id, name="Other movie"))
+        self.assertEqual(CategoryModel.objects.get(pk=category.id).name, "Movie")
 
     def test_can_find_by_id(self):
         category = Category(name="Movie")
@@ -74,6 +89,55 @@ class TestCategoryDjangoRepositoryInt(unittest.TestCase):
             [CategoryDjangoModelMapper.to_entity(model) for model in models],
         )
 
+    def test_iter_all_reads_the_table_in_chunks(self):
+        self.assertListEqual([], list(self.repo.iter_all()))
+        models = baker.make(CategoryModel, _quantity=5)
+
+        with CaptureQueriesContext(connection) as queries:
+            categories = list(self.repo.iter_all(chunk_size=2))
+
+        self.assertEqual(len(queries), 3)
+        self.assertListEqual(
+            categories,
+            [
+                CategoryDjangoModelMapper.to_entity(model)
+                for model in sorted(models, key=lambda model: model.pk)
+            ],
+        )
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(len(list(self.repo.iter_all(chunk_size=5))), 5)
+        self.assertEqual(len(queries), 2)
+
+        with self.assertRaises(ValueError):
+            next(self.repo.iter_all(chunk_size=0))
+
+    def test_bulk_insert_a_category_batch(self):
+        categories = [
+            Category(name="Movie"),
+            Category(name="Serie", description="Serie description", is_active=False),
+        ]
+        self.repo.bulk_insert(CategoryBatch(categories))
+
+        self.assertCountEqual(self.repo.find_all(), categories)
+        model = CategoryModel.objects.get(pk=categories[1].id)
+        self.assertEqual(model.description, "Serie description")
+        self.assertFalse(model.is_active)
+        self.assertEqual(model.created_at, categories[1].created_at)
+
+    def test_find_restores_persisted_rows_without_validation(self):
+        model = baker.make(CategoryModel, name="")
+
+        self.assertEqual(self.repo.find_by_id(model.id).name, "")
+        self.assertEqual(self.repo.find_all()[0].name, "")
+
+        repo = CategoryDjangoRepository(validation_sample_rate=1)
+        with self.assertRaises(LoadValidationException):
+            repo.find_by_id(model.id)
+
+        repo = CategoryDjangoRepository(trusted_hydration=False)
+        with self.assertRaises(LoadValidationException):
+            repo.find_all()
+
     def test_throw_not_found_exception_in_update(self):
         entity = Category(name="Movie")
         # não valida com uma string que não é um uuid porque passamos a entidade
@@ -96,6 +160,129 @@ class TestCategoryDjangoRepositoryInt(unittest.TestCase):
         self.assertEqual(model.is_active, category.is_active)
         self.assertEqual(model.created_at, category.created_at)
 
+    def test_update_writes_only_the_dirty_fields(self):
+        category = Category(name="Movie", description="Movie description")
+        self.repo.insert(category)
+        self.assertEqual(category.dirty_fields, set())
+
+        category = self.repo.find_by_id(category.id)
+        CategoryModel.objects.filter(pk=category.id).update(description="Changed elsewhere")
+        category.update(name="Movie changed", description=category.description)
+        with CaptureQueriesContext(connection) as queries:
+            self.repo.update(category)
+        update_sql = queries.captured_queries[-1]['sql']
+        self.assertTrue(update_sql.startswith('UPDATE'))
+        self.assertIn('"name"', update_sql)
+        self.assertNotIn('"description"', update_sql)
+        self.assertEqual(category.dirty_fields, set())
+
+        model = CategoryModel.objects.get(pk=category.id)
+        self.assertEqual(model.name, "Movie changed")
+        self.assertEqual(model.description, "Changed elsewhere")
+
+    def test_update_skips_the_write_when_nothing_changed(self):
+        category = Category(name="Movie")
+        self.repo.insert(category)
+        category = self.repo.find_by_id(category.id)
+        category.update(name="Movie", description=None)
+        category.activate()
+
+        with CaptureQueriesContext(connection) as queries:
+            self.repo.update(category)
+        self.assertEqual(len(queries), 0)
+
+    def test_bulk_update(self):
+        categories = [Category(name=f"Movie {index}") for index in range(5)]
+        self.repo.bulk_insert(categories)
+
+        for category in categories[:3]:
+            category.update(name=f"Serie {category.name}", description="Serie")
+        unknown = Category(name="Unknown")
+        self.assertEqual(self.repo.bulk_update([*categories[:3], unknown], batch_size=2), 3)
+        for category in categories:
+            self.assertEqual(self.repo.find_by_id(category.id), category)
+            self.assertEqual(category.dirty_fields, frozenset())
+        # A entidade sem linha não foi escrita, continua suja
+        self.assertEqual(unknown.dirty_fields, {"name", "description", "is_active", "created_at"})
+        self.assertEqual(self.repo.bulk_update(categories), 0)
+
+    def test_bulk_update_with_a_partial_fields_list(self):
+        categories = [Category(name=f"Movie {index}") for index in range(2)]
+        self.repo.bulk_insert(categories)
+
+        for category in categories:
+            category.update(name=f"Changed {category.name}", description="Not written")
+        self.assertEqual(self.repo.bulk_update(categories, fields=["name"]), 2)
+        for category in categories:
+            model = CategoryModel.objects.get(pk=category.id)
+            self.assertEqual((model.name, model.description), (category.name, None))
+            # O description não foi escrito, então segue sujo para o próximo update
+            self.assertEqual(category.dirty_fields, {"description"})
+
+        self.assertEqual(self.repo.bulk_update(categories), 2)
+        for category in categories:
+            self.assertEqual(self.repo.find_by_id(category.id), category)
+            self.assertEqual(category.dirty_fields, frozenset())
+
+    def test_bulk_update_cleans_the_written_fields(self):
+        assert_bulk_update_cleans_the_written_fields(
+            self.repo,
+            [Category(name=f"Movie {index}") for index in range(3)],
+            lambda category: category.update(name=f"Serie {category.name}", description="Serie"),
+            Category(name="Unknown"),
+            "name",
+        )
+
+    def test_bulk_delete(self):
+        categories = [Category(name=f"Movie {index}") for index in range(5)]
+        self.repo.bulk_insert(categories)
+
+        deleted = self.repo.bulk_delete(
+            [categories[0].id, categories[1].unique_entity_id, categories[2].id, "invalid",
+             Category(name="Unknown").id],
+            batch_size=2,
+        )
+        self.assertEqual(deleted, 3)
+        self.assertEqual(
+            set(CategoryModel.objects.values_list("name", flat=True)), {"Movie 3", "Movie 4"})
+        with self.assertRaises(ValueError):
+            self.repo.bulk_delete([categories[3].id], batch_size=0)
+
+    def test_find_by_ids(self):
+        categories = [Category(name=f"Movie {index}") for index in range(5)]
+        self.repo.bulk_insert(categories)
+
+        found = self.repo.find_by_ids(
+            [categories[0].id, categories[1].unique_entity_id, categories[3].id, "invalid",
+             Category(name="Unknown").id, categories[0].id],
+            batch_size=2,
+        )
+        self.assertDictEqual(found, {
+            category.unique_entity_id: category
+            for category in [categories[0], categories[1], categories[3]]
+        })
+        self.assertDictEqual(self.repo.find_by_ids([]), {})
+        with self.assertRaises(ValueError):
+            self.repo.find_by_ids([categories[0].id], batch_size=0)
+
+    def test_upsert_many(self):
+        categories = [Category(name=f"Movie {index}") for index in range(2)]
+        self.repo.bulk_insert(categories)
+
+        changed = Category.restore(
+            unique_entity_id=categories[1].unique_entity_id,
+            name="Changed",
+            description="Changed",
+            is_active=False,
+            created_at=categories[1].created_at,
+        )
+        new = Category(name="New")
+        self.repo.upsert_many([changed, new], batch_size=1)
+        self.assertEqual(CategoryModel.objects.count(), 3)
+        self.assertEqual(self.repo.find_by_id(changed.id), changed)
+        self.assertEqual(self.repo.find_by_id(new.id), new)
+        self.assertEqual(self.repo.find_by_id(categories[0].id), categories[0])
+
     def test_throw_not_found_exception_in_delete(self):
         entity = Category(name="Movie")
         with self.assertRaises(EntityNotFound) as err:
@@ -111,6 +298,102 @@ class TestCategoryDjangoRepositoryInt(unittest.TestCase):
         self.assertEqual(0, len(CategoryModel.objects.all()))
 
 
+@pytest.mark.django_db
+class TestCategoryDjangoRepositoryQueries(unittest.TestCase):
+    """Every method runs a fixed number of statements, each write only one"""
+
+    repo: CategoryDjangoRepository
+
+    def setUp(self):
+        self.repo = CategoryDjangoRepository()
+        self.category = Category(name="Movie")
+        self.repo.insert(self.category)
+
+    def assert_statements(self, statements: List[str], func, *args, raises=None):
+        with CaptureQueriesContext(connection) as queries:
+            if raises is None:
+                func(*args)
+            else:
+                self.assertRaises(raises, func, *args)
+        self.assertEqual(
+            [query['sql'].split(' ', 1)[0] for query in queries.captured_queries], statements)
+
+    def test_insert(self):
+        self.assert_statements(['INSERT'], self.repo.insert, Category(name="Serie"))
+
+    def test_bulk_insert(self):
+        categories = [Category(name="Serie"), Category(name="Documentary")]
+        self.assert_statements(['INSERT'], self.repo.bulk_insert, categories)
+        self.assert_statements(
+            ['INSERT'], self.repo.bulk_insert, CategoryBatch([Category(name="Anime")]))
+
+    def test_update(self):
+        self.category.update(name="Movie changed", description=None)
+        self.assert_statements(['UPDATE'], self.repo.update, self.category)
+        self.assert_statements([], self.repo.update, self.category)
+
+        self.assert_statements(
+            ['UPDATE'], self.repo.update, Category(name="Serie"), raises=EntityNotFound)
+
+    def test_delete(self):
+        self.assert_statements(['DELETE'], self.repo.delete, self.category)
+
+        self.assert_statements(
+            ['DELETE'], self.repo.delete, self.category, raises=EntityNotFound)
+
+    def test_bulk_writes_run_one_statement_per_batch(self):
+        categories = [Category(name=f"Serie {index}") for index in range(5)]
+        self.assert_statements(['INSERT'] * 3, self.repo.upsert_many, categories, 2)
+
+        for category in categories:
+            category.update(name=f"Changed {category.name}", description=None)
+        self.assert_statements(['UPDATE'] * 3, self.repo.bulk_update, categories, None, 2)
+
+        ids = [category.id for category in categories]
+        self.assert_statements(['DELETE'] * 3, self.repo.bulk_delete, ids, 2)
+
+    def test_reads(self):
+        self.assert_statements(['SELECT'], self.repo.find_by_id, self.category.id)
+        self.assert_statements(['SELECT'], self.repo.find_all)
+        ids = [self.category.id, *(Category(name="Serie").id for _ in range(4))]
+        self.assert_statements(['SELECT'], self.repo.find_by_ids, ids)
+        self.assert_statements(['SELECT'] * 3, self.repo.find_by_ids, ids, 2)
+        self.assert_statements([], self.repo.find_by_ids, ["invalid"])
+        self.assert_statements(['SELECT'], list, self.repo.iter_all())
+        self.assert_statements(
+            ['SELECT', 'SELECT'], self.repo.search, self.repo.SearchParams(filters="movie"))
+        self.assert_statements(
+            ['SELECT'], self.repo.search, self.repo.SearchParams(with_total=False))
+        # No SQLite não há estatísticas, a estimativa vira um COUNT
+        self.assert_statements(
+            ['SELECT', 'SELECT'], self.repo.search, self.repo.SearchParams(with_total='estimate'))
+
+    def test_count_cache(self):
+        repo = CategoryDjangoRepository(count_cache_size=2)
+        params = repo.SearchParams(filters="movie")
+        self.assert_statements(['SELECT', 'SELECT'], repo.search, params)
+        self.assert_statements(['SELECT'], repo.search, params)
+        self.assertEqual(repo.search(repo.SearchParams(page=2, filters="movie")).total, 1)
+
+        repo.insert(Category(name="Other movie"))
+        self.assert_statements(['SELECT', 'SELECT'], repo.search, params)
+        self.assertEqual(repo.search(params).total, 2)
+        self.assertEqual(repo.search(repo.SearchParams(filters="serie")).total, 0)
+        self.assertEqual(repo.search(repo.SearchParams(filters="serie")).total, 0)
+
+        self.category.update(name="Serie", description=None)
+        for write, args in [
+            (repo.bulk_insert, [[Category(name="Movie 3")]]),
+            (repo.update, [self.category]),
+            (repo.delete, [self.category]),
+        ]:
+            version = repo.write_version
+            write(*args)
+            self.assertGreater(repo.write_version, version, write)
+        self.assertEqual(repo.search(params).total, 2)
+        self.assertEqual(repo.search(repo.SearchParams(filters="serie")).total, 0)
+
+
 @pytest.mark.django_db
 class TestCategoryDjangoRepositorySearch(unittest.TestCase):
 
@@ -165,24 +448,26 @@ class TestCategoryDjangoRepositorySearch(unittest.TestCase):
             'is_active': True,
             'created_at': timezone.now()
         }
+        # Com o mesmo created_at a ordem decrescente segue a dos ids
+        ids = iter(sorted((UniqueEntityId().id for _ in range(4)), reverse=True))
         models = CategoryModel.objects.bulk_create([
             CategoryModel(
-                id=UniqueEntityId().id,
+                id=next(ids),
                 name='test',
                 **default_props
             ),
             CategoryModel(
-                id=UniqueEntityId().id,
+                id=next(ids),
                 name='a',
                 **default_props
             ),
             CategoryModel(
-                id=UniqueEntityId().id,
+                id=next(ids),
                 name='TEST',
                 **default_props
             ),
             CategoryModel(
-                id=UniqueEntityId().id,
+                id=next(ids),
                 name='TeSt',
                 **default_props
             )
@@ -423,3 +708,155 @@ class TestCategoryDjangoRepositorySearch(unittest.TestCase):
                 filters='TEST',
             )
         ))
+
+
+@pytest.mark.django_db
+class TestCategoryDjangoRepositoryCursor(unittest.TestCase):
+
+    repo: CategoryDjangoRepository
+
+    def setUp(self) -> None:
+        self.repo = CategoryDjangoRepository()
+        now = timezone.now()
+        # Grupos de created_at e nomes repetidos para os empates serem desfeitos pelo id
+        self.categories = [
+            Category.restore(
+                name=f"Movie {index % 4}",
+                created_at=now + dt.timedelta(seconds=index % 5),
+            )
+            for index in range(23)
+        ]
+        self.repo.bulk_insert(self.categories)
+
+    def expected(self, sort: str, descending: bool) -> List[Category]:
+        return sorted(
+            self.categories,
+            key=lambda category: (getattr(category, sort), category.unique_entity_id.value),
+            reverse=descending,
+        )
+
+    def search(self, **props) -> CategoryRepository.SearchResult:
+        return self.repo.search(CategoryRepository.SearchParams(per_page=5, **props))
+
+    def test_it_walks_the_pages_forward_and_backward(self):
+        for props, expected in [
+            ({}, self.expected('created_at', True)),
+            ({'sort': 'name'}, self.expected('name', False)),
+            ({'sort': 'name', 'sort_dir': 'desc'}, self.expected('name', True)),
+        ]:
+            with self.subTest(**props):
+                items, last_page = walk_pages_forward(self.search, **props)
+                self.assertListEqual(items, expected)
+                self.assertEqual(last_page.total, 23)
+                self.assertListEqual(walk_pages_backward(self.search, last_page, **props), expected)
+
+    def test_without_total_the_pages_still_link(self):
+        expected = self.expected('created_at', True)
+        result = self.search(page=5, with_total=False)
+        self.assertListEqual(result.items, expected[20:])
+        self.assertIsNone(result.total)
+        self.assertIsNone(result.last_page)
+        self.assertIsNone(result.next_cursor)
+
+        result = self.search(page=4, with_total='false')
+        self.assertListEqual(result.items, expected[15:20])
+        result = self.search(cursor=result.next_cursor, with_total=False)
+        self.assertListEqual(result.items, expected[20:])
+        self.assertIsNone(result.total)
+        self.assertIsNone(result.next_cursor)
+
+        self.assertListEqual(self.search(page=6).items, [])
+
+    def test_a_cursor_page_runs_two_queries_without_offset(self):
+        cursor = Cursor.of(self.expected('name', False)[7], 'name', False).encode()
+        params = CategoryRepository.SearchParams(per_page=5, sort='name', cursor=cursor)
+
+        with CaptureQueriesContext(connection) as queries:
+            result = self.repo.search(params)
+        self.assertListEqual(result.items, self.expected('name', False)[8:13])
+        self.assertEqual(len(queries.captured_queries), 2)
+        for query in queries.captured_queries:
+            self.assertNotIn('OFFSET', query['sql'])
+
+    def test_it_rejects_an_invalid_cursor(self):
+        category = self.categories[0]
+        for params in [
+            CategoryRepository.SearchParams(cursor='not a cursor'),
+            CategoryRepository.SearchParams(
+                sort='name', cursor=Cursor.of(category, 'created_at', True).encode()),
+            CategoryRepository.SearchParams(
+                cursor=Cursor('created_at', True, 'yesterday', category.id).encode()),
+            CategoryRepository.SearchParams(
+                cursor=Cursor('created_at', True, 20230501, category.id).encode()),
+            CategoryRepository.SearchParams(
+                cursor=Cursor('created_at', True, 1.5, category.id).encode()),
+        ]:
+            with self.assertRaises(InvalidCursorException, msg=params):
+                self.repo.search(params)
+
+
+@pytest.mark.django_db
+@unittest.skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN is from SQLite')
+class TestCategoryDjangoRepositoryQueryPlan(unittest.TestCase):
+
+    repo: CategoryDjangoRepository
+
+    def setUp(self):
+        self.repo = CategoryDjangoRepository()
+        self.repo.bulk_insert([Category(name=f"Movie {index}") for index in range(20)])
+
+    def page_query_plan(self, params: CategoryRepository.SearchParams) -> str:
+        with CaptureQueriesContext(connection) as queries:
+            self.repo.search(params)
+        sql = next(
+            query['sql'] for query in queries.captured_queries if 'ORDER BY' in query['sql'])
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            return '\n'.join(row[-1] for row in cursor.fetchall())
+
+    def test_pages_read_the_sort_index_without_sorting(self):
+        first_page = self.repo.search(CategoryRepository.SearchParams(per_page=5))
+        name_page = self.repo.search(CategoryRepository.SearchParams(per_page=5, sort='name'))
+        for params, index in [
+            (CategoryRepository.SearchParams(), 'categories_created_at_id_idx'),
+            (CategoryRepository.SearchParams(sort='name', sort_dir='desc'),
+             'categories_name_id_idx'),
+            (CategoryRepository.SearchParams(filters='movie'), 'categories_created_at_id_idx'),
+            (CategoryRepository.SearchParams(per_page=5, cursor=first_page.next_cursor),
+             'categories_created_at_id_idx'),
+            (CategoryRepository.SearchParams(
+                per_page=5, sort='name', cursor=name_page.next_cursor),
+             'categories_name_id_idx'),
+        ]:
+            plan = self.page_query_plan(params)
+            self.assertIn(index, plan, params)
+            self.assertNotIn('TEMP B-TREE', plan, params)
+
+    def test_active_categories_read_the_active_index(self):
+        # O Django escreve só WHERE is_active no SQLite, a comparação é a que vai ao MySQL
+        sql = (
+            "SELECT id FROM categories WHERE is_active = %s"
+            " ORDER BY created_at DESC LIMIT 15"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", [True])
+            plan = '\n'.join(row[-1] for row in cursor.fetchall())
+        self.assertIn('categories_active_created_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_filter_uses_the_fulltext_index_when_there_is_one(self):
+        # pylint: disable=protected-access
+        query = self.repo._filter(CategoryModel.objects.all(), 'movie')
+        self.assertNotIn('MATCH', str(query.query))
+
+        # Como se o MySQL tivesse o índice, a SQL só é montada
+        self.repo._fulltext_token_size = 2
+        sql = str(self.repo._filter(CategoryModel.objects.all(), 'movie').query)
+        self.assertIn('MATCH ("categories"."name") AGAINST ("movie" IN BOOLEAN MODE)', sql)
+        # O icontains segue na query, o índice só corta as linhas antes dele
+        self.assertIn('LIKE', sql)
+        # Mais curtos que o token, ou com mais de uma palavra, ficam só no icontains
+        for text in ['m', 'my movie', 'mo"vie']:
+            query = self.repo._filter(CategoryModel.objects.all(), text)
+            self.assertNotIn('MATCH', str(query.query), text)
+            self.assertIn('LIKE', str(query.query), text)
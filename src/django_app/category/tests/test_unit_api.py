@@ -9,6 +9,7 @@ from core.__seedwork.infra.testing_helpers import make_request
 from core.category.application.dto import CategoryOutput
 from core.category.application.usecase import (CreateCategoryUseCase,
                                                DeleteCategoryUseCase,
+                                               GetCategoriesUseCase,
                                                GetCategoryUseCase,
                                                ListCategoriesUseCase,
                                                UpdateCategoryUseCase)
@@ -118,6 +119,35 @@ class TestCategoryResourceUnit(unittest.TestCase):
         )
         self.assertEqual(response.status_code, 200)
 
+    def test_get_many_method(self):
+        output = CategoryOutput(
+            id='af46842e-027d-4c91-b259-3a3642144ba4',
+            name='Movie',
+            description=None,
+            is_active=True,
+            created_at=datetime.datetime.now()
+        )
+        mock_get_many_use_case = Mock(
+            GetCategoriesUseCase, return_value=GetCategoriesUseCase.Output(items=[output]))
+        mock_list_use_case = Mock()
+        resource = init_category_resource_all_none(
+            CategoryResource,
+            list_use_case=mock_list_use_case,
+            get_many_use_case=lambda: mock_get_many_use_case,
+        )
+
+        other_id = '5490020a-e866-4229-9adc-aa44b83234c4'
+        request = make_request('get', f'/?ids={output.id.upper()},{other_id}&ids={output.id}')
+        response = resource.get(request)
+        mock_get_many_use_case.assert_called_once_with(
+            GetCategoriesUseCase.Input(ids=[output.id, other_id, output.id])
+        )
+        self.assertEqual(mock_list_use_case.call_count, 0)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {
+            'data': [CategoryResource.category_to_response(output)['data']],
+        })
+
     @patch.object(CategoryResource, 'validate_id')
     def test_get_method(self, mock_validate_id):
         return_value = GetCategoryUseCase.Output(
@@ -0,0 +1,63 @@
+import atexit
+import unittest
+from unittest.mock import patch
+
+from django.apps import apps
+from django.core.exceptions import ImproperlyConfigured
+
+from core.__seedwork.domain.value_objects import UniqueEntityId
+from core.category.domain.validators import CategoryValidatorFactory
+from core.category.infra.snapshot import SnapshotScheduler
+from django_app.category.apps import check_choice, start_category_snapshots
+from django_app.config import config_service
+
+
+class TestCategoryConfigUnit(unittest.TestCase):
+
+    def setUp(self) -> None:
+        generator_mode = UniqueEntityId.generator_mode
+        validator_mode = CategoryValidatorFactory.mode
+        self.addCleanup(setattr, UniqueEntityId, 'generator_mode', generator_mode)
+        self.addCleanup(setattr, CategoryValidatorFactory, 'mode', validator_mode)
+        self.app_config = apps.get_app_config('category')
+
+    def test_check_choice(self):
+        self.assertEqual(check_choice('MODE', 'drf', ('drf', 'compiled')), 'drf')
+        with self.assertRaises(ImproperlyConfigured) as assert_error:
+            check_choice('MODE', 'dfr', ('drf', 'compiled'))
+        self.assertEqual(
+            str(assert_error.exception), "MODE must be one of drf, compiled, not 'dfr'")
+
+    @patch.object(config_service, 'category_validator_mode', 'compiled')
+    @patch.object(config_service, 'unique_entity_id_generator', 'uuid7')
+    def test_ready_sets_the_modes(self):
+        self.app_config.ready()
+        self.assertEqual(UniqueEntityId.generator_mode, 'uuid7')
+        self.assertEqual(CategoryValidatorFactory.mode, 'compiled')
+
+    def test_ready_rejects_unknown_modes(self):
+        for setting, value in [
+            ('unique_entity_id_generator', 'uuid5'),
+            ('category_validator_mode', 'Compiled'),
+        ]:
+            with patch.object(config_service, setting, value), \
+                    self.assertRaises(ImproperlyConfigured, msg=setting):
+                self.app_config.ready()
+
+    @patch.object(config_service, 'category_snapshot_interval', 60)
+    def test_ready_does_not_start_the_snapshots(self):
+        with patch.object(SnapshotScheduler, 'start') as start:
+            self.app_config.ready()
+        start.assert_not_called()
+
+    def test_start_category_snapshots(self):
+        with patch.object(SnapshotScheduler, 'resume') as resume, \
+                patch.object(atexit, 'register') as register:
+            with patch.object(config_service, 'category_snapshot_interval', 0):
+                start_category_snapshots()
+            resume.assert_not_called()
+
+            with patch.object(config_service, 'category_snapshot_interval', 60):
+                start_category_snapshots()
+            resume.assert_called_once_with()
+            register.assert_called_once()
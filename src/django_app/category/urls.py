@@ -8,6 +8,7 @@ urlpatterns = [
     path('categories/', CategoryResource.as_view(
         create_use_case=container.use_case_category_create_category,
         list_use_case=container.use_case_category_list_category,
+        get_many_use_case=container.use_case_category_get_categories,
     )),
     path('categories/<id>/', CategoryResource.as_view(
         get_use_case=container.use_case_category_get_category,
@@ -21,6 +21,13 @@ class ConfigService(BaseSettings):
     installed_apps: List[str]
     middlewares_additional: List[str]
     secret_key: str
+    unique_entity_id_generator: str = 'uuid4'
+    category_validator_mode: str = 'drf'
+    category_load_validation_sample_rate: float = 0.0
+    category_search_cache_size: int = 0
+    category_count_cache_size: int = 0
+    category_snapshot_path: str = 'category.snapshot'
+    category_snapshot_interval: float = 0.0
 
     class Config(config.BaseConfig):
         env_file = f"{_ENV_FOLDER}/.env", f"{_ENV_FOLDER}/.env.{APP_ENV}"
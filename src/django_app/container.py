@@ -2,17 +2,34 @@ from dependency_injector import containers, providers
 
 from core.category.application.usecase import (CreateCategoryUseCase,
                                                DeleteCategoryUseCase,
+                                               GetCategoriesUseCase,
                                                GetCategoryUseCase,
                                                ListCategoriesUseCase,
                                                UpdateCategoryUseCase)
-from core.category.infra.repositories import InMemoryCategoryRepository
+from core.category.infra.repositories import \
+    ConcurrentInMemoryCategoryRepository
+from core.category.infra.snapshot import SnapshotScheduler
 from django_app.category.repositories import CategoryDjangoRepository
+from django_app.config import config_service
 
 
 class Container(containers.DeclarativeContainer):
 
-    repository_category_in_memory = providers.Singleton(InMemoryCategoryRepository)
-    repository_category_django_orm = providers.Singleton(CategoryDjangoRepository)
+    repository_category_in_memory = providers.Singleton(
+        ConcurrentInMemoryCategoryRepository,
+        search_cache_size=config_service.category_search_cache_size,
+    )
+    snapshot_scheduler_category_in_memory = providers.Singleton(
+        SnapshotScheduler,
+        repo=repository_category_in_memory,
+        path=config_service.category_snapshot_path,
+        interval=config_service.category_snapshot_interval,
+    )
+    repository_category_django_orm = providers.Singleton(
+        CategoryDjangoRepository,
+        validation_sample_rate=config_service.category_load_validation_sample_rate,
+        count_cache_size=config_service.category_count_cache_size,
+    )
 
     use_case_category_create_category = providers.Singleton(
         CreateCategoryUseCase,
@@ -29,6 +46,11 @@ class Container(containers.DeclarativeContainer):
         repo=repository_category_django_orm,
     )
 
+    use_case_category_get_categories = providers.Singleton(
+        GetCategoriesUseCase,
+        repo=repository_category_django_orm,
+    )
+
     use_case_category_update_category = providers.Singleton(
         UpdateCategoryUseCase,
         repo=repository_category_django_orm,
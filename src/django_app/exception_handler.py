@@ -4,6 +4,7 @@ from rest_framework.views import \
     exception_handler as rest_framework_exception_handler
 
 from core.__seedwork.domain.exceptions import (EntityNotFound,
+                                               InvalidCursorException,
                                                ValidationException)
 
 
@@ -25,10 +26,17 @@ def handler_serializer_entity_not_found(
     response = Response({"message": str(exception)}, status=404)
     return response
 
+def handler_invalid_cursor(
+    exception: InvalidCursorException, context,   # pylint: disable=unused-argument
+):
+    response = Response({"message": str(exception)}, status=422)
+    return response
+
 handlers = {
     ValidationError: handler_serializer_validation_error,
     ValidationException: handler_serializer_validation_exception,
     EntityNotFound: handler_serializer_entity_not_found,
+    InvalidCursorException: handler_invalid_cursor,
 }
 
 